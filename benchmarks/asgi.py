@@ -0,0 +1,155 @@
+"""
+Minimal async HTTP clients for benchmarks.
+
+ASGIClient calls an ASGI app directly in the current event loop, so no
+sockets are involved. HTTPClient speaks HTTP/1.1 over one keep-alive
+connection, for driving a real server on the loopback interface. Both
+expose the same request() coroutine.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+
+def _target(path: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """Split a request into its path and encoded query string."""
+    query = urlencode({key: value for key, value in (params or {}).items() if value is not None})
+    return path, query
+
+
+class ASGIClient:
+    """Sends requests straight to an ASGI application."""
+    
+    def __init__(self, app):
+        """Create a client for the given ASGI app."""
+        self.app = app
+    
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Send one request and return the status, headers and body."""
+        path, query = _target(path, params)
+        body = json.dumps(json_body).encode() if json_body is not None else b""
+        raw_headers = [(b"host", b"benchmark")]
+        if json_body is not None:
+            raw_headers.append((b"content-type", b"application/json"))
+            raw_headers.append((b"content-length", str(len(body)).encode()))
+        for name, value in (headers or {}).items():
+            raw_headers.append((name.lower().encode(), value.encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("127.0.0.1", 8000),
+        }
+        request_sent = False
+        status = 0
+        response_headers: Dict[str, str] = {}
+        chunks: List[bytes] = []
+        
+        async def receive():
+            nonlocal request_sent
+            if request_sent:
+                # The request is complete; wait until the app stops listening
+                await asyncio.Event().wait()
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", []):
+                    response_headers[name.decode().lower()] = value.decode()
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+        
+        await self.app(scope, receive, send)
+        return status, response_headers, b"".join(chunks)
+    
+    async def close(self) -> None:
+        """Nothing to release for an in-process client."""
+
+
+class HTTPClient:
+    """HTTP/1.1 client holding one keep-alive connection to a server."""
+    
+    def __init__(self, host: str, port: int):
+        """Create a client for the server at host:port. Connects on first use."""
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+    
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Send one request and return the status, headers and body."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        path, query = _target(path, params)
+        body = json.dumps(json_body).encode() if json_body is not None else b""
+        lines = [f"{method} {path}{'?' + query if query else ''} HTTP/1.1", f"Host: {self.host}:{self.port}"]
+        if json_body is not None:
+            lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(body)}")
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        self._writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+        await self._writer.drain()
+        return await self._read_response()
+    
+    async def _read_response(self) -> Tuple[int, Dict[str, str], bytes]:
+        """Read one response, with either a Content-Length or a chunked body."""
+        status_line = await self._reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await self._reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+        
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks: List[bytes] = []
+            while True:
+                size = int((await self._reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            body = b"".join(chunks)
+        else:
+            body = await self._reader.readexactly(int(response_headers.get("content-length", "0")))
+        
+        if response_headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, response_headers, body
+    
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._reader = None
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for the task API.
+
+Seeds the server's storage with synthetic tasks and runs a mixed
+read/write/search workload against the app, either in-process through ASGI
+or through uvicorn on the loopback interface. Reports throughput and
+latency percentiles per endpoint and can compare them with a baseline.
+
+Run from the repository root:
+    
+    python -m benchmarks.load --sizes 1000,10000,100000 --concurrency 16
+    python -m benchmarks.load --output results.json
+    python -m benchmarks.load --baseline results.json
+    python -m benchmarks.load --mode uvicorn
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Synthetic data replaces the sample tasks; must be set before the server is imported
+os.environ.setdefault("SEED_SAMPLE_DATA", "false")
+
+from benchmarks.asgi import ASGIClient, HTTPClient
+from src.dummy_server import server
+from src.dummy_server.models import TaskCreate, TaskStatus
+
+WORDS = [
+    "fix", "deploy", "review", "update", "refactor", "test", "document", "release",
+    "database", "login", "billing", "search", "cache", "report", "dashboard", "api",
+]
+ASSIGNEES = [f"user{i}@example.com" for i in range(200)]
+
+# Operation name -> default weight in the mix
+DEFAULT_MIX = {
+    "get": 40,
+    "page": 15,
+    "filter": 15,
+    "search": 5,
+    "create": 10,
+    "update": 10,
+    "delete": 5,
+    "list_all": 0,
+}
+
+
+def synthetic_tasks(count: int, rng: random.Random) -> List[TaskCreate]:
+    """Generate count random tasks."""
+    statuses = list(TaskStatus)
+    now = datetime.utcnow()
+    return [
+        TaskCreate(
+            title=" ".join(rng.choice(WORDS) for _ in range(3)),
+            description=f"Synthetic task {i}" if rng.random() < 0.7 else None,
+            assignee=rng.choice(ASSIGNEES) if rng.random() < 0.9 else None,
+            due_date=now + timedelta(days=rng.randint(-365, 365)) if rng.random() < 0.8 else None,
+            status=rng.choice(statuses)
+        )
+        for i in range(count)
+    ]
+
+
+def seed(size: int, rng: random.Random, batch_size: int = 10000) -> None:
+    """Replace the server's tasks with size synthetic ones."""
+    storage = server.task_storage
+    storage.clear_all_tasks()
+    for start in range(0, size, batch_size):
+        storage.create_tasks(synthetic_tasks(min(batch_size, size - start), rng))
+
+
+class Workload:
+    """Picks random operations from a weighted mix and turns them into requests."""
+    
+    def __init__(self, mix: Dict[str, int], size: int, rng: random.Random):
+        """Create a workload over a store seeded with size tasks."""
+        self.operations = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.operations]
+        self.max_id = size
+        self.rng = rng
+    
+    def _random_id(self) -> int:
+        """Pick an id that exists or existed, so some requests hit deleted tasks."""
+        return self.rng.randint(1, max(self.max_id, 1))
+    
+    def next_request(self) -> Tuple[str, str, str, Optional[Dict[str, Any]], Any]:
+        """Return (label, method, path, params, json body) for a random operation."""
+        rng = self.rng
+        op = rng.choices(self.operations, self.weights)[0]
+        if op == "get":
+            return "GET /tasks/{id}", "GET", f"/tasks/{self._random_id()}", None, None
+        if op == "page":
+            return "GET /tasks?limit", "GET", "/tasks", {"limit": 50}, None
+        if op == "filter":
+            params = {"status": rng.choice(list(TaskStatus)).value, "assignee": rng.choice(ASSIGNEES[:20])}
+            return "GET /tasks?status&assignee", "GET", "/tasks", params, None
+        if op == "search":
+            return "GET /tasks?title_contains", "GET", "/tasks", {"title_contains": rng.choice(WORDS), "limit": 50}, None
+        if op == "create":
+            self.max_id += 1
+            body = synthetic_tasks(1, rng)[0].model_dump(mode="json")
+            return "POST /tasks", "POST", "/tasks", None, body
+        if op == "update":
+            body = {"status": rng.choice(list(TaskStatus)).value, "description": f"Updated {rng.random()}"}
+            return "PUT /tasks/{id}", "PUT", f"/tasks/{self._random_id()}", None, body
+        if op == "delete":
+            return "DELETE /tasks/{id}", "DELETE", f"/tasks/{self._random_id()}", None, None
+        if op == "list_all":
+            return "GET /tasks", "GET", "/tasks", None, None
+        raise ValueError(f"Unknown operation: {op!r}")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples: Dict[str, List[float]], statuses: Dict[str, Dict[int, int]], elapsed: float) -> Dict[str, Any]:
+    """Build per-endpoint and overall throughput and latency figures, in milliseconds."""
+    endpoints = {}
+    all_latencies: List[float] = []
+    for label, latencies in sorted(samples.items()):
+        latencies.sort()
+        all_latencies.extend(latencies)
+        endpoints[label] = {
+            "requests": len(latencies),
+            "throughput": len(latencies) / elapsed,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "statuses": {str(code): count for code, count in sorted(statuses[label].items())},
+        }
+    all_latencies.sort()
+    return {
+        "elapsed_s": elapsed,
+        "requests": len(all_latencies),
+        "throughput": len(all_latencies) / elapsed,
+        "p50_ms": percentile(all_latencies, 0.50) * 1000,
+        "p95_ms": percentile(all_latencies, 0.95) * 1000,
+        "p99_ms": percentile(all_latencies, 0.99) * 1000,
+        "endpoints": endpoints,
+    }
+
+
+async def run_workload(
+    make_client: Callable[[], Any],
+    workload: Workload,
+    requests: int,
+    concurrency: int,
+    warmup: int
+) -> Dict[str, Any]:
+    """Send requests from concurrency workers and collect latencies per endpoint."""
+    samples: Dict[str, List[float]] = {}
+    statuses: Dict[str, Dict[int, int]] = {}
+    remaining = warmup + requests
+    started_at = 0.0
+    
+    async def worker():
+        nonlocal remaining, started_at
+        client = make_client()
+        try:
+            while remaining > 0:
+                remaining -= 1
+                measured = remaining < requests
+                if measured and not started_at:
+                    started_at = time.perf_counter()
+                label, method, path, params, body = workload.next_request()
+                start = time.perf_counter()
+                status, _, _ = await client.request(method, path, params=params, json_body=body)
+                latency = time.perf_counter() - start
+                if measured:
+                    samples.setdefault(label, []).append(latency)
+                    label_statuses = statuses.setdefault(label, {})
+                    label_statuses[status] = label_statuses.get(status, 0) + 1
+        finally:
+            await client.close()
+    
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, statuses, time.perf_counter() - started_at)
+
+
+class LoopbackServer:
+    """Runs the app under uvicorn in a background thread on a free local port."""
+    
+    def __init__(self):
+        """Pick a free port and prepare the server."""
+        import uvicorn
+        
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        config = uvicorn.Config(server.app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, name="uvicorn", daemon=True)
+    
+    def __enter__(self) -> "LoopbackServer":
+        """Start the server and wait until it accepts connections."""
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("uvicorn failed to start")
+            time.sleep(0.01)
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        """Stop the server."""
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print a comparison with a baseline and return the regressions found."""
+    regressions = []
+    for setting in ("mode", "concurrency", "mix"):
+        if baseline.get("settings", {}).get(setting) != results["settings"][setting]:
+            print(f"Warning: the baseline was run with a different {setting}")
+    for size, run in results["runs"].items():
+        base_run = baseline.get("runs", {}).get(size)
+        if base_run is None:
+            print(f"\n{size} tasks: not in baseline")
+            continue
+        print(f"\n{size} tasks vs baseline ({'throughput':>10} {'p50':>8} {'p99':>8})")
+        for label, stats in run["endpoints"].items():
+            base = base_run["endpoints"].get(label)
+            if base is None:
+                continue
+            throughput = stats["throughput"] / base["throughput"] if base["throughput"] else float("inf")
+            p50 = stats["p50_ms"] / base["p50_ms"] if base["p50_ms"] else float("inf")
+            p99 = stats["p99_ms"] / base["p99_ms"] if base["p99_ms"] else float("inf")
+            flag = ""
+            if p50 > 1 + tolerance or throughput < 1 - tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{size} tasks, {label}: p50 x{p50:.2f}, throughput x{throughput:.2f}")
+            print(f"  {label:<28} {throughput:9.2f}x {p50:7.2f}x {p99:7.2f}x{flag}")
+    return regressions
+
+
+def print_run(size: int, summary: Dict[str, Any]) -> None:
+    """Print one run as a table."""
+    print(f"\n{size} tasks: {summary['requests']} requests in {summary['elapsed_s']:.2f}s, "
+          f"{summary['throughput']:.0f} req/s, p50 {summary['p50_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms")
+    print(f"  {'endpoint':<28} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    for label, stats in summary["endpoints"].items():
+        print(f"  {label:<28} {stats['throughput']:9.0f} {stats['p50_ms']:8.2f} "
+              f"{stats['p95_ms']:8.2f} {stats['p99_ms']:8.2f}  {stats['statuses']}")
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """Parse a mix like "get=40,create=10" on top of the default weights."""
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, text.split(",")):
+        name, _, weight = item.partition("=")
+        if name not in mix:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}; choose from {', '.join(mix)}")
+        mix[name] = int(weight)
+    return mix
+
+
+def main():
+    """Run the benchmark for each dataset size."""
+    parser = argparse.ArgumentParser(description="Load benchmark for the task API")
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi",
+                        help="Call the app in-process, or through uvicorn on the loopback interface")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma-separated dataset sizes, e.g. 1000,10000,100000,1000000")
+    parser.add_argument("--requests", type=int, default=5000, help="Measured requests per dataset size")
+    parser.add_argument("--warmup", type=int, default=500, help="Unmeasured requests before each run")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent clients")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help=f"Operation weights, e.g. get=40,create=10 (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and workload")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare with results previously written by --output")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Relative slowdown allowed before a baseline comparison fails")
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "storage_backend": server.config.storage_backend,
+        "settings": {
+            "mode": args.mode,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "seed": args.seed,
+        },
+        "runs": {},
+    }
+    
+    # The app is driven without a lifespan, so the storage is set up here
+    server.startup()
+    for size in sizes:
+        rng = random.Random(args.seed)
+        seed_start = time.perf_counter()
+        seed(size, rng)
+        print(f"Seeded {size} tasks in {time.perf_counter() - seed_start:.2f}s")
+        workload = Workload(args.mix, size, rng)
+        if args.mode == "uvicorn":
+            with LoopbackServer() as loopback:
+                summary = asyncio.run(run_workload(
+                    lambda: HTTPClient("127.0.0.1", loopback.port), workload, args.requests, args.concurrency, args.warmup
+                ))
+        else:
+            summary = asyncio.run(run_workload(
+                lambda: ASGIClient(server.app), workload, args.requests, args.concurrency, args.warmup
+            ))
+        results["runs"][str(size)] = summary
+        print_run(size, summary)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
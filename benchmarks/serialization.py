@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark task list serialization.
+
+Compares FastAPI's response_model path with the direct encoders used by the
+server, and checks that every path produces the same bytes.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization --tasks 10000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Callable, List
+from fastapi import FastAPI
+from benchmarks.asgi import ASGIClient
+from src.dummy_server.models import Task, TaskCreate, TaskStatus
+from src.dummy_server.response_cache import TaskJSONCache, get_task_encoder
+from src.dummy_server.storage import TaskStorage
+
+
+def make_tasks(count: int) -> List[Task]:
+    """Create count tasks with varied fields."""
+    storage = TaskStorage()
+    statuses = list(TaskStatus)
+    storage.create_tasks([
+        TaskCreate(
+            title=f"Task number {i}",
+            description=f"Description of task {i}" if i % 3 else None,
+            assignee=f"user{i % 50}@example.com",
+            status=statuses[i % len(statuses)]
+        )
+        for i in range(count)
+    ])
+    return storage.get_all_tasks()
+
+
+def response_model_app(tasks: List[Task]) -> FastAPI:
+    """Build an app that returns the tasks through response_model, like the original handlers."""
+    app = FastAPI()
+    
+    @app.get("/tasks", response_model=List[Task])
+    async def get_tasks():
+        return tasks
+    
+    return app
+
+
+def measure(func: Callable[[], bytes], repeat: int) -> float:
+    """Return the best time of repeat calls in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Run the benchmark and print a table of results."""
+    parser = argparse.ArgumentParser(description="Benchmark task list serialization")
+    parser.add_argument("--tasks", type=int, default=10000, help="Number of tasks in the list")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per case; the best is reported")
+    args = parser.parse_args()
+    
+    tasks = make_tasks(args.tasks)
+    client = ASGIClient(response_model_app(tasks))
+    loop = asyncio.new_event_loop()
+    
+    cases = {
+        "response_model": lambda: loop.run_until_complete(client.request("GET", "/tasks"))[2],
+        "pydantic": lambda: TaskJSONCache(0, get_task_encoder("pydantic")).encode_list(tasks)[1],
+    }
+    try:
+        orjson_encoder = get_task_encoder("orjson")
+        cases["orjson"] = lambda: TaskJSONCache(0, orjson_encoder).encode_list(tasks)[1]
+    except ValueError:
+        print("orjson is not installed; skipping the orjson encoder")
+    warm_cache = TaskJSONCache(args.tasks)
+    warm_cache.encode_list(tasks)
+    cases["cached"] = lambda: warm_cache.encode_list(tasks)[1]
+    
+    expected = cases["response_model"]()
+    for name, func in cases.items():
+        if func() != expected:
+            raise SystemExit(f"{name} output differs from response_model output")
+    
+    print(f"Serializing {args.tasks} tasks ({len(expected)} bytes), best of {args.repeat}")
+    baseline = measure(cases["response_model"], args.repeat)
+    for name, func in cases.items():
+        elapsed = baseline if name == "response_model" else measure(func, args.repeat)
+        print(f"{name:<16} {elapsed:9.2f} ms  {baseline / elapsed:6.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Server startup benchmark.
+
+Starts the server in a fresh process, as run_server.py does, and measures
+the time from spawning it to the first successful response, then how long
+the first /openapi.json and /tasks requests take. Each run uses a new
+process so nothing is warm. The bare interpreter startup is measured as
+well for reference.
+
+Settings are passed as environment variables, so configurations can be
+compared run against run:
+
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --env ENVIRONMENT=production --env OPENAPI_CACHE=/tmp/openapi.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    """Return a port nobody is listening on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get(port: int, path: str) -> Optional[int]:
+    """Send one GET request and return its status, or None if the server is not accepting connections yet."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    except (ConnectionRefusedError, ConnectionResetError):
+        return None
+    finally:
+        connection.close()
+
+
+def timed_get(port: int, path: str) -> float:
+    """Return the time one GET request takes."""
+    start = time.perf_counter()
+    status = get(port, path)
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}")
+    return time.perf_counter() - start
+
+
+def interpreter_startup() -> float:
+    """Time to start and exit a bare interpreter."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+
+def run_once(env: Dict[str, str], timeout: float) -> Dict[str, float]:
+    """Start a server, time its first requests and stop it."""
+    port = free_port()
+    command = [sys.executable, "run_server.py", "--no-reload", "--port", str(port), "--log-level", "warning"]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL)
+    try:
+        while get(port, "/health") != 200:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}")
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError(f"Server did not respond within {timeout}s")
+            time.sleep(0.002)
+        first_response = time.perf_counter() - start
+        return {
+            "first_response": first_response,
+            "first_openapi": timed_get(port, "/openapi.json"),
+            "first_tasks": timed_get(port, "/tasks"),
+        }
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration in milliseconds."""
+    return f"{seconds * 1e3:.1f} ms"
+
+
+def main():
+    """Run the benchmark and print the startup report."""
+    parser = argparse.ArgumentParser(description="Server startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Number of server starts")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Setting passed to the server, may be repeated")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for a server to respond")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    
+    settings = {}
+    for item in args.env:
+        key, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"--env expects KEY=VALUE, got {item!r}")
+        settings[key] = value
+    env = {**os.environ, "SERVER_RELOAD": "false", "SERVER_WORKERS": "1", **settings}
+    
+    interpreter = min(interpreter_startup() for _ in range(3))
+    runs: List[Dict[str, float]] = []
+    for i in range(args.runs):
+        runs.append(run_once(env, args.timeout))
+        print(f"Run {i + 1}: first response after {format_time(runs[-1]['first_response'])}")
+    
+    report = {"settings": settings, "interpreter_startup": interpreter, "measurements": {}}
+    print(f"\nStartup over {args.runs} runs (bare interpreter: {format_time(interpreter)})")
+    print(f"  {'measurement':<16}{'median':>12}{'min':>12}{'max':>12}")
+    for name in runs[0]:
+        values = [run[name] for run in runs]
+        report["measurements"][name] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+            "runs": values,
+        }
+        print(f"  {name:<16}" + "".join(f"{format_time(v):>12}" for v in (statistics.median(values), min(values), max(values))))
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
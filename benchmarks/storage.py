@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Storage microbenchmarks with a scaling report.
+
+Times each storage method against store sizes on a log scale, measures the
+memory it allocates per operation, and fits the growth of the time per
+operation to a power law. An operation whose fitted exponent is clearly
+above the expected one is flagged, such as an indexed search that scans.
+
+Filtered searches always target the same small set of tasks, so their
+result size does not grow with the store. The query cache is disabled so
+that every search is actually run.
+
+Run from the repository root:
+
+    python -m benchmarks.storage --sizes 1000,10000,100000
+    python -m benchmarks.storage --backend sqlite --output storage.json
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import math
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+from src.dummy_server.models import TaskCreate, TaskStatus, TaskUpdate
+from src.dummy_server.sqlite_storage import SQLiteTaskStorage
+from src.dummy_server.storage import TaskStorage, TaskStore
+
+WORDS = [
+    "fix", "deploy", "review", "update", "refactor", "test", "document", "release",
+    "database", "login", "billing", "search", "cache", "report", "dashboard", "api",
+]
+
+# Tasks every filtered search is aimed at; their number does not depend on the store size
+NEEDLES = 50
+NEEDLE_TITLE = "zqxv"
+NEEDLE_ASSIGNEE = "needle"
+NEEDLE_STATUS = TaskStatus.CANCELLED
+
+# Search cases: name -> (search_tasks keyword arguments, expected exponent)
+SEARCHES: Dict[str, Tuple[Dict[str, str], float]] = {
+    "search status": ({"status": NEEDLE_STATUS.value}, 0.0),
+    "search assignee": ({"assignee": NEEDLE_ASSIGNEE}, 0.0),
+    "search title": ({"title_contains": NEEDLE_TITLE}, 0.0),
+    "search status+assignee": ({"status": NEEDLE_STATUS.value, "assignee": NEEDLE_ASSIGNEE}, 0.0),
+    "search status+title": ({"status": NEEDLE_STATUS.value, "title_contains": NEEDLE_TITLE}, 0.0),
+    "search assignee+title": ({"assignee": NEEDLE_ASSIGNEE, "title_contains": NEEDLE_TITLE}, 0.0),
+    "search all filters": (
+        {"status": NEEDLE_STATUS.value, "assignee": NEEDLE_ASSIGNEE, "title_contains": NEEDLE_TITLE}, 0.0
+    ),
+    # Two characters are too short for the trigram index, so this one scans
+    "search title (2 chars)": ({"title_contains": "zq"}, 1.0),
+}
+
+# Expected exponents of the other operations
+EXPECTED = {
+    "create_task": 0.0,
+    "get_task": 0.0,
+    "update_task": 0.0,
+    "delete_task": 0.0,
+    "get_all_tasks": 1.0,
+}
+
+
+def make_storage(backend: str, directory: str) -> TaskStore:
+    """Create an empty store of the given kind."""
+    if backend == "memory":
+        return TaskStorage(query_cache_size=0)
+    if backend == "compact":
+        return TaskStorage(compact=True, query_cache_size=0)
+    if backend == "sqlite":
+        return SQLiteTaskStorage(os.path.join(directory, f"bench-{time.monotonic_ns()}.db"))
+    raise ValueError(f"Unknown backend: {backend!r}")
+
+
+def populate(storage: TaskStore, size: int, rng: random.Random, batch_size: int = 10000) -> None:
+    """Fill a store with size tasks, NEEDLES of which match every search."""
+    statuses = [status for status in TaskStatus if status != NEEDLE_STATUS]
+    now = datetime.utcnow()
+    needle_positions = set(rng.sample(range(size), NEEDLES))
+    batch: List[TaskCreate] = []
+    for i in range(size):
+        if i in needle_positions:
+            task = TaskCreate(
+                title=f"{NEEDLE_TITLE} needle task {i}",
+                assignee=f"{NEEDLE_ASSIGNEE}@example.com",
+                status=NEEDLE_STATUS
+            )
+        else:
+            task = TaskCreate(
+                title=" ".join(rng.choice(WORDS) for _ in range(3)),
+                description=f"Task {i}",
+                assignee=f"user{rng.randrange(200)}@example.com",
+                due_date=now + timedelta(days=rng.randint(-365, 365)),
+                status=rng.choice(statuses)
+            )
+        batch.append(task)
+        if len(batch) == batch_size:
+            storage.create_tasks(batch)
+            batch = []
+    if batch:
+        storage.create_tasks(batch)
+
+
+def operations(storage: TaskStore, size: int, rng: random.Random) -> Dict[str, Tuple[Callable[[], Any], int]]:
+    """Build each benchmarked operation as (run once, number of calls per measurement)."""
+    calls = max(10, min(1000, size // 10))
+    ids = [rng.randint(1, size) for _ in range(calls)]
+    new_task = TaskCreate(title="benchmark task", assignee="bench@example.com")
+    update = TaskUpdate(status=TaskStatus.DONE, description="updated")
+    id_iter = itertools.cycle(ids)
+    
+    ops: Dict[str, Tuple[Callable[[], Any], int]] = {
+        "create_task": (lambda: storage.create_task(new_task), calls),
+        "get_task": (lambda: storage.get_task(next(id_iter)), calls),
+        "update_task": (lambda: storage.update_task(next(id_iter), update), calls),
+    }
+    for name, (kwargs, _) in SEARCHES.items():
+        ops[name] = (lambda kwargs=kwargs: storage.search_tasks(**kwargs), 20)
+    ops["get_all_tasks"] = (storage.get_all_tasks, 3)
+    # Deletes go last since they shrink the store
+    delete_ids = iter(rng.sample(range(1, size + 1), min(calls, size // 2)))
+    ops["delete_task"] = (lambda: storage.delete_task(next(delete_ids)), min(calls, size // 2))
+    return ops
+
+
+def time_per_call(func: Callable[[], Any], calls: int) -> float:
+    """Return the average time of one call in seconds."""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        return (time.perf_counter() - start) / calls
+    finally:
+        gc.enable()
+
+
+def memory_per_call(func: Callable[[], Any], calls: int) -> Tuple[float, float]:
+    """Return (bytes retained, peak bytes allocated) per call."""
+    gc.collect()
+    # Starting tracemalloc resets its counters, so only this run is traced
+    tracemalloc.start()
+    try:
+        results = [func() for _ in range(calls)]
+        peak = tracemalloc.get_traced_memory()[1]
+        # Results are kept alive until now so the peak includes them
+        del results
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return retained / calls, peak / calls
+
+
+def fit_exponent(sizes: List[int], times: List[float]) -> float:
+    """Least-squares slope of log(time) against log(size)."""
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(value, 1e-12)) for value in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    if denominator == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+
+
+def run_size(backend: str, size: int, seed: int, directory: str) -> Dict[str, Dict[str, float]]:
+    """Benchmark every operation on fresh stores of one size."""
+    results: Dict[str, Dict[str, float]] = {}
+    # One store for timing and one for memory, so both see the same state
+    for measure in ("time", "memory"):
+        rng = random.Random(seed)
+        storage = make_storage(backend, directory)
+        populate(storage, size, rng)
+        for name, (func, calls) in operations(storage, size, rng).items():
+            entry = results.setdefault(name, {})
+            if measure == "time":
+                entry["seconds"] = time_per_call(func, calls)
+            else:
+                entry["retained_bytes"], entry["peak_bytes"] = memory_per_call(func, calls)
+        close = getattr(storage, "close", None)
+        if close is not None:
+            close()
+    return results
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def format_bytes(count: float) -> str:
+    """Format a byte count with a readable unit."""
+    if abs(count) >= 1024 * 1024:
+        return f"{count / (1024 * 1024):.1f} MB"
+    if abs(count) >= 1024:
+        return f"{count / 1024:.1f} KB"
+    return f"{count:.0f} B"
+
+
+def main():
+    """Run the benchmark and print the scaling report."""
+    parser = argparse.ArgumentParser(description="Storage microbenchmarks with a scaling report")
+    parser.add_argument("--backend", choices=["memory", "compact", "sqlite"], default="memory",
+                        help="Storage to benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000",
+                        help="Comma-separated store sizes, ideally on a log scale")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--slack", type=float, default=0.3,
+                        help="How far a fitted exponent may exceed the expected one before it is flagged")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    if len(sizes) < 2:
+        parser.error("at least two sizes are needed to fit the scaling")
+    if sizes[0] < 2 * NEEDLES:
+        parser.error(f"sizes must be at least {2 * NEEDLES}")
+    
+    runs: Dict[int, Dict[str, Dict[str, float]]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            start = time.perf_counter()
+            runs[size] = run_size(args.backend, size, args.seed, directory)
+            print(f"Benchmarked {size} tasks in {time.perf_counter() - start:.1f}s")
+    
+    expected = dict(EXPECTED)
+    expected.update({name: exponent for name, (_, exponent) in SEARCHES.items()})
+    report: Dict[str, Any] = {"backend": args.backend, "sizes": sizes, "operations": {}}
+    flagged = []
+    
+    print(f"\nTime per operation ({args.backend} backend)")
+    print(f"  {'operation':<24}" + "".join(f"{size:>12}" for size in sizes) + f"{'exponent':>10}{'expected':>10}")
+    for name in runs[sizes[0]]:
+        times = [runs[size][name]["seconds"] for size in sizes]
+        exponent = fit_exponent(sizes, times)
+        flag = exponent > expected[name] + args.slack
+        if flag:
+            flagged.append(name)
+        report["operations"][name] = {
+            "expected_exponent": expected[name],
+            "fitted_exponent": exponent,
+            "flagged": flag,
+            "by_size": {str(size): runs[size][name] for size in sizes},
+        }
+        print(f"  {name:<24}" + "".join(f"{format_time(t):>12}" for t in times)
+              + f"{exponent:>10.2f}{expected[name]:>10.1f}" + ("  WORSE THAN EXPECTED" if flag else ""))
+    
+    print("\nMemory per operation (retained / peak)")
+    print(f"  {'operation':<24}" + "".join(f"{size:>22}" for size in sizes))
+    for name in runs[sizes[0]]:
+        cells = [
+            f"{format_bytes(runs[size][name]['retained_bytes'])} / {format_bytes(runs[size][name]['peak_bytes'])}"
+            for size in sizes
+        ]
+        print(f"  {name:<24}" + "".join(f"{cell:>22}" for cell in cells))
+    
+    if flagged:
+        print(f"\nScaling worse than expected: {', '.join(flagged)}")
+    else:
+        print("\nAll operations scale as expected")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark across worker counts.
+
+Starts run_server.py with each --workers value, seeds it with synthetic
+tasks over HTTP and drives the load benchmark's workload from several
+client processes, so the load generator is not the bottleneck. With more
+than one worker the tasks live in the shared storage server, so this
+shows how far throughput scales before that process saturates. Run it on
+a machine with at least as many cores as the largest worker count.
+
+Run from the repository root:
+
+    python -m benchmarks.workers --workers 1,2,4,8 --size 10000
+    python -m benchmarks.workers --mix get=80,page=10,filter=10,create=0,update=0,delete=0
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Any, Dict, List
+
+# Synthetic data replaces the sample tasks; must be set before the server is imported
+os.environ.setdefault("SEED_SAMPLE_DATA", "false")
+
+from benchmarks.asgi import HTTPClient
+from benchmarks.load import DEFAULT_MIX, Workload, parse_mix, run_workload, synthetic_tasks
+
+
+def free_port() -> int:
+    """Return a port that is free on the loopback interface."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, socket_path: str, timeout: float = 30.0) -> subprocess.Popen:
+    """Start run_server.py and wait until it answers health checks."""
+    env = dict(os.environ, SEED_SAMPLE_DATA="false", STORAGE_SOCKET=socket_path, MAX_CONCURRENCY="0")
+    process = subprocess.Popen(
+        [sys.executable, "run_server.py", "--port", str(port), "--workers", str(workers),
+         "--no-reload", "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1):
+                return process
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.terminate()
+                raise RuntimeError(f"Server with {workers} workers failed to start")
+            time.sleep(0.1)
+
+
+def seed(port: int, size: int, seed_value: int, batch_size: int = 1000) -> None:
+    """Create size synthetic tasks through the bulk endpoint."""
+    rng = random.Random(seed_value)
+    for start in range(0, size, batch_size):
+        tasks = synthetic_tasks(min(batch_size, size - start), rng)
+        body = json.dumps([task.model_dump(mode="json") for task in tasks]).encode()
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{port}/tasks/bulk",
+            data=body,
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request):
+            pass
+
+
+def client_process(args: tuple) -> Dict[str, Any]:
+    """Run one client process's share of the workload and return its summary."""
+    port, mix, size, seed_value, requests, concurrency, warmup = args
+    workload = Workload(mix, size, random.Random(seed_value))
+    return asyncio.run(run_workload(lambda: HTTPClient("127.0.0.1", port), workload, requests, concurrency, warmup))
+
+
+def measure(port: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Drive the server from args.clients processes at once and combine their results."""
+    shares = [
+        (port, args.mix, args.size, args.seed + index, args.requests // args.clients,
+         args.concurrency, args.warmup // args.clients)
+        for index in range(args.clients)
+    ]
+    with multiprocessing.Pool(args.clients) as pool:
+        summaries = pool.map(client_process, shares)
+    requests = sum(summary["requests"] for summary in summaries)
+    elapsed = max(summary["elapsed_s"] for summary in summaries)
+    return {
+        "requests": requests,
+        "elapsed_s": elapsed,
+        "throughput": requests / elapsed,
+        "p50_ms": max(summary["p50_ms"] for summary in summaries),
+        "p99_ms": max(summary["p99_ms"] for summary in summaries),
+    }
+
+
+def main():
+    """Run the workload against each worker count and print the scaling."""
+    parser = argparse.ArgumentParser(description="Throughput benchmark across worker counts")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts, e.g. 1,2,4,8")
+    parser.add_argument("--size", type=int, default=10000, help="Number of tasks to seed")
+    parser.add_argument("--requests", type=int, default=20000, help="Measured requests per worker count")
+    parser.add_argument("--warmup", type=int, default=2000, help="Unmeasured requests before each run")
+    parser.add_argument("--clients", type=int, default=max(1, min(8, os.cpu_count() or 1)),
+                        help="Number of load generating processes (default: one per core, up to 8)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent connections per client process")
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX),
+                        help=f"Operation weights, e.g. get=40,create=10 (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and workload")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    
+    print(f"{os.cpu_count()} CPUs, {args.clients} client processes x {args.concurrency} connections, "
+          f"{args.size} tasks")
+    print(f"{'workers':>7} {'req/s':>9} {'scaling':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    results: List[Dict[str, Any]] = []
+    for workers in [int(count) for count in args.workers.split(",")]:
+        port = free_port()
+        with tempfile.TemporaryDirectory() as directory:
+            process = start_server(workers, port, os.path.join(directory, "storage.sock"))
+            try:
+                seed(port, args.size, args.seed)
+                summary = measure(port, args)
+            finally:
+                process.terminate()
+                process.wait()
+        summary["workers"] = workers
+        results.append(summary)
+        scaling = summary["throughput"] / results[0]["throughput"]
+        print(f"{workers:>7} {summary['throughput']:9.0f} {scaling:7.2f}x "
+              f"{summary['p50_ms']:8.2f} {summary['p99_ms']:8.2f}")
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"cpus": os.cpu_count(), "settings": vars(args), "runs": results}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ import subprocess
 import threading
 import requests
 from datetime import datetime, timedelta
+from src.dummy_server.client import TaskClient
 
 
 def start_server():
@@ -22,28 +23,59 @@ def start_server():
 def wait_for_server(url="http://127.0.0.1:8080", timeout=30):
     """Wait for the server to be ready."""
     start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            response = requests.get(f"{url}/health")
-            if response.status_code == 200:
+    with TaskClient(url, retries=0) as client:
+        while time.time() - start_time < timeout:
+            try:
+                client.health()
                 return True
-        except requests.exceptions.ConnectionError:
-            pass
-        time.sleep(0.5)
+            except requests.exceptions.ConnectionError:
+                pass
+            time.sleep(0.5)
     return False
 
 
+def demo_round_trips(client, base_url, count=50):
+    """Compare one request per task without a session against the pooled client."""
+    print(f"⚡ Round trips for {count} tasks:")
+    tasks = [{"title": f"Round trip task {i}", "assignee": "roundtrip@example.com"} for i in range(count)]
+    
+    start = time.perf_counter()
+    ids = [requests.post(f"{base_url}/tasks", json=task).json()["id"] for task in tasks]
+    for task_id in ids:
+        requests.get(f"{base_url}/tasks/{task_id}")
+    for task_id in ids:
+        requests.delete(f"{base_url}/tasks/{task_id}")
+    unpooled = time.perf_counter() - start
+    print(f"   New connection per request: {count * 3} requests in {unpooled * 1e3:.0f} ms")
+    
+    start = time.perf_counter()
+    ids = [client.create_task(task)["id"] for task in tasks]
+    client.get_tasks(ids)
+    for task_id in ids:
+        client.delete_task(task_id)
+    pooled = time.perf_counter() - start
+    print(f"   Pooled connections:         {count * 3} requests in {pooled * 1e3:.0f} ms")
+    
+    start = time.perf_counter()
+    ids = client.create_tasks(tasks)
+    client.list_tasks(assignee="roundtrip@example.com")
+    client.delete_tasks(ids)
+    bulk = time.perf_counter() - start
+    print(f"   Bulk and paginated:         3 requests in {bulk * 1e3:.0f} ms")
+    print()
+
+
 def demo_api():
     """Demonstrate the API capabilities."""
     base_url = "http://127.0.0.1:8080"
+    client = TaskClient(base_url)
     
     print("🚀 Dummy Server API Demo")
     print("=" * 50)
     
     # Show server info
     print("📡 Server Information:")
-    response = requests.get(f"{base_url}/")
-    server_info = response.json()
+    server_info = client.info()
     print(f"   Title: {server_info['title']}")
     print(f"   Version: {server_info['version']}")
     print(f"   Docs: http://127.0.0.1:8080{server_info['docs_url']}")
@@ -51,8 +83,7 @@ def demo_api():
     
     # Show initial tasks
     print("📋 Initial Tasks:")
-    response = requests.get(f"{base_url}/tasks")
-    tasks = response.json()
+    tasks = client.list_tasks()
     for task in tasks:
         print(f"   {task['id']}. {task['title']} [{task['status']}] - {task['assignee']}")
     print()
@@ -66,8 +97,7 @@ def demo_api():
         "due_date": (datetime.now() + timedelta(days=7)).isoformat(),
         "status": "todo"
     }
-    response = requests.post(f"{base_url}/tasks", json=new_task)
-    created_task = response.json()
+    created_task = client.create_task(new_task)
     task_id = created_task['id']
     print(f"   ✅ Created task {task_id}: {created_task['title']}")
     print()
@@ -78,31 +108,27 @@ def demo_api():
         "status": "in_progress",
         "description": "Task updated by demo script - now in progress!"
     }
-    response = requests.put(f"{base_url}/tasks/{task_id}", json=update_data)
-    updated_task = response.json()
+    updated_task = client.update_task(task_id, update_data)
     print(f"   ✅ Updated task {task_id}: status = {updated_task['status']}")
     print()
     
     # Filter tasks by status
     print("🔍 Filtering tasks by status (in_progress):")
-    response = requests.get(f"{base_url}/tasks?status=in_progress")
-    filtered_tasks = response.json()
+    filtered_tasks = client.list_tasks(status="in_progress")
     for task in filtered_tasks:
         print(f"   {task['id']}. {task['title']} - {task['assignee']}")
     print()
     
     # Search by assignee
     print("🔍 Searching tasks by assignee (demo@example.com):")
-    response = requests.get(f"{base_url}/tasks?assignee=demo@example.com")
-    search_results = response.json()
+    search_results = client.list_tasks(assignee="demo@example.com")
     for task in search_results:
         print(f"   {task['id']}. {task['title']} - due: {task['due_date']}")
     print()
     
     # Show task details
     print(f"📄 Task {task_id} details:")
-    response = requests.get(f"{base_url}/tasks/{task_id}")
-    task_details = response.json()
+    task_details = client.get_task(task_id)
     print(f"   Title: {task_details['title']}")
     print(f"   Description: {task_details['description']}")
     print(f"   Assignee: {task_details['assignee']}")
@@ -114,17 +140,18 @@ def demo_api():
     
     # Complete the task
     print("✅ Completing the task...")
-    response = requests.put(f"{base_url}/tasks/{task_id}", json={"status": "done"})
-    completed_task = response.json()
+    completed_task = client.update_task(task_id, {"status": "done"})
     print(f"   ✅ Task {task_id} marked as {completed_task['status']}")
     print()
     
     # Show final task count
-    response = requests.get(f"{base_url}/health")
-    health_info = response.json()
+    health_info = client.health()
     print(f"📊 Total tasks in system: {health_info['total_tasks']}")
     print()
     
+    demo_round_trips(client, base_url)
+    client.close()
+    
     print("🎉 Demo completed! Check out the interactive docs at:")
     print(f"   📚 Swagger UI: http://127.0.0.1:8080/docs")
     print(f"   📖 ReDoc: http://127.0.0.1:8080/redoc")
@@ -4,10 +4,73 @@ CLI script to run the dummy server.
 """
 
 import argparse
+import multiprocessing
+import os
+import socket
+import time
 import uvicorn
 from src.dummy_server.config import get_server_config
 
 
+def start_storage_server(path, timeout=10.0):
+    """Start the shared storage server process and wait until it accepts connections."""
+    from src.dummy_server.storage_server import run_storage_server
+    
+    process = multiprocessing.Process(target=run_storage_server, args=(path,), name="storage-server", daemon=True)
+    process.start()
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if not process.is_alive() or time.monotonic() > deadline:
+            process.terminate()
+            raise RuntimeError("Storage server failed to start")
+        time.sleep(0.05)
+    return process
+
+
+def bind_listener(host, port):
+    """
+    Bind the socket shared by multiple workers, with Nagle's algorithm off.
+    
+    uvicorn binds it without naming the TCP protocol, so asyncio leaves
+    TCP_NODELAY unset on accepted connections and every keep-alive response
+    waits about 40 ms for the client's delayed ACK. Accepted connections
+    inherit the option from the listening socket.
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def prepare_workers(config):
+    """
+    Share one store between worker processes.
+    
+    The memory backend is moved into a storage server process that workers
+    reach through the remote backend. SQLite databases are shared directly.
+    Sample data is seeded once here instead of in every worker.
+    """
+    storage_process = None
+    if config.storage_backend == "memory":
+        storage_process = start_storage_server(config.storage_socket)
+        os.environ["STORAGE_BACKEND"] = "remote"
+        os.environ["STORAGE_SOCKET"] = config.storage_socket
+    elif config.seed_sample_data:
+        from src.dummy_server.sample_data import seed_sample_tasks
+        from src.dummy_server.storage import create_storage
+        
+        storage = create_storage(config)
+        seed_sample_tasks(storage)
+        close = getattr(storage, "close", None)
+        if close is not None:
+            close()
+    os.environ["SEED_SAMPLE_DATA"] = "false"
+    return storage_process
+
+
 def main():
     """Main entry point for the dummy server CLI."""
     parser = argparse.ArgumentParser(description="Run the Dummy Task Server")
@@ -33,6 +96,18 @@ def main():
         action="store_true",
         help="Disable auto-reload"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes sharing one task store (default: 1)"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Requests each worker handles at once before queueing, 0 for no limit (default: 0)"
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -50,6 +125,10 @@ def main():
     host = args.host or config.host
     port = args.port or config.port
     log_level = args.log_level or config.log_level
+    workers = args.workers or config.workers
+    max_concurrency = args.max_concurrency if args.max_concurrency is not None else config.max_concurrency
+    # Workers read their configuration from the environment
+    os.environ["MAX_CONCURRENCY"] = str(max_concurrency)
     
     # Handle reload setting
     reload = config.reload
@@ -57,28 +136,46 @@ def main():
         reload = True
     elif args.no_reload:
         reload = False
+    if workers > 1 and reload:
+        print("⚠️  Auto-reload is not available with multiple workers, disabling it")
+        reload = False
     
     print(f"🚀 Starting Dummy Task Server...")
     print(f"📍 Server will be available at: http://{host}:{port}")
     print(f"📚 API Documentation: http://{host}:{port}/docs")
     print(f"📖 Alternative docs: http://{host}:{port}/redoc")
     print(f"⚙️  Reload enabled: {reload}")
+    print(f"👷 Workers: {workers}")
+    print(f"🚦 Max concurrency: {max_concurrency or 'unlimited'}")
     print(f"📊 Log level: {log_level}")
     print("")
     
+    storage_process = None
+    listener = None
     try:
+        bind = {"host": host, "port": port}
+        if workers > 1:
+            storage_process = prepare_workers(config)
+            listener = bind_listener(host, port)
+            bind = {"fd": listener.fileno()}
         uvicorn.run(
             "src.dummy_server.server:app",
-            host=host,
-            port=port,
             reload=reload,
-            log_level=log_level
+            workers=workers,
+            log_level=log_level,
+            **bind
         )
     except KeyboardInterrupt:
         print("\n👋 Server stopped by user")
     except Exception as e:
         print(f"❌ Error starting server: {e}")
         return 1
+    finally:
+        if listener is not None:
+            listener.close()
+        if storage_process is not None:
+            storage_process.terminate()
+            storage_process.join()
     
     return 0
 
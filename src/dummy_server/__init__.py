@@ -5,8 +5,46 @@ A simple FastAPI server that implements CRUD operations for tasks.
 """
 
 from .models import Task, TaskCreate, TaskUpdate, TaskStatus
-from .server import app
 from .config import get_server_config
-from .storage import TaskStorage
+from .storage import TaskStorage, TaskStore, create_storage
 
-__all__ = ["Task", "TaskCreate", "TaskUpdate", "TaskStatus", "app", "get_server_config", "TaskStorage"]
+__all__ = [
+    "Task",
+    "TaskCreate",
+    "TaskUpdate",
+    "TaskStatus",
+    "app",
+    "get_server_config",
+    "TaskStorage",
+    "TaskStore",
+    "SQLiteTaskStorage",
+    "RemoteTaskStorage",
+    "create_storage",
+    "TaskClient",
+    "AsyncTaskClient",
+    "TaskAPIError",
+]
+
+
+def __getattr__(name):
+    """
+    Import the app, the optional storage backends and the client on first access.
+    
+    Importing the server module creates the app, which processes that only
+    need the configuration (such as the multi-worker launcher) must not pay
+    for. The SQLite and remote backends and the client are only loaded when
+    used.
+    """
+    if name == "app":
+        from .server import app
+        return app
+    if name == "SQLiteTaskStorage":
+        from .sqlite_storage import SQLiteTaskStorage
+        return SQLiteTaskStorage
+    if name == "RemoteTaskStorage":
+        from .storage_server import RemoteTaskStorage
+        return RemoteTaskStorage
+    if name in ("TaskClient", "AsyncTaskClient", "TaskAPIError"):
+        from . import client
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,166 @@
+"""
+Admission control: a concurrency limit with a bounded, prioritized queue.
+
+At most max_concurrency requests are handled at once. Others wait in a
+queue of at most queue_size requests for up to queue_timeout seconds, and
+are rejected with 503 and Retry-After when the queue is full or the wait
+runs out. Rejecting early keeps latency bounded for the requests that are
+admitted, instead of letting every request slow down together.
+
+Requests have a priority. Waiting high priority requests are admitted
+before low priority ones, and a high priority request arriving at a full
+queue takes the place of the newest low priority one.
+"""
+
+import asyncio
+import json
+import math
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 1
+PRIORITY_NAMES = ("high", "low")
+
+# Why a request was rejected
+SHED_QUEUE_FULL = "queue_full"
+SHED_TIMEOUT = "timeout"
+
+
+class Overloaded(Exception):
+    """Raised when a request is not admitted."""
+    
+    def __init__(self, reason: str):
+        """Create the error with the reason the request was shed."""
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionController:
+    """Concurrency slots and the queue of requests waiting for one."""
+    
+    def __init__(self, max_concurrency: int, queue_size: int = 128, queue_timeout: float = 1.0):
+        """Create a controller admitting max_concurrency requests at once."""
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_use = 0
+        self._queues: Tuple[Deque["asyncio.Future[None]"], ...] = (deque(), deque())
+        self.shed: Dict[Tuple[str, str], int] = {}
+        self.admitted = 0
+        # Called with the priority and reason of every rejected request
+        self.on_shed: Optional[Callable[[str, str], None]] = None
+    
+    def queue_depth(self, priority: int) -> int:
+        """Number of requests of a priority waiting for a slot."""
+        return len(self._queues[priority])
+    
+    def _shed(self, priority: int, reason: str) -> Overloaded:
+        """Count a rejected request and return the error to raise."""
+        key = (PRIORITY_NAMES[priority], reason)
+        self.shed[key] = self.shed.get(key, 0) + 1
+        if self.on_shed is not None:
+            self.on_shed(*key)
+        return Overloaded(reason)
+    
+    async def acquire(self, priority: int) -> None:
+        """Wait for a slot. Raises Overloaded if the request is shed instead."""
+        if self.in_use < self.max_concurrency and not any(self._queues):
+            self.in_use += 1
+            self.admitted += 1
+            return
+        if sum(len(queue) for queue in self._queues) >= self.queue_size:
+            low = self._queues[PRIORITY_LOW]
+            if priority != PRIORITY_HIGH or not low:
+                raise self._shed(priority, SHED_QUEUE_FULL)
+            # Make room by turning away the most recent low priority request
+            low.pop().set_exception(self._shed(PRIORITY_LOW, SHED_QUEUE_FULL))
+        
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._queues[priority]
+        queue.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                queue.remove(waiter)
+                waiter.cancel()
+                raise self._shed(priority, SHED_TIMEOUT)
+            # Admitted or turned away just as the wait ran out; raises in the latter case
+            waiter.result()
+        except asyncio.CancelledError:
+            if not waiter.done():
+                queue.remove(waiter)
+                waiter.cancel()
+            elif not waiter.cancelled() and waiter.exception() is None:
+                # The client went away after being handed a slot
+                self.release()
+            raise
+        self.admitted += 1
+    
+    def release(self) -> None:
+        """Free a slot, handing it to the next waiting request if there is one."""
+        for queue in self._queues:
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    # The slot passes to the waiter, so in_use stays the same
+                    waiter.set_result(None)
+                    return
+        self.in_use -= 1
+    
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait before retrying."""
+        return max(1, math.ceil(self.queue_timeout))
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that admits HTTP requests through an AdmissionController.
+    
+    priority maps an ASGI scope to PRIORITY_HIGH or PRIORITY_LOW, or to None
+    for requests that bypass the limit, such as long-lived streams.
+    """
+    
+    def __init__(self, app, controller: AdmissionController, priority: Callable[[Dict[str, Any]], Optional[int]]):
+        """Wrap an ASGI app."""
+        self.app = app
+        self.controller = controller
+        self.priority = priority
+    
+    async def __call__(self, scope, receive, send):
+        """Handle one ASGI connection, queueing or rejecting HTTP requests while busy."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        priority = self.priority(scope)
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+        
+        controller = self.controller
+        try:
+            await controller.acquire(priority)
+        except Overloaded as e:
+            await self._reject(send, e.reason)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release()
+    
+    async def _reject(self, send, reason: str) -> None:
+        """Answer 503 with Retry-After without running the app."""
+        body = json.dumps({"detail": "Server is overloaded, retry later", "reason": reason}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.controller.retry_after()).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,140 @@
+"""
+Feed of task changes with resumable sequence numbers.
+
+Every storage mutation becomes an event with the next sequence number, kept
+in a fixed-size ring buffer. Clients read the events after the last
+sequence number they have seen. A client whose position has already been
+overwritten in the buffer is told to resynchronize from a full listing.
+"""
+
+import asyncio
+import json
+from typing import Callable, List, Optional, Set, Tuple
+from .models import Task
+
+
+class ChangeEvent:
+    """One storage change, with its JSON payload encoded when it happened."""
+    
+    __slots__ = ("seq", "kind", "task_id", "data")
+    
+    def __init__(self, seq: int, kind: str, task_id: Optional[int], data: bytes):
+        """Create an event."""
+        self.seq = seq
+        self.kind = kind
+        self.task_id = task_id
+        self.data = data
+    
+    def to_sse(self) -> bytes:
+        """Format the event as a Server-Sent Events message."""
+        return b"id: %d\nevent: %s\ndata: %s\n\n" % (self.seq, self.kind.encode(), self.data)
+
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    """Resolve a waiter unless it was cancelled meanwhile."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class ChangeFeed:
+    """
+    Bounded ring buffer of storage changes.
+    
+    The event with sequence number seq lives in slot seq % capacity, so
+    appending and reading from any position are O(1) per event and the
+    memory used never grows past capacity events. Tasks are encoded once,
+    when the change happens, and every stream and poll sends those bytes.
+    The storage replaces a task on update instead of changing it, so the
+    event's task is never altered by later changes.
+    """
+    
+    def __init__(self, capacity: int = 10000, encode: Optional[Callable[[Task], bytes]] = None):
+        """Create a feed remembering the last capacity events. encode turns a task into JSON bytes."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._encode = encode or (lambda task: task.__pydantic_serializer__.to_json(task))
+        self._ring: List[Optional[ChangeEvent]] = [None] * capacity
+        self.last_seq = 0
+        self._waiters: Set["asyncio.Future[None]"] = set()
+    
+    def attach(self, storage: object) -> bool:
+        """Record the storage's change notifications. Returns False if it has none."""
+        subscribe = getattr(storage, "subscribe", None)
+        if subscribe is None:
+            return False
+        subscribe(self._on_change)
+        return True
+    
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest event still in the buffer."""
+        return max(1, self.last_seq - self.capacity + 1)
+    
+    def _on_change(self, kind: str, task_id: Optional[int], task: Optional[Task]) -> None:
+        """Append a storage mutation as the next event and wake waiting readers."""
+        seq = self.last_seq + 1
+        task_json = self._encode(task) if task is not None else b"null"
+        header = json.dumps({"seq": seq, "type": kind, "task_id": task_id}, separators=(",", ":"))
+        data = header[:-1].encode() + b',"task":' + task_json + b"}"
+        self._ring[seq % self.capacity] = ChangeEvent(seq, kind, task_id, data)
+        self.last_seq = seq
+        if self._waiters:
+            waiters, self._waiters = self._waiters, set()
+            for waiter in waiters:
+                # Mutations may come from any thread, so hand over to the waiter's loop
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+    
+    def is_available(self, after_seq: int) -> bool:
+        """Whether every event after after_seq is still in the buffer."""
+        return self.first_seq - 1 <= after_seq <= self.last_seq
+    
+    def events_after(self, after_seq: int, limit: int = 1000) -> List[ChangeEvent]:
+        """
+        Return up to limit events following after_seq, oldest first.
+        
+        The caller checks is_available() first; events that have already
+        been overwritten are not returned.
+        """
+        start = max(after_seq + 1, self.first_seq)
+        end = min(self.last_seq, start + limit - 1)
+        ring = self._ring
+        capacity = self.capacity
+        return [ring[seq % capacity] for seq in range(start, end + 1)]
+    
+    async def wait(self, after_seq: int, timeout: float) -> bool:
+        """Wait until an event after after_seq exists. Returns False on timeout."""
+        waiter = asyncio.get_running_loop().create_future()
+        # Registered before checking, so a change made meanwhile by another thread still wakes it
+        self._waiters.add(waiter)
+        try:
+            if self.last_seq > after_seq:
+                return True
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return self.last_seq > after_seq
+        finally:
+            self._waiters.discard(waiter)
+        return True
+    
+    def position(self, last_event_id: Optional[str]) -> Tuple[int, bool]:
+        """
+        Parse a client's last seen sequence number.
+        
+        Returns the sequence number to read after and whether the client must
+        resynchronize. Clients without a position start at the newest event.
+        """
+        if last_event_id is None or last_event_id == "":
+            return self.last_seq, False
+        try:
+            after_seq = int(last_event_id)
+        except ValueError:
+            return self.last_seq, True
+        if not self.is_available(after_seq):
+            return self.last_seq, True
+        return after_seq, False
+    
+    def resync_event(self) -> ChangeEvent:
+        """Event telling a client to reload every task and continue from the newest event."""
+        data = json.dumps({"seq": self.last_seq, "type": "resync"}, separators=(",", ":")).encode()
+        return ChangeEvent(self.last_seq, "resync", None, data)
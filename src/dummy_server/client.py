@@ -0,0 +1,397 @@
+"""
+Client for the task API.
+
+TaskClient keeps keep-alive connections in a requests session per
+thread, so calls after the first reuse an open connection instead of
+connecting again. It retries failed requests with exponential backoff,
+follows pagination cursors, and splits bulk operations into batches the
+server accepts. AsyncTaskClient is a thread-pool wrapper that offers the
+same calls as coroutines, each run on one of a bounded number of threads.
+    
+    with TaskClient("http://127.0.0.1:8000") as client:
+        ids = client.create_tasks([{"title": "Write docs"}, {"title": "Review"}])
+        for task in client.iter_tasks(status="todo"):
+            print(task["title"])
+
+Tasks are returned as the decoded JSON objects of the API.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Methods that can be repeated without changing the outcome
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+# Statuses worth retrying; 429 and 503 mean the server did not handle the request
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+REJECTED_STATUSES = frozenset({429, 503})
+
+
+class TaskAPIError(Exception):
+    """An error response from the task API."""
+    
+    def __init__(self, status_code: int, detail: Any):
+        """Create the error from a response status and its detail."""
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class TaskClient:
+    """
+    Synchronous client with connection pooling and retries.
+    
+    A requests.Session must not be shared between threads, so each thread
+    that calls the client gets its own, created on first use. One client
+    can be used from several threads at once; close() closes the sessions
+    of all of them.
+    """
+    
+    def __init__(
+        self,
+        base_url: str = "http://127.0.0.1:8000",
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 5.0,
+        pool_size: int = 10,
+        page_size: int = 500,
+        bulk_size: int = 1000,
+        max_workers: int = 8
+    ):
+        """
+        Create a client for the server at base_url.
+        
+        pool_size is the number of connections each thread's session keeps
+        open, page_size the number of tasks fetched per page when iterating,
+        bulk_size the number of items sent per bulk request, and max_workers
+        the number of requests get_tasks sends at once.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.page_size = page_size
+        self.bulk_size = bulk_size
+        self.max_workers = max_workers
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
+        # Created by the first map() call and kept, so its threads keep their sessions
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    @property
+    def session(self) -> requests.Session:
+        """The calling thread's session."""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            with self._lock:
+                self._sessions.append(session)
+            self._local.session = session
+        return session
+    
+    def close(self) -> None:
+        """Stop the map() threads and close the pooled connections of every thread."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            sessions, self._sessions = self._sessions, []
+        if executor is not None:
+            executor.shutdown()
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+    
+    def __enter__(self) -> "TaskClient":
+        """Use the client as a context manager that closes it on exit."""
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        """Close the client."""
+        self.close()
+    
+    def _delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Seconds to wait before retry number attempt, honouring Retry-After."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        # Full jitter, so clients shed at the same moment do not return together
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+    
+    def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request and return the successful response.
+        
+        Responses with a status in RETRY_STATUSES and connection errors are
+        retried up to `retries` times. Requests that are not idempotent are
+        only retried when the server rejected them without handling them.
+        A DELETE retried after an attempt the server may have handled is
+        returned even if it gets 404, since that attempt may have deleted
+        the resource. Raises TaskAPIError for other error responses.
+        """
+        method = method.upper()
+        idempotent = method in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        url = self.base_url + path
+        attempt = 0
+        # Whether an earlier attempt may have reached the application
+        maybe_handled = False
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt >= self.retries:
+                    raise
+                maybe_handled = True
+                time.sleep(self._delay(attempt, None))
+                attempt += 1
+                continue
+            
+            retryable = response.status_code in (RETRY_STATUSES if idempotent else REJECTED_STATUSES)
+            if retryable and attempt < self.retries:
+                maybe_handled = maybe_handled or response.status_code not in REJECTED_STATUSES
+                time.sleep(self._delay(attempt, response))
+                attempt += 1
+                continue
+            if response.status_code == 404 and method == "DELETE" and maybe_handled:
+                return response
+            if response.status_code >= 400:
+                try:
+                    detail = response.json().get("detail", response.text)
+                except ValueError:
+                    detail = response.text
+                raise TaskAPIError(response.status_code, detail)
+            return response
+    
+    def _json(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a request and return its decoded JSON body."""
+        return self.request(method, path, **kwargs).json()
+    
+    # General
+    
+    def info(self) -> Dict[str, Any]:
+        """Return the server information from the root endpoint."""
+        return self._json("GET", "/")
+    
+    def health(self, include_stats: bool = False) -> Dict[str, Any]:
+        """Return the health check."""
+        return self._json("GET", "/health", params={"include_stats": "true"} if include_stats else None)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return the task statistics."""
+        return self._json("GET", "/tasks/stats")
+    
+    # Single tasks
+    
+    def get_task(self, task_id: int) -> Dict[str, Any]:
+        """Get a task by ID."""
+        return self._json("GET", f"/tasks/{task_id}")
+    
+    def create_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a task and return it."""
+        return self._json("POST", "/tasks", json=task)
+    
+    def update_task(self, task_id: int, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Change the given fields of a task and return it."""
+        return self._json("PUT", f"/tasks/{task_id}", json=changes)
+    
+    def delete_task(self, task_id: int) -> Dict[str, Any]:
+        """Delete a task by ID. A retry that finds the task gone counts as deleted."""
+        response = self.request("DELETE", f"/tasks/{task_id}")
+        if response.status_code == 404:
+            return {"message": f"Task {task_id} deleted successfully"}
+        return response.json()
+    
+    # Listing
+    
+    def list_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Fetch one page of tasks and the cursor of the next, or None on the last page.
+        
+        filters are the query parameters of GET /tasks, such as assignee,
+        status, title_contains, due_after, due_before, sort and fields.
+        """
+        params = {key: value for key, value in filters.items() if value is not None}
+        params["limit"] = limit or self.page_size
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = self.request("GET", "/tasks", params=params)
+        return response.json(), response.headers.get("X-Next-Cursor")
+    
+    def iter_tasks(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Yield every matching task, fetching page_size tasks per request."""
+        cursor = None
+        while True:
+            page, cursor = self.list_page(cursor=cursor, **filters)
+            yield from page
+            if cursor is None:
+                return
+    
+    def list_tasks(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Return every matching task; see iter_tasks."""
+        return list(self.iter_tasks(**filters))
+    
+    def map(self, func: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """Call func for each item, at most max_workers at a time, and return the results in order."""
+        items = list(items)
+        if len(items) <= 1:
+            return [func(item) for item in items]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="task-client-map")
+            executor = self._executor
+        return list(executor.map(func, items))
+    
+    def get_tasks(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Get several tasks by ID, fetching up to max_workers at once."""
+        return self.map(self.get_task, task_ids)
+    
+    # Bulk operations
+    
+    def _bulk(self, method: str, items: List[Any], body: Callable[[List[Any]], Any]) -> Dict[str, Any]:
+        """Send items in batches of bulk_size and merge the results."""
+        merged: Dict[str, Any] = {"succeeded": 0, "failed": 0, "results": []}
+        for start in range(0, len(items), self.bulk_size):
+            result = self._json(method, "/tasks/bulk", json=body(items[start:start + self.bulk_size]))
+            merged["succeeded"] += result["succeeded"]
+            merged["failed"] += result["failed"]
+            for item in result["results"]:
+                item["index"] += start
+                merged["results"].append(item)
+        return merged
+    
+    def create_tasks(self, tasks: Iterable[Dict[str, Any]]) -> List[int]:
+        """Create tasks through the bulk endpoint and return their IDs in order."""
+        result = self._bulk("POST", list(tasks), lambda batch: batch)
+        return [item["id"] for item in result["results"]]
+    
+    def update_tasks(self, updates: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Update tasks through the bulk endpoint.
+        
+        Each update holds the task id and the fields to change. Returns the
+        merged bulk result, with missing tasks reported as failed items.
+        """
+        return self._bulk("PATCH", list(updates), lambda batch: batch)
+    
+    def delete_tasks(self, task_ids: Iterable[int]) -> Dict[str, Any]:
+        """Delete tasks through the bulk endpoint and return the merged bulk result."""
+        return self._bulk("DELETE", list(task_ids), lambda batch: {"ids": batch})
+
+
+class AsyncTaskClient:
+    """
+    asyncio client with the calls of TaskClient as coroutines.
+    
+    This is a thread-pool wrapper, not a native asyncio HTTP client: each
+    call runs the blocking TaskClient method on one of max_concurrency
+    threads. At most that many requests are in flight however many
+    coroutines are awaiting, and each thread keeps its own session and
+    connection alive between calls.
+    """
+    
+    def __init__(self, base_url: str = "http://127.0.0.1:8000", max_concurrency: int = 8, **options: Any):
+        """Create a client; options are passed on to TaskClient."""
+        self.client = TaskClient(base_url, **options)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="task-client")
+    
+    async def close(self) -> None:
+        """Wait for running calls and close the connections."""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self.client.close()
+    
+    async def __aenter__(self) -> "AsyncTaskClient":
+        """Use the client as an async context manager that closes it on exit."""
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the client."""
+        await self.close()
+    
+    async def _run(self, func: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Run a blocking call on the client's thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args, **kwargs))
+    
+    async def info(self) -> Dict[str, Any]:
+        """Return the server information from the root endpoint."""
+        return await self._run(self.client.info)
+    
+    async def health(self, include_stats: bool = False) -> Dict[str, Any]:
+        """Return the health check."""
+        return await self._run(self.client.health, include_stats)
+    
+    async def stats(self) -> Dict[str, Any]:
+        """Return the task statistics."""
+        return await self._run(self.client.stats)
+    
+    async def get_task(self, task_id: int) -> Dict[str, Any]:
+        """Get a task by ID."""
+        return await self._run(self.client.get_task, task_id)
+    
+    async def create_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a task and return it."""
+        return await self._run(self.client.create_task, task)
+    
+    async def update_task(self, task_id: int, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Change the given fields of a task and return it."""
+        return await self._run(self.client.update_task, task_id, changes)
+    
+    async def delete_task(self, task_id: int) -> Dict[str, Any]:
+        """Delete a task by ID."""
+        return await self._run(self.client.delete_task, task_id)
+    
+    async def list_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **filters: Any
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Fetch one page of tasks and the cursor of the next."""
+        return await self._run(self.client.list_page, limit, cursor, **filters)
+    
+    async def list_tasks(self, **filters: Any) -> List[Dict[str, Any]]:
+        """Return every matching task, following the pagination cursors."""
+        tasks: List[Dict[str, Any]] = []
+        cursor = None
+        while True:
+            page, cursor = await self.list_page(cursor=cursor, **filters)
+            tasks.extend(page)
+            if cursor is None:
+                return tasks
+    
+    async def get_tasks(self, task_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Get several tasks by ID concurrently, in order."""
+        return list(await asyncio.gather(*(self.get_task(task_id) for task_id in task_ids)))
+    
+    async def create_tasks(self, tasks: Iterable[Dict[str, Any]]) -> List[int]:
+        """Create tasks through the bulk endpoint and return their IDs in order."""
+        return await self._run(self.client.create_tasks, list(tasks))
+    
+    async def update_tasks(self, updates: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Update tasks through the bulk endpoint."""
+        return await self._run(self.client.update_tasks, list(updates))
+    
+    async def delete_tasks(self, task_ids: Iterable[int]) -> Dict[str, Any]:
+        """Delete tasks through the bulk endpoint."""
+        return await self._run(self.client.delete_tasks, list(task_ids))
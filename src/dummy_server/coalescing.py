@@ -0,0 +1,97 @@
+"""
+Single-flight coalescing of identical concurrent computations.
+
+When several requests ask for the same result at the same time, the first
+one computes it and the others wait for that result instead of computing
+it again. A finished result can also be kept for a short window, so a
+burst of identical requests arriving one after another is served from a
+single computation.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Shares in-flight and recently finished results by key.
+    
+    A kept result is dropped after window seconds, and as soon as the
+    attached storage reports a change, so it is never older than the
+    storage it was computed from. Storages that cannot report changes may
+    serve results up to window seconds old.
+    """
+    
+    def __init__(self, window: float = 0.0):
+        """Create a coalescer keeping finished results for window seconds (0 keeps none)."""
+        self.window = window
+        self._generation = 0
+        self._flights: Dict[Hashable, Tuple[int, "asyncio.Future"]] = {}
+        self.computed = 0
+        self.shared = 0
+    
+    def attach(self, storage: object) -> bool:
+        """Discard results whenever the storage changes. Returns False if it reports no changes."""
+        subscribe = getattr(storage, "subscribe", None)
+        if subscribe is None:
+            return False
+        subscribe(self._on_change)
+        return True
+    
+    def _on_change(self, kind: str, task_id: Optional[int], task: object) -> None:
+        """Discard results on a storage change notification."""
+        self.invalidate()
+    
+    def invalidate(self) -> None:
+        """Make every result computed or in flight so far unusable for new callers."""
+        self._generation += 1
+    
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        """Return the result for key, computing it only if no usable one is in flight or kept."""
+        while True:
+            flight = self._flights.get(key)
+            if flight is None or flight[0] != self._generation:
+                break
+            future = flight[1]
+            self.shared += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The computing request went away; compute it here instead
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        flight = (self._generation, future)
+        self._flights[key] = flight
+        self.computed += 1
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            self._forget(key, flight)
+            future.cancel()
+            raise
+        except BaseException as e:
+            self._forget(key, flight)
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody was waiting
+            future.exception()
+            raise
+        future.set_result(result)
+        if self.window > 0:
+            loop.call_later(self.window, self._forget, key, flight)
+        else:
+            self._forget(key, flight)
+        return result
+    
+    def _forget(self, key: Hashable, flight: Tuple[int, "asyncio.Future"]) -> None:
+        """Remove a flight, unless a newer one has replaced it."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """Return how many results were computed and how many calls shared one."""
+        return {"computed": self.computed, "shared": self.shared, "entries": len(self._flights)}
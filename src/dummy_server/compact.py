@@ -0,0 +1,169 @@
+"""
+Column-oriented task container for the compact storage mode.
+"""
+
+import sys
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, MutableMapping, Optional, Tuple
+from .models import Task, TaskStatus
+
+
+# Status values are stored as their position in this tuple
+_STATUSES: Tuple[TaskStatus, ...] = tuple(TaskStatus)
+_STATUS_CODES: Dict[TaskStatus, int] = {value: code for code, value in enumerate(_STATUSES)}
+
+# Sentinels for a missing datetime and for a naive (timezone-less) one
+_NO_TIME = -(2 ** 63)
+_NAIVE = -(2 ** 31)
+
+_EPOCH = datetime(1970, 1, 1)
+_TIMEZONES: Dict[int, timezone] = {}
+
+
+def _pack_time(value: Optional[datetime]) -> Tuple[int, int]:
+    """Split a datetime into epoch microseconds of its wall time and its UTC offset in seconds."""
+    if value is None:
+        return _NO_TIME, _NAIVE
+    offset = value.utcoffset()
+    delta = value.replace(tzinfo=None) - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return micros, _NAIVE if offset is None else int(offset.total_seconds())
+
+
+def _unpack_time(micros: int, offset: int) -> Optional[datetime]:
+    """Rebuild a datetime packed by _pack_time."""
+    if micros == _NO_TIME:
+        return None
+    value = _EPOCH + timedelta(microseconds=micros)
+    if offset == _NAIVE:
+        return value
+    tz = _TIMEZONES.get(offset)
+    if tz is None:
+        tz = _TIMEZONES[offset] = timezone(timedelta(seconds=offset))
+    return value.replace(tzinfo=tz)
+
+
+class CompactTaskTable(MutableMapping[int, Task]):
+    """
+    Mapping of task id to Task that stores fields in parallel columns.
+    
+    Each task occupies one row: strings live in lists (assignees are
+    interned, so repeated names are stored once), the status is a single
+    byte, and timestamps are 64-bit epoch microseconds in typed arrays
+    instead of datetime objects. Task models are only built when a task is
+    read. Rows of deleted tasks are reused by later inserts.
+    
+    A task's columns are written one at a time, so the table is not safe to
+    read from one thread while another modifies it: a reader could see a
+    half-written or reused row. Callers serialize access, and work that
+    runs on another thread, such as writing a snapshot, reads from a copy()
+    taken on the thread that modifies the table.
+    """
+    
+    def __init__(self):
+        """Initialize an empty table."""
+        self._rows: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._titles: List[Optional[str]] = []
+        self._descriptions: List[Optional[str]] = []
+        self._assignees: List[Optional[str]] = []
+        self._statuses = bytearray()
+        # Epoch microseconds and UTC offsets for due_date, created_at, updated_at
+        self._times = array("q")
+        self._offsets = array("i")
+    
+    def _write(self, row: int, task: Task) -> None:
+        """Store a task's fields in a row."""
+        self._titles[row] = task.title
+        self._descriptions[row] = task.description
+        self._assignees[row] = sys.intern(task.assignee) if task.assignee else task.assignee
+        self._statuses[row] = _STATUS_CODES[TaskStatus(task.status)]
+        base = row * 3
+        for index, value in enumerate((task.due_date, task.created_at, task.updated_at)):
+            self._times[base + index], self._offsets[base + index] = _pack_time(value)
+    
+    def _read(self, task_id: int, row: int) -> Task:
+        """Build a Task from a row. Stored values were validated on the way in."""
+        base = row * 3
+        times = self._times
+        offsets = self._offsets
+        return Task.model_construct(
+            title=self._titles[row],
+            description=self._descriptions[row],
+            assignee=self._assignees[row],
+            due_date=_unpack_time(times[base], offsets[base]),
+            status=_STATUSES[self._statuses[row]],
+            id=task_id,
+            created_at=_unpack_time(times[base + 1], offsets[base + 1]),
+            updated_at=_unpack_time(times[base + 2], offsets[base + 2])
+        )
+    
+    def __getitem__(self, task_id: int) -> Task:
+        """Materialize the task with the given id."""
+        return self._read(task_id, self._rows[task_id])
+    
+    def get(self, task_id: int, default: Optional[Task] = None) -> Optional[Task]:
+        """Materialize the task with the given id, or return default."""
+        row = self._rows.get(task_id)
+        return default if row is None else self._read(task_id, row)
+    
+    def __setitem__(self, task_id: int, task: Task) -> None:
+        """Store a task, reusing its row if the id already exists."""
+        row = self._rows.get(task_id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = len(self._titles)
+                self._titles.append(None)
+                self._descriptions.append(None)
+                self._assignees.append(None)
+                self._statuses.append(0)
+                self._times.extend((0, 0, 0))
+                self._offsets.extend((0, 0, 0))
+            self._rows[task_id] = row
+        self._write(row, task)
+    
+    def __delitem__(self, task_id: int) -> None:
+        """Remove a task and release its strings."""
+        row = self._rows.pop(task_id)
+        self._titles[row] = self._descriptions[row] = self._assignees[row] = None
+        self._free.append(row)
+    
+    def __contains__(self, task_id: object) -> bool:
+        """Check whether a task id is stored."""
+        return task_id in self._rows
+    
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over task ids in insertion order."""
+        return iter(self._rows)
+    
+    def __len__(self) -> int:
+        """Return the number of stored tasks."""
+        return len(self._rows)
+    
+    def values(self) -> List[Task]:
+        """Materialize every task in insertion order."""
+        return [self._read(task_id, row) for task_id, row in self._rows.items()]
+    
+    def copy(self) -> "CompactTaskTable":
+        """Return an independent copy, made by copying the columns rather than building tasks."""
+        table = CompactTaskTable.__new__(CompactTaskTable)
+        table._rows = self._rows.copy()
+        table._free = self._free[:]
+        table._titles = self._titles[:]
+        table._descriptions = self._descriptions[:]
+        table._assignees = self._assignees[:]
+        table._statuses = self._statuses[:]
+        table._times = self._times[:]
+        table._offsets = self._offsets[:]
+        return table
+    
+    def title_of(self, task_id: int) -> str:
+        """Return a task's title without materializing the task."""
+        return self._titles[self._rows[task_id]]
+    
+    def clear(self) -> None:
+        """Remove every task."""
+        self.__init__()
@@ -0,0 +1,126 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+gzip is always available; zstd is offered when the zstandard package is
+installed. Compressed bodies are cached by the ETag of the representation,
+which changes whenever the storage changes what the response contains, so
+repeated fetches of an unchanged list are not compressed again.
+"""
+
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content codings the server can produce, most preferred first
+ENCODINGS: Tuple[str, ...] = ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+# zlib window bits that produce a gzip header and trailer
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the content coding for a response from the Accept-Encoding header.
+    
+    The coding with the highest quality value wins, and ties go to the
+    server's preference. Returns None if the client accepts none of them.
+    """
+    if not accept_encoding:
+        return None
+    qualities: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding] = quality
+    
+    best = None
+    best_quality = 0.0
+    for coding in ENCODINGS:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a whole body with a coding from ENCODINGS."""
+    if encoding == "gzip":
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+        return compressor.compress(data) + compressor.flush()
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    raise ValueError(f"Unsupported content coding: {encoding!r}")
+
+
+def stream_compressor(encoding: str):
+    """Return an object with compress(chunk) and flush() for a streamed body."""
+    if encoding == "gzip":
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    raise ValueError(f"Unsupported content coding: {encoding!r}")
+
+
+class CompressedBodyCache:
+    """
+    LRU cache of compressed bodies, keyed by representation ETag.
+    
+    Bounded by the total size of the compressed bodies rather than their
+    number, since one full listing can be as large as thousands of pages.
+    """
+    
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """Create a cache holding at most max_bytes of compressed data (0 disables it)."""
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, etag: str) -> Optional[bytes]:
+        """Return the compressed body cached for an ETag, or None."""
+        body = self._entries.get(etag)
+        if body is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(etag)
+        self.hits += 1
+        return body
+    
+    def put(self, etag: str, body: bytes) -> None:
+        """Cache a compressed body, evicting the least recently used ones to make room."""
+        if len(body) > self._max_bytes:
+            return
+        previous = self._entries.pop(etag, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[etag] = body
+        self._size += len(body)
+        while self._size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counts, the number of entries and their total size."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._size}
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+        self._size = 0
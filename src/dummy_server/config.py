@@ -3,6 +3,7 @@ Configuration for the dummy server.
 """
 
 import os
+import tempfile
 from typing import Optional
 from pydantic import BaseModel, Field
 
@@ -12,23 +13,83 @@ class ServerConfig(BaseModel):
     host: str = Field(default="127.0.0.1", description="Server host")
     port: int = Field(default=8000, description="Server port", ge=1, le=65535)
     reload: bool = Field(default=True, description="Enable auto-reload in development")
+    workers: int = Field(default=1, description="Number of worker processes", ge=1)
+    max_concurrency: int = Field(default=0, description="Requests handled at once per worker (0 disables admission control)", ge=0)
+    admission_queue_size: int = Field(default=128, description="Requests that may wait for a slot before new ones are rejected", ge=0)
+    admission_queue_timeout_ms: int = Field(default=1000, description="Longest a request waits for a slot before it is rejected", ge=0)
     log_level: str = Field(default="info", description="Log level")
+    environment: str = Field(default="development", description="Deployment environment: development or production")
     title: str = Field(default="Dummy Task Server", description="API title")
     description: str = Field(
         default="A simple FastAPI server for managing tasks with CRUD operations",
         description="API description"
     )
     version: str = Field(default="1.0.0", description="API version")
+    default_page_size: int = Field(default=100, description="Page size used when only a cursor is given", ge=1)
+    max_page_size: int = Field(default=1000, description="Largest page size a client may request", ge=1)
+    max_bulk_size: int = Field(default=10000, description="Largest number of items in one bulk request", ge=1)
+    storage_backend: str = Field(default="memory", description="Storage backend: memory, sqlite or remote")
+    sqlite_path: str = Field(default="tasks.db", description="SQLite database file for the sqlite backend")
+    sqlite_pool_size: int = Field(default=4, description="Number of pooled SQLite connections", ge=1)
+    compact_storage: bool = Field(default=False, description="Store tasks in compact columns in the memory backend")
+    wal_dir: Optional[str] = Field(default=None, description="Directory for the memory backend's write-ahead log and snapshots")
+    wal_fsync_interval_ms: int = Field(default=5, description="Group commit interval for the write-ahead log (0 syncs every write)", ge=0)
+    snapshot_every: int = Field(default=100000, description="Write a snapshot after this many logged mutations", ge=1)
+    storage_socket: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "dummy-task-server.sock"),
+        description="Unix socket of the shared storage server used by the remote backend"
+    )
+    query_cache_size: int = Field(default=256, description="Filtered query results cached by the memory backend (0 disables)", ge=0)
+    response_cache_size: int = Field(default=100000, description="Tasks whose encoded JSON is cached for responses (0 disables)", ge=0)
+    json_encoder: str = Field(default="pydantic", description="Task JSON encoder: pydantic, or orjson if it is installed")
+    compression_enabled: bool = Field(default=True, description="Compress responses with gzip, or zstd if zstandard is installed")
+    compression_min_size: int = Field(default=1024, description="Smallest response body in bytes that is compressed", ge=0)
+    compression_cache_mb: int = Field(default=32, description="Megabytes of compressed response bodies cached (0 disables)", ge=0)
+    coalesce_window_ms: int = Field(default=50, description="How long identical GET /tasks queries share a finished result (0 shares only in-flight ones)", ge=0)
+    change_feed_size: int = Field(default=10000, description="Recent task changes kept for /tasks/changes (0 disables the feed)", ge=0)
+    metrics_enabled: bool = Field(default=True, description="Collect metrics and serve them at /metrics")
+    profiling_enabled: bool = Field(default=False, description="Serve the sampling profiler at /debug/profile")
+    seed_sample_data: bool = Field(default=True, description="Load sample tasks into an empty store on startup (off by default in production)")
+    openapi_cache: Optional[str] = Field(default=None, description="File the generated OpenAPI schema is saved to and loaded from")
 
 
 def get_server_config() -> ServerConfig:
     """Get server configuration from environment variables or defaults."""
+    environment = os.getenv("ENVIRONMENT", "development").lower()
     return ServerConfig(
         host=os.getenv("SERVER_HOST", "127.0.0.1"),
         port=int(os.getenv("SERVER_PORT", "8000")),
         reload=os.getenv("SERVER_RELOAD", "true").lower() == "true",
+        workers=int(os.getenv("SERVER_WORKERS", "1")),
+        max_concurrency=int(os.getenv("MAX_CONCURRENCY", "0")),
+        admission_queue_size=int(os.getenv("ADMISSION_QUEUE_SIZE", "128")),
+        admission_queue_timeout_ms=int(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "1000")),
         log_level=os.getenv("LOG_LEVEL", "info"),
+        environment=environment,
         title=os.getenv("API_TITLE", "Dummy Task Server"),
         description=os.getenv("API_DESCRIPTION", "A simple FastAPI server for managing tasks with CRUD operations"),
-        version=os.getenv("API_VERSION", "1.0.0")
+        version=os.getenv("API_VERSION", "1.0.0"),
+        default_page_size=int(os.getenv("DEFAULT_PAGE_SIZE", "100")),
+        max_page_size=int(os.getenv("MAX_PAGE_SIZE", "1000")),
+        max_bulk_size=int(os.getenv("MAX_BULK_SIZE", "10000")),
+        storage_backend=os.getenv("STORAGE_BACKEND", "memory").lower(),
+        sqlite_path=os.getenv("SQLITE_PATH", "tasks.db"),
+        sqlite_pool_size=int(os.getenv("SQLITE_POOL_SIZE", "4")),
+        compact_storage=os.getenv("COMPACT_STORAGE", "false").lower() == "true",
+        wal_dir=os.getenv("WAL_DIR") or None,
+        wal_fsync_interval_ms=int(os.getenv("WAL_FSYNC_INTERVAL_MS", "5")),
+        snapshot_every=int(os.getenv("SNAPSHOT_EVERY", "100000")),
+        storage_socket=os.getenv("STORAGE_SOCKET", os.path.join(tempfile.gettempdir(), "dummy-task-server.sock")),
+        query_cache_size=int(os.getenv("QUERY_CACHE_SIZE", "256")),
+        response_cache_size=int(os.getenv("RESPONSE_CACHE_SIZE", "100000")),
+        json_encoder=os.getenv("JSON_ENCODER", "pydantic").lower(),
+        compression_enabled=os.getenv("COMPRESSION_ENABLED", "true").lower() == "true",
+        compression_min_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+        compression_cache_mb=int(os.getenv("COMPRESSION_CACHE_MB", "32")),
+        coalesce_window_ms=int(os.getenv("COALESCE_WINDOW_MS", "50")),
+        change_feed_size=int(os.getenv("CHANGE_FEED_SIZE", "10000")),
+        metrics_enabled=os.getenv("METRICS_ENABLED", "true").lower() == "true",
+        profiling_enabled=os.getenv("PROFILING_ENABLED", "false").lower() == "true",
+        seed_sample_data=os.getenv("SEED_SAMPLE_DATA", "false" if environment == "production" else "true").lower() == "true",
+        openapi_cache=os.getenv("OPENAPI_CACHE") or None
     )
@@ -0,0 +1,353 @@
+"""
+Write-ahead log and snapshots for the in-memory task storage.
+"""
+
+import atexit
+import os
+import struct
+import threading
+import zlib
+from typing import BinaryIO, Callable, Iterable, Iterator, List, MutableMapping, Optional, Tuple, TypeVar
+from .models import Task
+from .storage import CHANGE_CLEAR, CHANGE_DELETE, TaskStorage
+
+
+# Record kinds in the log
+OP_PUT = 1
+OP_DELETE = 2
+OP_CLEAR = 3
+
+# Every log record and snapshot entry is framed as payload length + CRC32
+_FRAME = struct.Struct("<II")
+# Log record payloads start with the log sequence number and the record kind
+_RECORD = struct.Struct("<QB")
+_TASK_ID = struct.Struct("<q")
+# Snapshot header: magic, last log sequence number included, next task id, task count
+_SNAPSHOT_HEADER = struct.Struct("<8sQQQ")
+_SNAPSHOT_MAGIC = b"TASKSNP1"
+
+_SEGMENT_PREFIX = "wal-"
+_SEGMENT_SUFFIX = ".log"
+_SNAPSHOT_NAME = "snapshot.bin"
+
+T = TypeVar("T")
+
+
+def _frame(payload: bytes) -> bytes:
+    """Prefix a payload with its length and checksum."""
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _read_frames(stream: BinaryIO) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yield each intact payload in a stream together with the offset after it.
+    
+    Stops at the first truncated or corrupt frame, which is what a crash in
+    the middle of a write leaves behind.
+    """
+    offset = stream.tell()
+    while True:
+        header = stream.read(_FRAME.size)
+        if len(header) < _FRAME.size:
+            return
+        length, checksum = _FRAME.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            return
+        offset += _FRAME.size + length
+        yield payload, offset
+
+
+def _fsync_directory(directory: str) -> None:
+    """Make renames and deletions in a directory durable."""
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_snapshot(directory: str, lsn: int, next_id: int, tasks: Iterable[Task]) -> None:
+    """Atomically replace the snapshot in a directory."""
+    path = os.path.join(directory, _SNAPSHOT_NAME)
+    tmp_path = path + ".tmp"
+    tasks = list(tasks)
+    with open(tmp_path, "wb") as f:
+        f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, lsn, next_id, len(tasks)))
+        for task in tasks:
+            f.write(_frame(task.model_dump_json().encode()))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(directory)
+
+
+def read_snapshot(directory: str) -> Tuple[int, int, List[Task]]:
+    """
+    Load the snapshot in a directory.
+    
+    Returns the last log sequence number it covers, the next task id and
+    the tasks. An empty state is returned when there is no snapshot yet.
+    """
+    path = os.path.join(directory, _SNAPSHOT_NAME)
+    if not os.path.exists(path):
+        return 0, 1, []
+    
+    with open(path, "rb") as f:
+        header = f.read(_SNAPSHOT_HEADER.size)
+        if len(header) < _SNAPSHOT_HEADER.size:
+            raise ValueError(f"Snapshot {path} is truncated")
+        magic, lsn, next_id, count = _SNAPSHOT_HEADER.unpack(header)
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError(f"{path} is not a task snapshot")
+        tasks = [Task.model_validate_json(payload) for payload, _ in _read_frames(f)]
+    if len(tasks) != count:
+        raise ValueError(f"Snapshot {path} is corrupt: expected {count} tasks, found {len(tasks)}")
+    return lsn, next_id, tasks
+
+
+class WriteAheadLog:
+    """
+    Append-only binary log of storage mutations.
+    
+    Appends go to the operating system immediately and are made durable by a
+    background thread that fsyncs once per interval, so every write waiting
+    in that window shares a single fsync (group commit). An interval of zero
+    fsyncs on every append instead. The log is split into segments named
+    after their first sequence number, so segments fully covered by a
+    snapshot can simply be deleted.
+    """
+    
+    def __init__(self, directory: str, fsync_interval: float = 0.005):
+        """Prepare a log in the given directory. Call start() before appending."""
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._fsync_interval = fsync_interval
+        # _lock guards appends; _sync_lock keeps the file open while it is fsynced
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._file: Optional[BinaryIO] = None
+        self._lsn = 0
+        self._synced_lsn = 0
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+    
+    @property
+    def lsn(self) -> int:
+        """Sequence number of the last appended record."""
+        return self._lsn
+    
+    def segments(self) -> List[Tuple[int, str]]:
+        """Return (first sequence number, path) of each segment, oldest first."""
+        found = []
+        for name in os.listdir(self._directory):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+                start = int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+                found.append((start, os.path.join(self._directory, name)))
+        return sorted(found)
+    
+    def replay(self, after_lsn: int) -> Iterator[Tuple[int, int, bytes]]:
+        """
+        Yield (sequence number, kind, body) for every record after after_lsn.
+        
+        A torn record at the end of the newest segment is cut off. A damaged
+        older segment means records are missing, so it raises ValueError.
+        """
+        segments = self.segments()
+        for index, (_, path) in enumerate(segments):
+            with open(path, "rb") as f:
+                good_offset = 0
+                for payload, good_offset in _read_frames(f):
+                    lsn, kind = _RECORD.unpack_from(payload)
+                    if lsn > after_lsn:
+                        yield lsn, kind, payload[_RECORD.size:]
+                size = f.seek(0, os.SEEK_END)
+            if good_offset < size:
+                if index != len(segments) - 1:
+                    raise ValueError(f"Write-ahead log segment {path} is corrupt")
+                with open(path, "r+b") as f:
+                    f.truncate(good_offset)
+    
+    def start(self, last_lsn: int) -> None:
+        """Continue the log after the given sequence number and start group commit."""
+        self._lsn = self._synced_lsn = last_lsn
+        self._open_segment(last_lsn + 1)
+        if self._fsync_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="wal-flusher", daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+    
+    def _open_segment(self, start_lsn: int) -> None:
+        """Start writing to the segment whose first record is start_lsn."""
+        name = f"{_SEGMENT_PREFIX}{start_lsn:020d}{_SEGMENT_SUFFIX}"
+        self._file = open(os.path.join(self._directory, name), "ab")
+        _fsync_directory(self._directory)
+    
+    def append(self, kind: int, body: bytes = b"") -> int:
+        """Append a record and return its sequence number."""
+        with self._lock:
+            self._lsn += 1
+            self._file.write(_frame(_RECORD.pack(self._lsn, kind) + body))
+            self._file.flush()
+            if self._fsync_interval <= 0:
+                os.fsync(self._file.fileno())
+                self._synced_lsn = self._lsn
+            return self._lsn
+    
+    def sync(self) -> None:
+        """Fsync everything appended so far."""
+        with self._sync_lock:
+            with self._lock:
+                if self._file is None or self._synced_lsn == self._lsn:
+                    return
+                lsn = self._lsn
+                fileno = self._file.fileno()
+            # Appends may continue meanwhile; they are covered by the next sync
+            os.fsync(fileno)
+            self._synced_lsn = max(self._synced_lsn, lsn)
+    
+    def _flush_loop(self) -> None:
+        """Group commit: fsync pending appends once per interval."""
+        while not self._stop.wait(self._fsync_interval):
+            self.sync()
+    
+    def rotate(self, capture: Callable[[], T]) -> Tuple[int, T, BinaryIO]:
+        """
+        Start a new segment and capture the storage state at the switch.
+        
+        Returns the last sequence number of the closed segment, the result
+        of capture and the closed segment's file. The caller fsyncs and
+        closes that file with finish_segment(), off the write path. Records
+        appended from now on land in the new segment.
+        """
+        with self._sync_lock, self._lock:
+            self._file.flush()
+            lsn = self._lsn
+            captured = capture()
+            closed = self._file
+            self._open_segment(lsn + 1)
+        return lsn, captured, closed
+    
+    @staticmethod
+    def finish_segment(closed: BinaryIO) -> None:
+        """Make a segment closed by rotate() durable and release it."""
+        os.fsync(closed.fileno())
+        closed.close()
+    
+    def drop_segments(self, up_to_lsn: int) -> None:
+        """Delete segments whose records all have sequence numbers up to up_to_lsn."""
+        segments = self.segments()
+        for (start, path), (next_start, _) in zip(segments, segments[1:]):
+            if next_start - 1 <= up_to_lsn:
+                os.remove(path)
+        _fsync_directory(self._directory)
+    
+    def close(self) -> None:
+        """Stop group commit, fsync pending records and close the log."""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        with self._sync_lock, self._lock:
+            if self._file is None:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._synced_lsn = self._lsn
+            self._file.close()
+            self._file = None
+
+
+class DurableTaskStorage(TaskStorage):
+    """
+    In-memory task storage made durable with a write-ahead log and snapshots.
+    
+    Reads and writes are served from memory as usual. Every mutation is also
+    appended to the log, and after snapshot_every records a background
+    thread writes a compact snapshot and deletes the log segments it covers.
+    On startup the snapshot is loaded and only the log tail is replayed.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        fsync_interval: float = 0.005,
+        snapshot_every: int = 100000,
+        compact: bool = False,
+        query_cache_size: int = 256
+    ):
+        """Recover the storage from the directory and start logging."""
+        super().__init__(compact=compact, query_cache_size=query_cache_size)
+        self._directory = directory
+        self._snapshot_every = snapshot_every
+        self._since_snapshot = 0
+        self._checkpoint_thread: Optional[threading.Thread] = None
+        self._log = WriteAheadLog(directory, fsync_interval)
+        self._log.start(self._recover())
+        self.subscribe(self._log_change)
+    
+    def _recover(self) -> int:
+        """Load the snapshot, replay the log tail and return the last sequence number."""
+        last_lsn, next_id, tasks = read_snapshot(self._directory)
+        for task in tasks:
+            self._put_task(task)
+        self._next_id = max(self._next_id, next_id)
+        
+        for lsn, kind, body in self._log.replay(last_lsn):
+            if kind == OP_PUT:
+                self._put_task(Task.model_validate_json(body))
+            elif kind == OP_DELETE:
+                self._remove_task(_TASK_ID.unpack(body)[0])
+            elif kind == OP_CLEAR:
+                self.clear_all_tasks()
+            last_lsn = lsn
+            self._since_snapshot += 1
+        self._maybe_compact()
+        return last_lsn
+    
+    def _log_change(self, kind: str, task_id: Optional[int], task: Optional[Task]) -> None:
+        """Append a storage mutation to the log."""
+        if kind == CHANGE_DELETE:
+            self._log.append(OP_DELETE, _TASK_ID.pack(task_id))
+        elif kind == CHANGE_CLEAR:
+            self._log.append(OP_CLEAR)
+        else:
+            self._log.append(OP_PUT, task.model_dump_json().encode())
+        
+        self._since_snapshot += 1
+        if self._since_snapshot >= self._snapshot_every:
+            self.snapshot()
+    
+    def snapshot(self, wait: bool = False) -> None:
+        """
+        Write a snapshot in the background unless one is already running.
+        
+        Must be called from the thread that modifies the storage, like the
+        write path that triggers it. The tasks are captured here as a copy
+        of the task container, which costs a pointer copy per task (or a
+        copy of the columns in compact mode). The background thread only
+        reads that copy, so it never sees a task being changed.
+        """
+        if self._checkpoint_thread is None or not self._checkpoint_thread.is_alive():
+            self._since_snapshot = 0
+            lsn, (next_id, tasks), closed = self._log.rotate(lambda: (self._next_id, self._tasks.copy()))
+            self._checkpoint_thread = threading.Thread(
+                target=self._checkpoint, args=(lsn, next_id, tasks, closed), name="wal-snapshot", daemon=True
+            )
+            self._checkpoint_thread.start()
+        if wait:
+            self._checkpoint_thread.join()
+    
+    def _checkpoint(self, lsn: int, next_id: int, tasks: MutableMapping[int, Task], closed: BinaryIO) -> None:
+        """Write a captured state as a snapshot and drop the segments it covers."""
+        self._log.finish_segment(closed)
+        write_snapshot(self._directory, lsn, next_id, tasks.values())
+        self._log.drop_segments(lsn)
+    
+    def close(self) -> None:
+        """Finish a running snapshot and close the log."""
+        if self._checkpoint_thread is not None:
+            self._checkpoint_thread.join()
+        self._log.close()
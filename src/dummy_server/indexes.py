@@ -0,0 +1,421 @@
+"""
+Secondary index structures used by the task storage.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+from itertools import islice
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class IdSet:
+    """
+    Set of task ids stored as a sorted array of 32-bit integers.
+    
+    A set of Python ints costs about 40 bytes per member once its hash
+    table and the int objects are counted; this costs 4. Ids are assigned
+    in increasing order, so most additions append to the array. Additions
+    out of order and removals from the middle of a large set are kept in
+    small pending sets and merged into the array once they grow past an
+    eighth of it, so no single change has to move the whole array.
+    Membership is a binary search. Iteration yields the ids in ascending
+    order.
+    """
+    
+    __slots__ = ("_ids", "_added", "_removed")
+    
+    # Sets up to this size are changed in place
+    _SMALL = 4096
+    
+    def __init__(self, ids: Iterable[int] = ()):
+        """Create a set holding the given ids."""
+        self._ids = array("I", sorted(set(ids)))
+        self._added: Optional[Set[int]] = None
+        self._removed: Optional[Set[int]] = None
+    
+    def add(self, task_id: int) -> None:
+        """Add an id."""
+        ids = self._ids
+        added = self._added
+        if not ids or task_id > ids[-1]:
+            if not added or task_id not in added:
+                ids.append(task_id)
+            return
+        if added and task_id in added:
+            return
+        position = bisect_left(ids, task_id)
+        if position < len(ids) and ids[position] == task_id:
+            if self._removed:
+                self._removed.discard(task_id)
+            return
+        if len(ids) <= self._SMALL:
+            ids.insert(position, task_id)
+            return
+        if added is None:
+            added = self._added = set()
+        added.add(task_id)
+        if (len(added) + len(self._removed or ())) * 8 > len(ids):
+            self._merge()
+    
+    def discard(self, task_id: int) -> None:
+        """Remove an id if present."""
+        added = self._added
+        if added and task_id in added:
+            added.discard(task_id)
+            return
+        removed = self._removed
+        if removed and task_id in removed:
+            return
+        ids = self._ids
+        position = bisect_left(ids, task_id)
+        size = len(ids)
+        if position == size or ids[position] != task_id:
+            return
+        if size <= self._SMALL or position == size - 1:
+            del ids[position]
+            return
+        if removed is None:
+            removed = self._removed = set()
+        removed.add(task_id)
+        if (len(removed) + len(added or ())) * 8 > size:
+            self._merge()
+    
+    def _merge(self) -> None:
+        """Fold the pending changes into the array."""
+        self._ids = array("I", iter(self))
+        self._added = None
+        self._removed = None
+    
+    def __contains__(self, task_id: object) -> bool:
+        """Return whether the id is in the set."""
+        if self._added and task_id in self._added:
+            return True
+        ids = self._ids
+        position = bisect_left(ids, task_id)
+        if position == len(ids) or ids[position] != task_id:
+            return False
+        return not (self._removed and task_id in self._removed)
+    
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the ids in ascending order."""
+        removed = self._removed
+        ids: Iterable[int] = self._ids if not removed else (i for i in self._ids if i not in removed)
+        if self._added:
+            return merge(ids, sorted(self._added))
+        return iter(ids)
+    
+    def __len__(self) -> int:
+        """Return the number of ids."""
+        return len(self._ids) - len(self._removed or ()) + len(self._added or ())
+    
+    def __bool__(self) -> bool:
+        """Return whether the set has any ids."""
+        return bool(self._added) or len(self._ids) > len(self._removed or ())
+
+
+class TrigramIndex:
+    """
+    Inverted index from lowercased character trigrams to keys.
+    
+    Used to narrow case-insensitive substring searches down to a candidate
+    set. Candidates are a superset of the real matches, so callers must still
+    check the exact substring on each of them.
+    
+    posting creates the collection holding the keys of one trigram: set
+    for any hashable keys, or IdSet for task ids, which takes a tenth of
+    the memory.
+    """
+    
+    def __init__(self, posting: Callable[[], Any] = set):
+        """Initialize an empty index."""
+        self._posting = posting
+        self._postings: Dict[str, Any] = {}
+    
+    @staticmethod
+    def trigrams(text: str) -> Set[str]:
+        """Return the set of trigrams of the lowercased text."""
+        text = text.lower()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    def add(self, key: Hashable, text: str) -> None:
+        """Index the text under the given key."""
+        postings = self._postings
+        for gram in self.trigrams(text):
+            keys = postings.get(gram)
+            if keys is None:
+                keys = postings[gram] = self._posting()
+            keys.add(key)
+    
+    def remove(self, key: Hashable, text: str) -> None:
+        """Remove the text previously indexed under the given key."""
+        for gram in self.trigrams(text):
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+    
+    def candidates(self, query: str) -> Optional[Set[Hashable]]:
+        """
+        Return the keys whose text may contain the query.
+        
+        Returns None when the query is shorter than a trigram and the index
+        cannot narrow the search.
+        """
+        grams = self.trigrams(query)
+        if not grams:
+            return None
+        
+        postings: List[Any] = []
+        for gram in grams:
+            keys = self._postings.get(gram)
+            if not keys:
+                return set()
+            postings.append(keys)
+        
+        postings.sort(key=len)
+        result = set(postings[0])
+        for keys in postings[1:]:
+            if isinstance(keys, set):
+                result &= keys
+            elif len(keys) <= 8 * len(result):
+                # Copying a posting into a set runs at C speed, cheaper than probing it per key
+                result &= set(keys)
+            else:
+                result = {key for key in result if key in keys}
+            if not result:
+                break
+        return result
+    
+    def clear(self) -> None:
+        """Remove everything from the index."""
+        self._postings.clear()
+
+
+class SortedKeyIndex:
+    """
+    Sorted collection of distinct keys, such as (due date, id) tuples.
+    
+    Keys are kept in a list of sorted buckets with the largest key of each
+    bucket in a separate list. Adding or removing a key takes a binary
+    search over the buckets and one within a bucket, and only moves the
+    keys of that bucket, so updates stay cheap however large the index
+    grows. Iterating over a range costs O(log n) to find its start plus the
+    number of keys returned.
+    """
+    
+    def __init__(self, bucket_size: int = 512):
+        """Initialize an empty index. Buckets are split once they hold twice bucket_size keys."""
+        self._bucket_size = bucket_size
+        self._buckets: List[List[Any]] = []
+        self._maxes: List[Any] = []
+        self._len = 0
+    
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return self._len
+    
+    def add(self, key: Any) -> None:
+        """Insert a key that is not in the index yet."""
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._len += 1
+            return
+        
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            # Larger than every key, which is also the common case for new tasks
+            position -= 1
+            bucket = self._buckets[position]
+            bucket.append(key)
+            self._maxes[position] = key
+        else:
+            bucket = self._buckets[position]
+            insort(bucket, key)
+        self._len += 1
+        
+        if len(bucket) > 2 * self._bucket_size:
+            upper = bucket[self._bucket_size:]
+            del bucket[self._bucket_size:]
+            self._buckets.insert(position + 1, upper)
+            self._maxes[position] = bucket[-1]
+            self._maxes.insert(position + 1, upper[-1])
+    
+    def remove(self, key: Any) -> bool:
+        """Remove a key, returning whether it was present."""
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            return False
+        bucket = self._buckets[position]
+        index = bisect_left(bucket, key)
+        if index == len(bucket) or bucket[index] != key:
+            return False
+        
+        del bucket[index]
+        self._len -= 1
+        if bucket:
+            self._maxes[position] = bucket[-1]
+        else:
+            del self._buckets[position]
+            del self._maxes[position]
+        return True
+    
+    def rank(self, key: Any) -> int:
+        """
+        Return the number of keys smaller than key.
+        
+        Sums the sizes of the buckets before the key's one, so it costs one
+        step per bucket rather than one per key.
+        """
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            return self._len
+        return sum(map(len, self._buckets[:position])) + bisect_left(self._buckets[position], key)
+    
+    def irange(self, low: Any = None, high: Any = None) -> Iterator[Any]:
+        """Iterate in order over the keys k with low <= k < high; None leaves a side unbounded."""
+        if low is None:
+            position, index = 0, 0
+        else:
+            position = bisect_left(self._maxes, low)
+            if position == len(self._maxes):
+                return
+            index = bisect_left(self._buckets[position], low)
+        
+        while position < len(self._buckets):
+            for key in islice(self._buckets[position], index, None):
+                if high is not None and key >= high:
+                    return
+                yield key
+            position += 1
+            index = 0
+    
+    def clear(self) -> None:
+        """Remove every key."""
+        self._buckets = []
+        self._maxes = []
+        self._len = 0
+
+
+class SortedPairIndex:
+    """
+    SortedKeyIndex for (signed 64-bit, unsigned 32-bit) integer pairs, such as (due key, id).
+    
+    Each bucket keeps the two halves of its keys in a pair of typed arrays,
+    12 bytes per key instead of a tuple and its int objects, about 100.
+    Lookups within a bucket are two binary searches: one over the first
+    halves, then one over the second halves of the keys sharing that first
+    half.
+    """
+    
+    def __init__(self, bucket_size: int = 512):
+        """Initialize an empty index. Buckets are split once they hold twice bucket_size keys."""
+        self._bucket_size = bucket_size
+        self._firsts: List[array] = []
+        self._seconds: List[array] = []
+        self._maxes: List[Tuple[int, int]] = []
+        self._len = 0
+    
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return self._len
+    
+    def _position(self, position: int, key: Tuple[int, int]) -> int:
+        """Return the index of the first key not smaller than key within a bucket."""
+        firsts = self._firsts[position]
+        low = bisect_left(firsts, key[0])
+        high = bisect_right(firsts, key[0], low)
+        return bisect_left(self._seconds[position], key[1], low, high)
+    
+    def add(self, key: Tuple[int, int]) -> None:
+        """Insert a key that is not in the index yet."""
+        if not self._maxes:
+            self._firsts.append(array("q", (key[0],)))
+            self._seconds.append(array("I", (key[1],)))
+            self._maxes.append(key)
+            self._len += 1
+            return
+        
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            # Larger than every key, which is also the common case for new tasks
+            position -= 1
+            self._firsts[position].append(key[0])
+            self._seconds[position].append(key[1])
+            self._maxes[position] = key
+        else:
+            index = self._position(position, key)
+            self._firsts[position].insert(index, key[0])
+            self._seconds[position].insert(index, key[1])
+        self._len += 1
+        
+        firsts = self._firsts[position]
+        if len(firsts) > 2 * self._bucket_size:
+            seconds = self._seconds[position]
+            size = self._bucket_size
+            self._firsts.insert(position + 1, firsts[size:])
+            self._seconds.insert(position + 1, seconds[size:])
+            del firsts[size:]
+            del seconds[size:]
+            self._maxes[position] = self._bucket_max(position)
+            self._maxes.insert(position + 1, self._bucket_max(position + 1))
+    
+    def _bucket_max(self, position: int) -> Tuple[int, int]:
+        """Return the largest key of a bucket."""
+        return (self._firsts[position][-1], self._seconds[position][-1])
+    
+    def remove(self, key: Tuple[int, int]) -> bool:
+        """Remove a key, returning whether it was present."""
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            return False
+        firsts = self._firsts[position]
+        seconds = self._seconds[position]
+        index = self._position(position, key)
+        if index == len(firsts) or firsts[index] != key[0] or seconds[index] != key[1]:
+            return False
+        
+        del firsts[index]
+        del seconds[index]
+        self._len -= 1
+        if firsts:
+            self._maxes[position] = self._bucket_max(position)
+        else:
+            del self._firsts[position]
+            del self._seconds[position]
+            del self._maxes[position]
+        return True
+    
+    def rank(self, key: Tuple[int, int]) -> int:
+        """Return the number of keys smaller than key."""
+        position = bisect_left(self._maxes, key)
+        if position == len(self._maxes):
+            return self._len
+        return sum(map(len, self._firsts[:position])) + self._position(position, key)
+    
+    def irange(self, low: Optional[Tuple[int, int]] = None, high: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[int, int]]:
+        """Iterate in order over the keys k with low <= k < high; None leaves a side unbounded."""
+        if low is None:
+            position, index = 0, 0
+        else:
+            position = bisect_left(self._maxes, low)
+            if position == len(self._maxes):
+                return
+            index = self._position(position, low)
+        
+        while position < len(self._maxes):
+            for key in zip(islice(self._firsts[position], index, None), islice(self._seconds[position], index, None)):
+                if high is not None and key >= high:
+                    return
+                yield key
+            position += 1
+            index = 0
+    
+    def clear(self) -> None:
+        """Remove every key."""
+        self._firsts = []
+        self._seconds = []
+        self._maxes = []
+        self._len = 0
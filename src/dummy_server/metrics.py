@@ -0,0 +1,399 @@
+"""
+Prometheus metrics for the task server.
+
+Metrics are updated from the request path, so recording is kept cheap:
+histogram buckets are preallocated per label set, values are recorded with
+a binary search and plain integer increments, and nothing takes a lock
+(request handling runs on the event loop, and the GIL keeps increments
+from other threads intact). Task counts are only gathered when /metrics is
+scraped.
+"""
+
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from starlette.routing import BaseRoute, Match
+
+
+# Request latency buckets in seconds
+REQUEST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Storage calls are mostly far faster than requests
+STORAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.25, 1.0)
+# Event loop lag buckets in seconds
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# TaskStore methods whose calls are timed; iter_tasks is lazy, so it is not
+STORAGE_METHODS = (
+    "create_task",
+    "create_tasks",
+    "get_task",
+    "get_all_tasks",
+    "update_task",
+    "update_tasks",
+    "delete_task",
+    "delete_tasks",
+    "search_tasks",
+    "get_tasks_page",
+    "get_tasks_page_by_due_date",
+    "get_task_count",
+    "count_by_status",
+    "get_stats",
+    "clear_all_tasks",
+)
+
+# Media type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format a label set, escaping values."""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Histogram:
+    """Observations counted into fixed buckets, plus their sum and count."""
+    
+    __slots__ = ("bounds", "counts", "sum", "count")
+    
+    def __init__(self, bounds: Sequence[float]):
+        """Create a histogram with the given upper bounds and a final +Inf bucket."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """A named metric family with one child per label set."""
+    
+    def __init__(self, name: str, documentation: str, kind: str, label_names: Sequence[str] = ()):
+        """Create a metric family of the given Prometheus type."""
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+    
+    def render(self) -> List[str]:
+        """Return the exposition lines for this family."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+    
+    def _render_child(self, values: Tuple[str, ...], child: Any) -> List[str]:
+        """Return the sample lines of one child."""
+        return [f"{self.name}{_format_labels(self.label_names, values)} {_format_value(child[0])}"]
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+    
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        """Create a counter family."""
+        super().__init__(name, documentation, "counter", label_names)
+    
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Increase the count for a label set."""
+        child = self._children.get(label_values)
+        if child is None:
+            child = self._children.setdefault(label_values, [0])
+        child[0] += amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+    
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        """Create a gauge family."""
+        super().__init__(name, documentation, "gauge", label_names)
+    
+    def _child(self, label_values: Tuple[str, ...]) -> List[float]:
+        """Return the mutable value cell for a label set."""
+        child = self._children.get(label_values)
+        if child is None:
+            child = self._children.setdefault(label_values, [0])
+        return child
+    
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Increase the value for a label set."""
+        self._child(label_values)[0] += amount
+    
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        """Decrease the value for a label set."""
+        self._child(label_values)[0] -= amount
+    
+    def set(self, value: float, *label_values: str) -> None:
+        """Set the value for a label set."""
+        self._child(label_values)[0] = value
+
+
+class HistogramMetric(Metric):
+    """Histogram family; each label set gets its own preallocated buckets."""
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = REQUEST_BUCKETS
+    ):
+        """Create a histogram family with the given bucket upper bounds."""
+        super().__init__(name, documentation, "histogram", label_names)
+        self.buckets = tuple(sorted(buckets))
+    
+    def labels(self, *label_values: str) -> Histogram:
+        """Return the histogram for a label set, creating it on first use."""
+        child = self._children.get(label_values)
+        if child is None:
+            child = self._children.setdefault(label_values, Histogram(self.buckets))
+        return child
+    
+    def _render_child(self, values: Tuple[str, ...], child: Histogram) -> List[str]:
+        """Return the cumulative bucket, sum and count lines of one histogram."""
+        names = self.label_names + ("le",)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+            cumulative += count
+            labels = _format_labels(names, values + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class ServerMetrics:
+    """Every metric the server exports, with the hooks that record them."""
+    
+    def __init__(self, lag_interval: float = 0.5):
+        """Create the metric families. lag_interval is how often event loop lag is sampled."""
+        self.request_duration = HistogramMetric(
+            "http_request_duration_seconds",
+            "Time to handle an HTTP request, by route template.",
+            ("method", "route")
+        )
+        self.requests = Counter(
+            "http_requests_total",
+            "HTTP requests handled, by route template and status code.",
+            ("method", "route", "status")
+        )
+        self.requests_in_flight = Gauge(
+            "http_requests_in_flight",
+            "HTTP requests currently being handled.",
+            ("method",)
+        )
+        self.storage_duration = HistogramMetric(
+            "storage_operation_duration_seconds",
+            "Time spent in task storage calls, by method.",
+            ("operation",),
+            STORAGE_BUCKETS
+        )
+        self.storage_errors = Counter(
+            "storage_operation_errors_total",
+            "Task storage calls that raised, by method.",
+            ("operation",)
+        )
+        self.loop_lag = HistogramMetric(
+            "event_loop_lag_seconds",
+            "Delay of the event loop in running a timer past its deadline.",
+            buckets=LAG_BUCKETS
+        )
+        self.tasks = Gauge("stored_tasks", "Stored tasks, by status.", ("status",))
+        self.admission_in_use = Gauge(
+            "admission_requests_in_progress",
+            "Requests holding one of the admission control slots."
+        )
+        self.admission_queue_depth = Gauge(
+            "admission_queue_depth",
+            "Requests waiting for an admission control slot, by priority.",
+            ("priority",)
+        )
+        self.admission_shed = Counter(
+            "admission_shed_total",
+            "Requests rejected with 503 by admission control, by priority and reason.",
+            ("priority", "reason")
+        )
+        self._metrics: List[Metric] = [
+            self.request_duration,
+            self.requests,
+            self.requests_in_flight,
+            self.storage_duration,
+            self.storage_errors,
+            self.loop_lag,
+            self.tasks,
+            self.admission_in_use,
+            self.admission_queue_depth,
+            self.admission_shed,
+        ]
+        self._collectors: List[Callable[[], None]] = []
+        self._lag_interval = lag_interval
+        self._lag_task: Optional["asyncio.Task[None]"] = None
+    
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Register a callback that refreshes metrics right before each scrape."""
+        self._collectors.append(collector)
+    
+    def collect_task_counts(self, storage: Any) -> None:
+        """Export task counts by status from the storage on every scrape."""
+        def collect():
+            for status, count in storage.count_by_status().items():
+                self.tasks.set(count, status)
+        self.add_collector(collect)
+    
+    def collect_admission(self, controller: Any) -> None:
+        """Export an AdmissionController's slots and queue depths on every scrape, and count its rejections."""
+        def collect():
+            self.admission_in_use.set(controller.in_use)
+            for priority, name in enumerate(("high", "low")):
+                self.admission_queue_depth.set(controller.queue_depth(priority), name)
+        self.add_collector(collect)
+        controller.on_shed = self.admission_shed.inc
+    
+    def instrument_storage(self, storage: Any) -> None:
+        """
+        Time every TaskStore method call on a storage instance.
+        
+        Only the outermost call is recorded. Some methods call others, such
+        as SQLite's create_task calling create_tasks, and counting those
+        again would report two operations for one.
+        """
+        # Whether a timed call is running, per thread since the thread pool calls storage too
+        state = threading.local()
+        for name in STORAGE_METHODS:
+            method = getattr(storage, name, None)
+            if method is not None:
+                setattr(storage, name, self._timed(name, method, state))
+    
+    def _timed(self, name: str, method: Callable[..., Any], state: threading.local) -> Callable[..., Any]:
+        """Wrap a storage method so its duration is recorded, unless another timed call made it."""
+        histogram = self.storage_duration.labels(name)
+        errors = self.storage_errors
+        clock = time.perf_counter
+        
+        @wraps(method)
+        def timed(*args, **kwargs):
+            if getattr(state, "active", False):
+                return method(*args, **kwargs)
+            state.active = True
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                errors.inc(name)
+                raise
+            finally:
+                histogram.observe(clock() - start)
+                state.active = False
+        
+        return timed
+    
+    def start_loop_monitor(self) -> None:
+        """Start sampling event loop lag in the running loop, once."""
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.get_running_loop().create_task(self._monitor_loop())
+    
+    async def _monitor_loop(self) -> None:
+        """Sleep for a fixed interval and record how late each wake-up is."""
+        loop = asyncio.get_running_loop()
+        histogram = self.loop_lag.labels()
+        interval = self._lag_interval
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            histogram.observe(max(0.0, loop.time() - start - interval))
+    
+    def render(self) -> str:
+        """Return every metric in the Prometheus text format."""
+        for collector in self._collectors:
+            collector()
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency, status and in-flight counts.
+    
+    Requests are labelled with their route template (such as
+    /tasks/{task_id}) rather than the raw path, so the number of series stays
+    bounded. Requests answered before routing, such as those shed by
+    admission control, are matched against routes here. Requests that match
+    no route are labelled "unmatched".
+    """
+    
+    def __init__(self, app, metrics: ServerMetrics, routes: Sequence[BaseRoute] = ()):
+        """Wrap an ASGI app whose requests are routed by routes."""
+        self.app = app
+        self.metrics = metrics
+        self.routes = routes
+    
+    def _route(self, scope) -> str:
+        """Return the template of the route a request was or would have been routed to."""
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        # Like the router, fall back to a route matching the path but not the method
+        partial = "unmatched"
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return route.path
+            if match is Match.PARTIAL and partial == "unmatched":
+                partial = route.path
+        return partial
+    
+    async def __call__(self, scope, receive, send):
+        """Handle one ASGI connection, recording HTTP requests."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        metrics = self.metrics
+        metrics.start_loop_monitor()
+        method = scope["method"]
+        status_code = 500
+        
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        metrics.requests_in_flight.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.requests_in_flight.dec(method)
+            route = self._route(scope)
+            metrics.request_duration.labels(method, route).observe(elapsed)
+            metrics.requests.inc(method, route, str(status_code))
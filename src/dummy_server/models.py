@@ -4,8 +4,8 @@ Data models for the dummy server using Pydantic.
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
 
 
 class TaskStatus(str, Enum):
@@ -37,6 +37,14 @@ class TaskUpdate(BaseModel):
     assignee: Optional[str] = Field(None, description="Person assigned to the task", max_length=100)
     due_date: Optional[datetime] = Field(None, description="Due date for the task")
     status: Optional[TaskStatus] = Field(None, description="Current status of the task")
+    
+    @field_validator("title", "status")
+    @classmethod
+    def _not_null(cls, value):
+        """Reject an explicit null for fields every task must have; leave them out instead."""
+        if value is None:
+            raise ValueError("may be omitted but not null")
+        return value
 
 
 class Task(TaskBase):
@@ -44,7 +52,7 @@ class Task(TaskBase):
     id: int = Field(..., description="Unique task identifier")
     created_at: datetime = Field(..., description="Task creation timestamp")
     updated_at: datetime = Field(..., description="Task last update timestamp")
-
+    
     class Config:
         """Pydantic configuration."""
         from_attributes = True
@@ -60,3 +68,38 @@ class Task(TaskBase):
                 "updated_at": "2025-01-21T15:30:00"
             }
         }
+
+
+class TaskBulkUpdate(TaskUpdate):
+    """Model for one item of a bulk update: the task ID plus the fields to change."""
+    id: int = Field(..., description="ID of the task to update")
+
+
+class TaskBulkDelete(BaseModel):
+    """Model for a bulk delete request."""
+    ids: List[int] = Field(..., description="IDs of the tasks to delete")
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of a single item in a bulk operation."""
+    index: int = Field(..., description="Position of the item in the request")
+    id: Optional[int] = Field(None, description="ID of the affected task")
+    success: bool = Field(..., description="Whether the item was applied")
+    error: Optional[str] = Field(None, description="Reason the item was not applied")
+
+
+class BulkOperationResult(BaseModel):
+    """Summary and per-item results of a bulk operation."""
+    succeeded: int = Field(..., description="Number of items applied")
+    failed: int = Field(..., description="Number of items not applied")
+    results: List[BulkItemResult] = Field(..., description="Per-item results in request order")
+
+
+class TaskStats(BaseModel):
+    """Aggregate task counts."""
+    total: int = Field(..., description="Number of tasks")
+    by_status: Dict[str, int] = Field(..., description="Number of tasks with each status")
+    by_assignee: Dict[str, int] = Field(..., description="Number of tasks per assignee, lowercased")
+    unassigned: int = Field(..., description="Number of tasks without an assignee")
+    overdue: int = Field(..., description="Todo and in-progress tasks past their due date")
+    overdue_by_status: Dict[str, int] = Field(..., description="Overdue tasks per open status")
@@ -0,0 +1,126 @@
+"""
+OpenAPI schema generated once and optionally kept on disk.
+
+FastAPI builds the schema on the first request to /docs or /openapi.json
+by walking every route and model, which takes tens of milliseconds during
+which the event loop serves nothing else. The server instead builds it in
+a worker thread right after startup, or loads a file written ahead of
+time:
+
+    python -m src.dummy_server.openapi_cache openapi.json
+
+A saved schema is only used while its fingerprint matches: a hash of the
+package sources, the FastAPI and pydantic versions and the server
+settings. Otherwise it is generated again and the file is rewritten.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Any, Dict, Optional
+from fastapi import FastAPI
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def schema_fingerprint(key: str = "") -> str:
+    """Hash everything the generated schema depends on, with key for the settings."""
+    import fastapi
+    import pydantic
+    
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(PACKAGE_DIR.glob("*.py")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    digest.update(f"{fastapi.__version__}\n{pydantic.VERSION}\n{key}".encode())
+    return digest.hexdigest()
+
+
+class OpenAPICache:
+    """
+    Replacement for app.openapi that generates the schema at most once.
+    
+    With a path, the schema is loaded from that file when its fingerprint
+    matches and saved there after generating it.
+    """
+    
+    def __init__(self, app: FastAPI, path: Optional[str] = None, key: str = ""):
+        """Install the cache as app.openapi. key identifies settings that shape the schema."""
+        self.app = app
+        self.path = path
+        self.key = key
+        self._generate = app.openapi
+        self._lock = threading.Lock()
+        app.openapi = self.schema
+    
+    def schema(self) -> Dict[str, Any]:
+        """Return the schema, loading or generating it on first use."""
+        if self.app.openapi_schema is None:
+            # Warming runs in a worker thread, so a request may arrive meanwhile
+            with self._lock:
+                if self.app.openapi_schema is None:
+                    self.app.openapi_schema = self._load() or self._build()
+        return self.app.openapi_schema
+    
+    def warm(self) -> None:
+        """
+        Load or generate the schema ahead of the first request for it.
+        
+        Meant for a background thread, where nobody would see an exception,
+        so a failure is printed to stderr instead. The schema is then
+        generated again on the first request, which reports the error too.
+        """
+        try:
+            self.schema()
+        except Exception:
+            print("Building the OpenAPI schema failed:", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+    
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Read the saved schema, or return None if it is missing or out of date."""
+        if self.path is None:
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(saved, dict) or saved.get("fingerprint") != schema_fingerprint(self.key):
+            return None
+        return saved.get("schema")
+    
+    def _build(self) -> Dict[str, Any]:
+        """Generate the schema and save it if a path is set."""
+        schema = self._generate()
+        if self.path is not None:
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, "w") as f:
+                    json.dump({"fingerprint": schema_fingerprint(self.key), "schema": schema}, f)
+                os.replace(temp_path, self.path)
+            except OSError:
+                # An unwritable location only costs generating the schema again next time
+                pass
+        return schema
+
+
+def main():
+    """Write the server's OpenAPI schema to a file for OPENAPI_CACHE."""
+    parser = argparse.ArgumentParser(description="Generate the OpenAPI schema ahead of time")
+    parser.add_argument("path", help="File to write; point OPENAPI_CACHE at it")
+    args = parser.parse_args()
+    
+    os.environ["OPENAPI_CACHE"] = args.path
+    from .server import app
+    
+    app.openapi()
+    print(f"OpenAPI schema written to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
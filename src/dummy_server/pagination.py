@@ -0,0 +1,59 @@
+"""
+Opaque cursors for keyset pagination.
+"""
+
+import base64
+import json
+from typing import Any, Dict, Optional, Tuple
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    """Encode a cursor payload as URL-safe base64 without padding."""
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor payload. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return data
+
+
+def _is_int(value: Any) -> bool:
+    """Whether a decoded JSON value is an integer."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def encode_cursor(after_id: int) -> str:
+    """Encode the id to resume after as an opaque cursor string."""
+    return _encode({"id": after_id})
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if it is malformed."""
+    data = _decode(cursor)
+    after_id = data.get("id")
+    if not _is_int(after_id) or "due" in data:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return after_id
+
+
+def encode_due_cursor(after: Tuple[Optional[int], int]) -> str:
+    """Encode a position in due date order, (due epoch microseconds or None, id), as a cursor."""
+    return _encode({"due": after[0], "id": after[1]})
+
+
+def decode_due_cursor(cursor: str) -> Tuple[Optional[int], int]:
+    """Decode a cursor produced by encode_due_cursor. Raises ValueError if it is malformed."""
+    data = _decode(cursor)
+    due = data.get("due")
+    after_id = data.get("id")
+    if "due" not in data or not (due is None or _is_int(due)) or not _is_int(after_id):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return due, after_id
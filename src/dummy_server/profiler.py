@@ -0,0 +1,192 @@
+"""
+On-demand sampling profiler for the live server.
+
+A background thread snapshots the Python stack of every thread at a fixed
+interval with sys._current_frames() and counts identical stacks. Nothing
+is traced between samples, so the overhead on request handling is limited
+to the sampler's own short bursts of work. Results are returned as
+collapsed stacks ("root;caller;callee count" per line), which flamegraph.pl,
+speedscope and similar tools read directly.
+
+In slow-request mode, ProfilerMiddleware numbers each request, and samples
+taken while a request's coroutine is running are attributed to it by
+finding the middleware's frame in the sampled stack. Only samples of
+requests that took longer than the threshold are kept. Requests still
+running when sampling stops are judged by how long they have run so far,
+so a request that hangs for the whole window is reported too.
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Leaf frames in these modules mean the thread is waiting, not working
+_IDLE_MODULES = frozenset({"selectors", "threading", "queue", "concurrent.futures.thread"})
+
+
+class RequestTracker:
+    """Durations of the requests seen while a slow-request profile runs."""
+    
+    def __init__(self):
+        """Create an empty tracker."""
+        self._next_id = 0
+        self._started: Dict[int, Tuple[str, float]] = {}
+        self.requests: Dict[int, Tuple[str, float]] = {}
+    
+    def begin(self, label: str) -> int:
+        """Register a new request and return its id."""
+        self._next_id += 1
+        self._started[self._next_id] = (label, time.perf_counter())
+        return self._next_id
+    
+    def end(self, request_id: int) -> None:
+        """Record the duration of a finished request."""
+        started = self._started.pop(request_id, None)
+        if started is not None:
+            label, start = started
+            self.requests[request_id] = (label, time.perf_counter() - start)
+    
+    def close(self) -> None:
+        """Record requests that are still running with their time so far, marking them as in flight."""
+        # Swap the dict first, so requests ending from now on are ignored
+        in_flight, self._started = self._started, {}
+        now = time.perf_counter()
+        for request_id, (label, start) in list(in_flight.items()):
+            self.requests[request_id] = (f"{label} (in flight)", now - start)
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware that lets the profiler attribute samples to requests.
+    
+    It does nothing unless a slow-request profile is running.
+    """
+    
+    def __init__(self, app, profiler: "SamplingProfiler"):
+        """Wrap an ASGI app."""
+        self.app = app
+        self.profiler = profiler
+    
+    async def __call__(self, scope, receive, send):
+        """Handle one ASGI connection, numbering HTTP requests while tracking."""
+        tracker = self.profiler.tracker
+        if tracker is None or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # The sampler reads this local from the frame of this coroutine
+        request_id = tracker.begin(f"{scope['method']} {scope['path']}")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            tracker.end(request_id)
+
+
+_MIDDLEWARE_CODE = ProfilerMiddleware.__call__.__code__
+
+
+class SamplingProfiler:
+    """Samples the stacks of every thread in the process."""
+    
+    def __init__(self):
+        """Create an idle profiler."""
+        self._lock = threading.Lock()
+        self._labels: Dict[CodeType, str] = {}
+        self.tracker: Optional[RequestTracker] = None
+    
+    @property
+    def busy(self) -> bool:
+        """Whether a profile is currently running."""
+        return self._lock.locked()
+    
+    def _label(self, frame: FrameType) -> str:
+        """Return the flame graph label of a frame's function, such as module:Class.method."""
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            module = frame.f_globals.get("__name__", "?")
+            label = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+            self._labels[code] = label
+        return label
+    
+    def _walk(self, frame: Optional[FrameType]) -> Tuple[Tuple[str, ...], Optional[int], bool]:
+        """Return a stack's labels from the root, the request id it runs for, and whether it is idle."""
+        idle = frame is not None and frame.f_globals.get("__name__") in _IDLE_MODULES
+        labels: List[str] = []
+        request_id = None
+        while frame is not None:
+            if frame.f_code is _MIDDLEWARE_CODE and request_id is None:
+                request_id = frame.f_locals.get("request_id")
+            labels.append(self._label(frame))
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels), request_id, idle
+    
+    def _sample(self, seconds: float, interval: float) -> Iterator[Tuple[str, Tuple[str, ...], Optional[int], bool]]:
+        """Yield (thread name, stack, request id, idle) for every thread at each tick."""
+        own_id = threading.get_ident()
+        names: Dict[int, str] = {}
+        deadline = time.perf_counter() + seconds
+        next_tick = time.perf_counter()
+        while next_tick < deadline:
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                name = names.get(thread_id)
+                if name is None:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                    name = names.get(thread_id, f"thread-{thread_id}")
+                stack, request_id, idle = self._walk(frame)
+                yield name, stack, request_id, idle
+            del frames
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.perf_counter()))
+    
+    def profile(self, seconds: float, interval: float = 0.005, include_idle: bool = False) -> Tuple[str, int]:
+        """
+        Sample every thread for the given time, blocking the calling thread.
+        
+        Returns the collapsed stacks, rooted at the thread name, and the
+        number of samples they contain. Waiting threads are left out unless
+        include_idle is set.
+        """
+        with self._lock:
+            counts: Counter = Counter()
+            for name, stack, _, idle in self._sample(seconds, interval):
+                if include_idle or not idle:
+                    counts[(name,) + stack] += 1
+        return _collapse(counts), sum(counts.values())
+    
+    def profile_slow_requests(self, seconds: float, threshold: float, interval: float = 0.005) -> Tuple[str, int]:
+        """
+        Sample requests for the given time, keeping only those slower than threshold seconds.
+        
+        Returns the collapsed stacks, rooted at the request method and path,
+        and the number of samples they contain. Requests still running at
+        the end count with their time so far and have " (in flight)"
+        appended to their root.
+        """
+        with self._lock:
+            tracker = self.tracker = RequestTracker()
+            by_request: Dict[int, Counter] = {}
+            try:
+                for _, stack, request_id, _ in self._sample(seconds, interval):
+                    if request_id is not None:
+                        by_request.setdefault(request_id, Counter())[stack] += 1
+            finally:
+                self.tracker = None
+                tracker.close()
+            counts: Counter = Counter()
+            for request_id, (label, duration) in tracker.requests.items():
+                if duration >= threshold and request_id in by_request:
+                    for stack, count in by_request[request_id].items():
+                        counts[(label,) + stack] += count
+        return _collapse(counts), sum(counts.values())
+
+
+def _collapse(counts: Counter) -> str:
+    """Format stack counts as collapsed stack lines, most frequent first."""
+    return "".join(f"{';'.join(stack)} {count}\n" for stack, count in counts.most_common())
@@ -0,0 +1,58 @@
+"""
+Versioned LRU cache of query results for the in-memory task storage.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of matching id lists, keyed by normalized filters.
+    
+    Every entry is tagged with the storage version it was computed at, and
+    is only returned while the storage is still at that version. The storage
+    bumps its version on every write that can change a query result, so a
+    cached result is always identical to a fresh one. Reads run side by
+    side in the shared storage server, so every call takes the cache's lock.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        """Create a cache holding at most max_entries results (0 disables it)."""
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[int, List[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable, version: int) -> Optional[List[int]]:
+        """Return the ids cached for key at this version, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key: Hashable, version: int, ids: List[int]) -> None:
+        """Store the ids matching key at this version. Callers must not modify them afterwards."""
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, ids)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counts and the current number of entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
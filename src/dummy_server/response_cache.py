@@ -0,0 +1,195 @@
+"""
+Cache of serialized task JSON with version-based ETags.
+"""
+
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+from .models import Task
+from .storage import CHANGE_CLEAR, CHANGE_CREATE
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+TaskEncoder = Callable[[Task], bytes]
+
+# Task fields that responses can be narrowed to, in the order they are encoded
+TASK_FIELDS = tuple(Task.model_fields)
+
+
+def _pydantic_encode(task: Task) -> bytes:
+    """Encode a task with its pydantic serializer, as model_dump_json does but straight to bytes."""
+    return task.__pydantic_serializer__.to_json(task)
+
+
+def parse_fields(value: str) -> Tuple[str, ...]:
+    """
+    Parse a comma-separated list of task fields.
+    
+    Returns the fields in declaration order. Raises ValueError if the list
+    is empty or names a field tasks do not have.
+    """
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    if not requested:
+        raise ValueError("fields must name at least one task field")
+    unknown = requested.difference(TASK_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown task fields: {', '.join(sorted(unknown))}. Valid fields: {', '.join(TASK_FIELDS)}")
+    return tuple(name for name in TASK_FIELDS if name in requested)
+
+
+def get_task_encoder(name: str, fields: Optional[Sequence[str]] = None) -> TaskEncoder:
+    """
+    Return the task encoder selected by name.
+    
+    "pydantic" uses the model's own serializer. "orjson" encodes the task's
+    field values directly with orjson, which is several times faster and
+    produces the same bytes: fields are stored in declaration order, and
+    orjson writes datetimes, enums and strings the way pydantic does.
+    
+    With fields, only those fields are encoded, read straight from the
+    stored task without building or validating another model.
+    """
+    if name == "pydantic":
+        if fields is None:
+            return _pydantic_encode
+        include = set(fields)
+        
+        def _pydantic_encode_fields(task: Task) -> bytes:
+            """Encode the selected fields of a task with its pydantic serializer."""
+            return task.__pydantic_serializer__.to_json(task, include=include)
+        
+        return _pydantic_encode_fields
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError as e:
+            raise ValueError("The orjson JSON encoder requires the orjson package") from e
+        dumps = orjson.dumps
+        option = orjson.OPT_UTC_Z
+        
+        def _orjson_encode(task: Task) -> bytes:
+            """Encode a task's field values with orjson."""
+            return dumps(task.__dict__, option=option)
+        
+        if fields is None:
+            return _orjson_encode
+        selected = tuple(fields)
+        
+        def _orjson_encode_fields(task: Task) -> bytes:
+            """Encode the selected field values of a task with orjson."""
+            values = task.__dict__
+            return dumps({name: values[name] for name in selected}, option=option)
+        
+        return _orjson_encode_fields
+    raise ValueError(f"Unknown JSON encoder: {name!r}")
+
+
+def task_etag(task: Task) -> str:
+    """Return the ETag of a task version, built from its id and last update time."""
+    updated_at = task.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    delta = updated_at - _EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return f'"{task.id}-{micros:x}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag, using weak comparison."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.replace("W/", "", 1) == etag:
+            return True
+    return False
+
+
+class TaskJSONCache:
+    """
+    Encoded JSON bytes of each task, keyed by task id.
+    
+    An entry is only used while the task's updated_at still matches the
+    version it was encoded from, so a stale entry is never served even by
+    backends that cannot report changes. Backends that support subscribe()
+    also drop entries as soon as a task is updated or deleted. Once full,
+    the oldest entry is evicted for each new one.
+    
+    With backends that block on I/O, requests encode tasks in the thread
+    pool. Lookups are single dict reads, so only storing an entry, which
+    may evict another, takes the lock.
+    """
+    
+    def __init__(self, max_entries: int = 100000, encoder: TaskEncoder = _pydantic_encode):
+        """Create a cache holding at most max_entries tasks (0 disables it)."""
+        self._max_entries = max_entries
+        self._encoder = encoder
+        self._entries: Dict[int, Tuple[datetime, bytes]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def attach(self, storage: object) -> None:
+        """Invalidate entries on the storage's change notifications, if it has them."""
+        subscribe = getattr(storage, "subscribe", None)
+        if subscribe is not None:
+            subscribe(self._on_change)
+    
+    def _on_change(self, kind: str, task_id: Optional[int], task: Optional[Task]) -> None:
+        """Drop entries made stale by a storage mutation."""
+        with self._lock:
+            if kind == CHANGE_CLEAR:
+                self._entries.clear()
+            elif kind != CHANGE_CREATE:
+                self._entries.pop(task_id, None)
+    
+    def encode(self, task: Task) -> bytes:
+        """Return the JSON bytes of a task, encoding it on a miss."""
+        entry = self._entries.get(task.id)
+        if entry is not None and entry[0] == task.updated_at:
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        body = self._encoder(task)
+        if self._max_entries > 0:
+            with self._lock:
+                if task.id not in self._entries and len(self._entries) >= self._max_entries:
+                    del self._entries[next(iter(self._entries))]
+                self._entries[task.id] = (task.updated_at, body)
+        return body
+    
+    def get(self, task: Task) -> Tuple[str, bytes]:
+        """Return the ETag and JSON bytes of a task."""
+        return task_etag(task), self.encode(task)
+    
+    def encode_list(
+        self,
+        tasks: Iterable[Task],
+        salt: str = "",
+        encoder: Optional[TaskEncoder] = None
+    ) -> Tuple[str, bytes]:
+        """
+        Return an ETag and the JSON array of several tasks.
+        
+        The ETag is a hash of the body together with salt for anything else
+        that shapes the response, so it changes whenever a task is added,
+        removed, reordered or updated. A custom encoder, such as one for
+        selected fields, bypasses the cache.
+        """
+        encode = encoder or self.encode
+        body = b"[" + b",".join([encode(task) for task in tasks]) + b"]"
+        digest = hashlib.blake2b(body, digest_size=16)
+        digest.update(salt.encode())
+        return f'"{digest.hexdigest()}"', body
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counts and the current number of entries."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
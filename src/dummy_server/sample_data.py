@@ -0,0 +1,39 @@
+"""
+Sample tasks loaded into an empty server for demonstration.
+"""
+
+from datetime import datetime
+from .models import TaskCreate, TaskStatus
+from .storage import TaskStore
+
+
+sample_tasks = [
+    TaskCreate(
+        title="Setup development environment",
+        description="Install Python, Poetry, and VS Code extensions",
+        assignee="developer@example.com",
+        due_date=datetime(2025, 1, 25, 17, 0, 0),
+        status=TaskStatus.DONE
+    ),
+    TaskCreate(
+        title="Implement FastAPI server",
+        description="Create a REST API with CRUD operations for tasks",
+        assignee="developer@example.com",
+        due_date=datetime(2025, 1, 22, 12, 0, 0),
+        status=TaskStatus.IN_PROGRESS
+    ),
+    TaskCreate(
+        title="Write documentation",
+        description="Document the API endpoints and usage examples",
+        assignee="tech-writer@example.com",
+        due_date=datetime(2025, 1, 30, 23, 59, 59),
+        status=TaskStatus.TODO
+    )
+]
+
+
+def seed_sample_tasks(storage: TaskStore) -> None:
+    """Add the sample tasks, unless the storage already has data."""
+    if storage.get_task_count() == 0:
+        for sample_task in sample_tasks:
+            storage.create_task(sample_task)
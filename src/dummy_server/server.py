@@ -2,58 +2,262 @@
 FastAPI server implementation with CRUD operations for tasks.
 """
 
-from datetime import datetime
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, TypeVar
+from fastapi import Body, FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
+from .admission import PRIORITY_HIGH, PRIORITY_LOW, AdmissionController, AdmissionMiddleware
+from .change_feed import ChangeFeed
+from .coalescing import SingleFlight
+from .compression import CompressedBodyCache, choose_encoding, compress, stream_compressor
 from .config import get_server_config
-from .models import Task, TaskCreate, TaskUpdate, TaskStatus
-from .storage import TaskStorage
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsMiddleware, ServerMetrics
+from .models import (
+    BulkItemResult,
+    BulkOperationResult,
+    Task,
+    TaskBulkUpdate,
+    TaskCreate,
+    TaskStats,
+    TaskStatus,
+    TaskUpdate,
+)
+from .openapi_cache import OpenAPICache
+from .pagination import decode_cursor, decode_due_cursor, encode_cursor, encode_due_cursor
+from .response_cache import TaskEncoder, TaskJSONCache, etag_matches, get_task_encoder, parse_fields
+from .storage import TaskStore, create_storage
+
+T = TypeVar("T")
 
 # Get configuration
 config = get_server_config()
 
+# Set up by startup() when the server starts, not on import
+task_storage: TaskStore
+task_json_cache: TaskJSONCache
+change_feed: Optional[ChangeFeed] = None
+_started = False
+# Whether storage calls block on disk or socket I/O and so run in the thread pool
+_blocking_storage = False
+
+
+def startup() -> None:
+    """
+    Create the storage and everything built on it. Calling it again does nothing.
+    
+    The lifespan handler runs this when the server starts, so importing the
+    app stays cheap. Code that drives the app without a lifespan, such as
+    the benchmarks, calls it directly.
+    """
+    global task_storage, task_json_cache, change_feed, _started, _blocking_storage
+    if _started:
+        return
+    task_storage = create_storage(config)
+    # The memory backend is only ever used from the event loop thread
+    _blocking_storage = config.storage_backend != "memory"
+    
+    if metrics is not None:
+        metrics.instrument_storage(task_storage)
+        metrics.collect_task_counts(task_storage)
+    
+    # Add sample tasks, unless a persistent backend already has data
+    if config.seed_sample_data:
+        from .sample_data import seed_sample_tasks
+        seed_sample_tasks(task_storage)
+    
+    # Encoded task JSON, reused by every endpoint that returns tasks
+    task_json_cache = TaskJSONCache(config.response_cache_size, get_task_encoder(config.json_encoder))
+    task_json_cache.attach(task_storage)
+    
+    # Ring buffer of task changes for /tasks/changes; needs a backend that reports changes
+    change_feed = ChangeFeed(config.change_feed_size, task_json_cache.encode) if config.change_feed_size > 0 else None
+    if change_feed is not None and not change_feed.attach(task_storage):
+        change_feed = None
+    
+    # Finished GET /tasks results are only kept while the storage reports the changes that make them stale
+    if not query_flights.attach(task_storage):
+        query_flights.window = 0.0
+    _started = True
+
+
+def shutdown() -> None:
+    """Close the storage created by startup()."""
+    global _started
+    if not _started:
+        return
+    close = getattr(task_storage, "close", None)
+    if close is not None:
+        close()
+    _started = False
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start the server's storage, and close it when the server stops."""
+    startup()
+    # Build the OpenAPI schema in the background so the first /docs request does not wait for it
+    asyncio.get_running_loop().run_in_executor(None, openapi_cache.warm)
+    try:
+        yield
+    finally:
+        shutdown()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=config.title,
     description=config.description,
     version=config.version,
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
-# Create storage instance
-task_storage = TaskStorage()
-
-# Add some sample data for demonstration
-sample_tasks = [
-    TaskCreate(
-        title="Setup development environment",
-        description="Install Python, Poetry, and VS Code extensions",
-        assignee="developer@example.com",
-        due_date=datetime(2025, 1, 25, 17, 0, 0),
-        status=TaskStatus.DONE
-    ),
-    TaskCreate(
-        title="Implement FastAPI server",
-        description="Create a REST API with CRUD operations for tasks",
-        assignee="developer@example.com",
-        due_date=datetime(2025, 1, 22, 12, 0, 0),
-        status=TaskStatus.IN_PROGRESS
-    ),
-    TaskCreate(
-        title="Write documentation",
-        description="Document the API endpoints and usage examples",
-        assignee="tech-writer@example.com",
-        due_date=datetime(2025, 1, 30, 23, 59, 59),
-        status=TaskStatus.TODO
+# Generated once, or loaded from the file written by python -m src.dummy_server.openapi_cache;
+# the key holds the settings that appear in the schema
+openapi_cache = OpenAPICache(
+    app,
+    config.openapi_cache,
+    key=config.model_dump_json(include={"title", "description", "version", "max_page_size", "max_bulk_size"})
+)
+
+# Requests answered ahead of list scans and bulk writes when the server is busy
+_CHEAP_PATHS = frozenset({"/", "/health", "/metrics", "/cache/stats", "/tasks/stats", "/openapi.json"})
+# Long-lived requests that would hold a slot for their whole duration
+_UNLIMITED_PATHS = frozenset({"/tasks/changes", "/debug/profile"})
+
+
+def _admission_priority(scope: Dict[str, Any]) -> Optional[int]:
+    """Admission priority of a request, or None if it is not limited."""
+    path = scope["path"]
+    if path in _UNLIMITED_PATHS:
+        return None
+    if scope["method"] == "GET" and (path in _CHEAP_PATHS or (path.startswith("/tasks/") and path[7:].isdigit())):
+        return PRIORITY_HIGH
+    return PRIORITY_LOW
+
+
+# Bound the requests handled at once; added before the metrics middleware so
+# queueing time and rejections show up in the request metrics
+admission = None
+if config.max_concurrency > 0:
+    admission = AdmissionController(
+        config.max_concurrency,
+        config.admission_queue_size,
+        config.admission_queue_timeout_ms / 1000
     )
-]
+    app.add_middleware(AdmissionMiddleware, controller=admission, priority=_admission_priority)
+
+# Record request, storage and event loop metrics for /metrics
+metrics = ServerMetrics() if config.metrics_enabled else None
+if metrics is not None:
+    if admission is not None:
+        metrics.collect_admission(admission)
+    app.add_middleware(MetricsMiddleware, metrics=metrics, routes=app.routes)
+
+# Sampling profiler for /debug/profile; the middleware lets it single out slow requests
+profiler = None
+if config.profiling_enabled:
+    from .profiler import ProfilerMiddleware, SamplingProfiler
+    profiler = SamplingProfiler()
+    app.add_middleware(ProfilerMiddleware, profiler=profiler)
+
+# Compressed response bodies, reused while the response's ETag is unchanged
+compression_cache = CompressedBodyCache(config.compression_cache_mb * 1024 * 1024)
+# Bodies at least this large are compressed in a worker thread instead of on the event loop
+COMPRESS_OFFLOAD_SIZE = 64 * 1024
+# Requests for a representation that is being compressed wait for that result
+compress_flights = SingleFlight()
+
+# Identical GET /tasks queries share one result, kept for a short window
+query_flights = SingleFlight(config.coalesce_window_ms / 1000)
+
+# Comment sent on idle change streams so proxies keep the connection open
+CHANGE_STREAM_KEEPALIVE = 15.0
+# Change streams end after this long so dropped clients are released and
+# shutdown is not held up; clients reconnect and resume with Last-Event-ID
+CHANGE_STREAM_LIFETIME = 60.0
+
+
+async def _off_loop(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Call func, which uses the storage, without blocking the event loop on storage I/O.
+    
+    With the sqlite and remote backends func runs in the thread pool, so a
+    call waiting on a lock, the disk or the storage server leaves the
+    event loop free, and concurrent requests use the connection pool. With
+    the memory backend it runs right here: its calls never wait, and the
+    event loop thread is the only one that touches it.
+    """
+    if _blocking_storage:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+async def _write(func: Callable[..., T], *args: Any) -> T:
+    """Make a storage write with _off_loop, then stop sharing query results that may predate it."""
+    result = await _off_loop(func, *args)
+    # Backends without change notifications do not tell query_flights themselves
+    query_flights.invalidate()
+    return result
 
-# Add sample tasks on startup
-for sample_task in sample_tasks:
-    task_storage.create_task(sample_task)
+
+def _fields_encoder(fields: Optional[str]) -> Optional[TaskEncoder]:
+    """Return the encoder for a fields= parameter, or None when whole tasks are wanted."""
+    if fields is None:
+        return None
+    try:
+        return get_task_encoder(config.json_encoder, parse_fields(fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _compressed(etag: str, body: bytes, encoding: str) -> bytes:
+    """Return a body compressed with encoding, from the cache if this representation was compressed before."""
+    compressed = compression_cache.get(etag)
+    if compressed is not None:
+        return compressed
+    if len(body) < COMPRESS_OFFLOAD_SIZE:
+        compressed = compress(body, encoding)
+        compression_cache.put(etag, compressed)
+        return compressed
+    
+    async def compress_in_thread() -> bytes:
+        result = await asyncio.get_running_loop().run_in_executor(None, compress, body, encoding)
+        compression_cache.put(etag, result)
+        return result
+    
+    return await compress_flights.run(etag, compress_in_thread)
+
+
+async def _json_response(request: Request, etag: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Return encoded JSON with its ETag, or 304 if the client already has this version.
+    
+    Bodies of at least COMPRESSION_MIN_SIZE bytes are compressed when the
+    client accepts it. Each content coding is a separate representation
+    with its own ETag.
+    """
+    headers = dict(headers or {})
+    encoding = None
+    if config.compression_enabled and len(body) >= config.compression_min_size:
+        headers["Vary"] = "Accept-Encoding"
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if encoding is not None:
+            etag = f'{etag[:-1]}-{encoding}"'
+    headers["ETag"] = etag
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding is not None:
+        body = await _compressed(etag, body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @app.get("/", summary="Root endpoint", tags=["General"])
@@ -66,26 +270,101 @@ async def root():
         "docs_url": "/docs",
         "endpoints": {
             "tasks": "/tasks",
-            "health": "/health"
+            "changes": "/tasks/changes",
+            "stats": "/tasks/stats",
+            "health": "/health",
+            "metrics": "/metrics",
+            "cache_stats": "/cache/stats"
         }
     }
 
 
 @app.get("/health", summary="Health check", tags=["General"])
-async def health_check():
+async def health_check(include_stats: bool = Query(False, description="Include the task counts of /tasks/stats")):
     """Health check endpoint."""
-    return {
+    health: Dict[str, Any] = {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
-        "total_tasks": task_storage.get_task_count()
+        "total_tasks": await _off_loop(task_storage.get_task_count)
+    }
+    if include_stats:
+        health["stats"] = await _off_loop(task_storage.get_stats, datetime.now(timezone.utc))
+    return health
+
+
+@app.get("/metrics", response_class=PlainTextResponse, summary="Prometheus metrics", tags=["General"])
+async def get_metrics():
+    """
+    Metrics in the Prometheus text format.
+    
+    Includes per-route request latency histograms, in-flight requests,
+    storage call timings, task counts by status and event loop lag.
+    """
+    if metrics is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    # Rendering gathers the task counts from the storage
+    return PlainTextResponse(await _off_loop(metrics.render), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/debug/profile", response_class=PlainTextResponse, summary="Profile the server", tags=["General"])
+async def debug_profile(
+    seconds: float = Query(10, description="How long to sample for", gt=0, le=300),
+    interval_ms: float = Query(5, description="Time between samples in milliseconds", ge=1, le=1000),
+    include_idle: bool = Query(False, description="Keep stacks of threads that are waiting"),
+    slower_than_ms: Optional[float] = Query(None, description="Only keep samples of requests at least this slow", ge=0)
+):
+    """
+    Sample the stacks of the running server and return them as collapsed stacks.
+    
+    Each line is a semicolon-separated stack followed by its sample count,
+    the input format of flamegraph.pl and speedscope. Sampling runs in a
+    worker thread, so the server keeps handling requests meanwhile.
+    """
+    if profiler is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    if profiler.busy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running")
+    
+    loop = asyncio.get_running_loop()
+    interval = interval_ms / 1000
+    if slower_than_ms is None:
+        stacks, samples = await loop.run_in_executor(None, profiler.profile, seconds, interval, include_idle)
+    else:
+        stacks, samples = await loop.run_in_executor(
+            None, profiler.profile_slow_requests, seconds, slower_than_ms / 1000, interval
+        )
+    return PlainTextResponse(stacks, headers={"X-Profile-Samples": str(samples)})
+
+
+@app.get("/cache/stats", summary="Cache statistics", tags=["General"])
+async def cache_stats():
+    """
+    Hit and miss counts of the server's caches.
+    
+    `query_cache` is null when the storage backend does not cache queries
+    in this process.
+    """
+    query_cache = getattr(task_storage, "query_cache", None)
+    return {
+        "query_cache": query_cache.stats() if query_cache is not None else None,
+        "response_cache": task_json_cache.stats(),
+        "compression_cache": compression_cache.stats(),
+        "coalescing": query_flights.stats()
     }
 
 
 @app.get("/tasks", response_model=List[Task], summary="Get all tasks", tags=["Tasks"])
 async def get_tasks(
+    request: Request,
     assignee: Optional[str] = Query(None, description="Filter by assignee"),
     status: Optional[TaskStatus] = Query(None, description="Filter by status"),
-    title_contains: Optional[str] = Query(None, description="Filter by title content")
+    title_contains: Optional[str] = Query(None, description="Filter by title content"),
+    due_after: Optional[datetime] = Query(None, description="Only tasks due at or after this time"),
+    due_before: Optional[datetime] = Query(None, description="Only tasks due before this time"),
+    sort: Literal["id", "due_date"] = Query("id", description="Order tasks by ID or by due date"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return, such as id,title,status"),
+    limit: Optional[int] = Query(None, description="Maximum number of tasks to return", ge=1, le=config.max_page_size),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page")
 ):
     """
     Get all tasks with optional filtering.
@@ -93,30 +372,365 @@ async def get_tasks(
     - **assignee**: Filter tasks by assignee (partial match, case-insensitive)
     - **status**: Filter tasks by status
     - **title_contains**: Filter tasks containing text in title (case-insensitive)
+    - **due_after**, **due_before**: Filter tasks by due date; tasks without one are excluded
+    - **sort**: `id` (default) or `due_date`, earliest first with undated tasks last
+    - **fields**: Return only these task fields, such as `id,title,status`
+    - **limit**: Return at most this many tasks
+    - **cursor**: Continue after the previous page
+    
+    When `limit` or `cursor` is given, the response holds a single page and
+    the `X-Next-Cursor` header carries the cursor for the next one. The
+    header is absent on the last page.
+    
+    Responses carry an ETag; send it back in `If-None-Match` to get
+    304 Not Modified while the result is unchanged. While the change feed
+    is enabled, `X-Change-Seq` holds the sequence number of the last change
+    the response reflects; read `/tasks/changes` from there to stay in sync.
     """
-    if any([assignee, status, title_contains]):
-        return task_storage.search_tasks(
-            assignee=assignee,
-            status=status.value if status else None,
-            title_contains=title_contains
+    encoder = _fields_encoder(fields)
+    filters: Dict[str, Any] = {
+        "assignee": assignee,
+        "status": status.value if status else None,
+        "title_contains": title_contains,
+        "due_after": due_after,
+        "due_before": due_before
+    }
+    
+    async def compute() -> Tuple[str, bytes, Dict[str, str]]:
+        return await _off_loop(_list_tasks, sort, limit, cursor, encoder, filters)
+    
+    # Identical queries arriving together share one result. With the memory
+    # backend compute() finishes without yielding, so only the kept result is
+    # shared; with the others a query runs in the thread pool, and requests
+    # arriving meanwhile wait for it.
+    key = ("tasks", sort, fields, limit, cursor) + tuple(filters.values())
+    etag, body, headers = await query_flights.run(key, compute)
+    return await _json_response(request, etag, body, headers)
+
+
+def _list_tasks(
+    sort: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+    encoder: Optional[TaskEncoder],
+    filters: Dict[str, Any]
+) -> Tuple[str, bytes, Dict[str, str]]:
+    """Run a GET /tasks query and return the ETag, JSON body and headers of its response."""
+    seq_headers = {"X-Change-Seq": str(change_feed.last_seq)} if change_feed is not None else {}
+    if sort == "due_date":
+        if limit is None and cursor is None:
+            etag, body = task_json_cache.encode_list(_iter_by_due_date(**filters), encoder=encoder)
+            return etag, body, seq_headers
+        return _due_date_page(limit, cursor, seq_headers, encoder, **filters)
+    
+    if limit is not None or cursor is not None:
+        try:
+            after_id = decode_cursor(cursor) if cursor is not None else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        page, next_after = task_storage.get_tasks_page(limit=limit or config.default_page_size, after_id=after_id, **filters)
+        headers = {"X-Next-Cursor": encode_cursor(next_after)} if next_after is not None else {}
+        etag, body = task_json_cache.encode_list(page, salt=headers.get("X-Next-Cursor", ""), encoder=encoder)
+        return etag, body, {**headers, **seq_headers}
+    
+    if any(filters.values()):
+        tasks = task_storage.search_tasks(**filters)
+    else:
+        tasks = task_storage.get_all_tasks()
+    etag, body = task_json_cache.encode_list(tasks, encoder=encoder)
+    return etag, body, seq_headers
+
+
+def _iter_by_due_date(batch_size: int = 1000, **filters: Any) -> Iterator[Task]:
+    """Iterate over every matching task in due date order, one storage page at a time."""
+    after = None
+    while True:
+        page, after = task_storage.get_tasks_page_by_due_date(batch_size, after=after, **filters)
+        yield from page
+        if after is None:
+            return
+
+
+def _due_date_page(
+    limit: Optional[int],
+    cursor: Optional[str],
+    headers: Dict[str, str],
+    encoder: Optional[TaskEncoder],
+    **filters: Any
+) -> Tuple[str, bytes, Dict[str, str]]:
+    """Return the ETag, JSON body and headers of one page of tasks in due date order."""
+    try:
+        after = decode_due_cursor(cursor) if cursor is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    page, next_after = task_storage.get_tasks_page_by_due_date(limit or config.default_page_size, after=after, **filters)
+    if next_after is not None:
+        headers = {**headers, "X-Next-Cursor": encode_due_cursor(next_after)}
+    etag, body = task_json_cache.encode_list(page, salt=headers.get("X-Next-Cursor", ""), encoder=encoder)
+    return etag, body, headers
+
+
+@app.get("/tasks/stats", response_model=TaskStats, summary="Get task statistics", tags=["Tasks"])
+async def get_task_stats():
+    """
+    Get task counts by status and by assignee, and overdue task counts.
+    
+    Assignees are counted case-insensitively under their lowercased name.
+    Overdue tasks are todo or in progress with a due date in the past. The
+    memory backend keeps these counts current on every change, so this
+    does not scan the tasks.
+    """
+    return await _off_loop(task_storage.get_stats, datetime.now(timezone.utc))
+
+
+@app.get("/tasks/overdue", response_model=List[Task], summary="Get overdue tasks", tags=["Tasks"])
+async def get_overdue_tasks(
+    request: Request,
+    assignee: Optional[str] = Query(None, description="Filter by assignee"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return, such as id,title,status"),
+    limit: Optional[int] = Query(None, description="Maximum number of tasks to return", ge=1, le=config.max_page_size),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page")
+):
+    """
+    Get tasks that are past their due date and still todo or in progress.
+    
+    Tasks are ordered by due date, most overdue first. Due dates without a
+    timezone are taken as UTC. Pagination works as for `GET /tasks` with
+    `sort=due_date`, and `fields` selects the task fields to return.
+    """
+    encoder = _fields_encoder(fields)
+    filters: Dict[str, Any] = {
+        "assignee": assignee,
+        "due_before": datetime.now(timezone.utc),
+        "open_only": True
+    }
+    if limit is None and cursor is None:
+        etag, body = await _off_loop(task_json_cache.encode_list, _iter_by_due_date(**filters), encoder=encoder)
+        return await _json_response(request, etag, body)
+    etag, body, headers = await _off_loop(_due_date_page, limit, cursor, {}, encoder, **filters)
+    return await _json_response(request, etag, body, headers)
+
+
+def _encode_batch(tasks: Iterator[Task], encode: TaskEncoder, batch_size: int) -> List[bytes]:
+    """Encode up to batch_size more tasks from an iterator."""
+    return [encode(task) for task in islice(tasks, batch_size)]
+
+
+async def _ndjson_lines(tasks: Iterable[Task], encode: TaskEncoder, batch_size: int = 500) -> AsyncIterator[bytes]:
+    """Encode tasks as newline-delimited JSON, yielding one chunk per batch."""
+    iterator = iter(tasks)
+    while True:
+        # Reading a batch may fetch the next page from the storage
+        batch = await _off_loop(_encode_batch, iterator, encode, batch_size)
+        if not batch:
+            return
+        yield b"\n".join(batch) + b"\n"
+
+
+async def _compressed_stream(chunks: AsyncIterator[bytes], encoding: str) -> AsyncIterator[bytes]:
+    """Compress a streamed body chunk by chunk, moving large chunks off the event loop."""
+    compressor = stream_compressor(encoding)
+    loop = asyncio.get_running_loop()
+    async for chunk in chunks:
+        if len(chunk) >= COMPRESS_OFFLOAD_SIZE:
+            data = await loop.run_in_executor(None, compressor.compress, chunk)
+        else:
+            data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@app.get("/tasks/export", summary="Export tasks as NDJSON", tags=["Tasks"])
+async def export_tasks(
+    request: Request,
+    assignee: Optional[str] = Query(None, description="Filter by assignee"),
+    status: Optional[TaskStatus] = Query(None, description="Filter by status"),
+    title_contains: Optional[str] = Query(None, description="Filter by title content"),
+    due_after: Optional[datetime] = Query(None, description="Only tasks due at or after this time"),
+    due_before: Optional[datetime] = Query(None, description="Only tasks due before this time"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return, such as id,title,status")
+):
+    """
+    Stream tasks as newline-delimited JSON, one task per line.
+    
+    Accepts the same filters and `fields` as `GET /tasks`. Tasks are encoded in batches
+    while the response is being sent, so the full list is never built in
+    memory.
+    """
+    encode = _fields_encoder(fields) or task_json_cache.encode
+    tasks = task_storage.iter_tasks(
+        assignee=assignee,
+        status=status.value if status else None,
+        title_contains=title_contains,
+        due_after=due_after,
+        due_before=due_before
+    )
+    body = _ndjson_lines(tasks, encode)
+    encoding = choose_encoding(request.headers.get("accept-encoding")) if config.compression_enabled else None
+    if encoding is None:
+        return StreamingResponse(body, media_type="application/x-ndjson")
+    return StreamingResponse(
+        _compressed_stream(body, encoding),
+        media_type="application/x-ndjson",
+        headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+    )
+
+
+def _bulk_result(items: List[BulkItemResult]) -> BulkOperationResult:
+    """Summarize per-item bulk results."""
+    succeeded = sum(1 for item in items if item.success)
+    return BulkOperationResult(succeeded=succeeded, failed=len(items) - succeeded, results=items)
+
+
+async def _change_stream(after_seq: int, resync: bool) -> AsyncIterator[bytes]:
+    """Stream change events after after_seq as Server-Sent Events for a bounded time."""
+    # Ask EventSource clients to reconnect promptly when the stream ends
+    yield b"retry: 1000\n\n"
+    if resync:
+        yield change_feed.resync_event().to_sse()
+    deadline = time.monotonic() + CHANGE_STREAM_LIFETIME
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        if not await change_feed.wait(after_seq, min(CHANGE_STREAM_KEEPALIVE, remaining)):
+            yield b": keep-alive\n\n"
+            continue
+        if not change_feed.is_available(after_seq):
+            # This client fell behind by more than the buffer holds
+            yield change_feed.resync_event().to_sse()
+            after_seq = change_feed.last_seq
+            continue
+        events = change_feed.events_after(after_seq)
+        after_seq = events[-1].seq
+        yield b"".join([event.to_sse() for event in events])
+
+
+@app.get("/tasks/changes", summary="Stream task changes", tags=["Tasks"])
+async def task_changes(
+    request: Request,
+    after: Optional[int] = Query(None, description="Sequence number of the last change already seen; overrides Last-Event-ID"),
+    poll: bool = Query(False, description="Return the pending changes as JSON instead of streaming them"),
+    timeout: float = Query(30, description="With poll, how long to wait for a change in seconds", ge=0, le=300)
+):
+    """
+    Changes to tasks, as Server-Sent Events or by long polling.
+    
+    Every create, update, delete and clear is an event numbered with an
+    increasing sequence number. Events carry the task after the change,
+    or null for deletes and clears. Clients resume after the last event
+    they saw with the `Last-Event-ID` header (sent automatically by
+    EventSource) or the `after` parameter; without either, they get only
+    new changes.
+    
+    A stream ends after a minute; reconnect with the last event's id to
+    continue without missing anything. Only the most recent changes are kept. A client whose position is no
+    longer available gets a `resync` event instead: it should reload the
+    tasks with `GET /tasks` and continue from its `X-Change-Seq` header.
+    
+    With `poll=true` the response is JSON with the changes pending after
+    the position, waiting up to `timeout` seconds for one to happen.
+    """
+    if change_feed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="The change feed is not available")
+    
+    after_seq, resync = change_feed.position(
+        str(after) if after is not None else request.headers.get("last-event-id")
+    )
+    if not poll:
+        return StreamingResponse(
+            _change_stream(after_seq, resync),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
         )
-    return task_storage.get_all_tasks()
+    
+    if not resync:
+        await change_feed.wait(after_seq, timeout)
+        resync = not change_feed.is_available(after_seq)
+    if resync:
+        events = []
+        last_seq = change_feed.last_seq
+    else:
+        events = change_feed.events_after(after_seq)
+        last_seq = events[-1].seq if events else after_seq
+    body = b'{"resync":%s,"last_seq":%d,"events":[%s]}' % (
+        b"true" if resync else b"false", last_seq, b",".join([event.data for event in events])
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@app.post("/tasks/bulk", response_model=BulkOperationResult, status_code=status.HTTP_201_CREATED, summary="Create tasks in bulk", tags=["Tasks"])
+async def create_tasks_bulk(tasks: List[TaskCreate] = Body(..., max_length=config.max_bulk_size)):
+    """
+    Create several tasks in one request.
+    
+    The whole batch is validated before anything is stored, so an invalid
+    item rejects the request with 422. The results list the new IDs in
+    request order.
+    """
+    created = await _write(task_storage.create_tasks, tasks)
+    return _bulk_result([
+        BulkItemResult(index=index, id=task.id, success=True)
+        for index, task in enumerate(created)
+    ])
+
+
+@app.patch("/tasks/bulk", response_model=BulkOperationResult, summary="Update tasks in bulk", tags=["Tasks"])
+async def update_tasks_bulk(updates: List[TaskBulkUpdate] = Body(..., max_length=config.max_bulk_size)):
+    """
+    Update several tasks in one request.
+    
+    Each item holds the task **id** and the fields to change. Items whose
+    task does not exist are reported as failed; the others are applied.
+    """
+    updated = await _write(task_storage.update_tasks, updates)
+    return _bulk_result([
+        BulkItemResult(index=index, id=item.id, success=True)
+        if task is not None
+        else BulkItemResult(index=index, id=item.id, success=False, error=f"Task with ID {item.id} not found")
+        for index, (item, task) in enumerate(zip(updates, updated))
+    ])
+
+
+@app.delete("/tasks/bulk", response_model=BulkOperationResult, summary="Delete tasks in bulk", tags=["Tasks"])
+async def delete_tasks_bulk(
+    ids: List[int] = Body(..., embed=True, max_length=config.max_bulk_size, description="IDs of the tasks to delete")
+):
+    """
+    Delete several tasks in one request.
+    
+    - **ids**: IDs of the tasks to delete; missing tasks are reported as failed
+    """
+    deleted = await _write(task_storage.delete_tasks, ids)
+    return _bulk_result([
+        BulkItemResult(index=index, id=task_id, success=True)
+        if ok
+        else BulkItemResult(index=index, id=task_id, success=False, error=f"Task with ID {task_id} not found")
+        for index, (task_id, ok) in enumerate(zip(ids, deleted))
+    ])
 
 
 @app.get("/tasks/{task_id}", response_model=Task, summary="Get a task by ID", tags=["Tasks"])
-async def get_task(task_id: int):
+async def get_task(task_id: int, request: Request):
     """
     Get a specific task by ID.
     
     - **task_id**: Unique identifier of the task
+    
+    The ETag changes whenever the task is updated. Send it back in
+    `If-None-Match` to get 304 Not Modified while the task is unchanged.
     """
-    task = task_storage.get_task(task_id)
+    task = await _off_loop(task_storage.get_task, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with ID {task_id} not found"
         )
-    return task
+    etag, body = task_json_cache.get(task)
+    return await _json_response(request, etag, body)
 
 
 @app.post("/tasks", response_model=Task, status_code=status.HTTP_201_CREATED, summary="Create a new task", tags=["Tasks"])
@@ -130,7 +744,7 @@ async def create_task(task: TaskCreate):
     - **due_date**: Due date for the task (optional, ISO format)
     - **status**: Task status (optional, defaults to 'todo')
     """
-    created_task = task_storage.create_task(task)
+    created_task = await _write(task_storage.create_task, task)
     return created_task
 
 
@@ -142,7 +756,7 @@ async def update_task(task_id: int, task_update: TaskUpdate):
     - **task_id**: Unique identifier of the task
     - All fields are optional and will only update provided values
     """
-    updated_task = task_storage.update_task(task_id, task_update)
+    updated_task = await _write(task_storage.update_task, task_id, task_update)
     if not updated_task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -158,7 +772,7 @@ async def delete_task(task_id: int):
     
     - **task_id**: Unique identifier of the task
     """
-    deleted = task_storage.delete_task(task_id)
+    deleted = await _write(task_storage.delete_task, task_id)
     if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -171,13 +785,15 @@ async def delete_task(task_id: int):
 
 
 @app.get("/tasks/status/{status_value}", response_model=List[Task], summary="Get tasks by status", tags=["Tasks"])
-async def get_tasks_by_status(status_value: TaskStatus):
+async def get_tasks_by_status(status_value: TaskStatus, request: Request):
     """
     Get all tasks with a specific status.
     
     - **status_value**: Task status (todo, in_progress, done, cancelled)
     """
-    return task_storage.search_tasks(status=status_value.value)
+    tasks = await _off_loop(task_storage.search_tasks, status=status_value.value)
+    etag, body = task_json_cache.encode_list(tasks)
+    return await _json_response(request, etag, body)
 
 
 @app.delete("/tasks", summary="Clear all tasks", tags=["Tasks"])
@@ -185,7 +801,7 @@ async def clear_all_tasks():
     """
     Delete all tasks. Use with caution!
     """
-    deleted_count = task_storage.clear_all_tasks()
+    deleted_count = await _write(task_storage.clear_all_tasks)
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
@@ -0,0 +1,426 @@
+"""
+SQLite-backed storage for tasks.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from .models import Task, TaskBulkUpdate, TaskCreate, TaskStats, TaskStatus, TaskUpdate
+from .storage import OPEN_STATUSES, DueCursor
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT,
+    assignee TEXT,
+    due_date TEXT,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    assignee_key TEXT,
+    due_ts INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks (assignee_key);
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (due_ts);
+"""
+
+_COLUMNS = "id, title, description, assignee, due_date, status, created_at, updated_at"
+
+_INSERT = (
+    "INSERT INTO tasks (id, title, description, assignee, due_date, status, created_at, updated_at, "
+    "title_key, assignee_key, due_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_UPDATE = (
+    "UPDATE tasks SET title = ?, description = ?, assignee = ?, due_date = ?, status = ?, updated_at = ?, "
+    "title_key = ?, assignee_key = ?, due_ts = ? WHERE id = ?"
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    """Encode a datetime for storage, keeping its timezone if it has one."""
+    return value.isoformat() if value is not None else None
+
+
+def _from_text(value: Optional[str]) -> Optional[datetime]:
+    """Decode a datetime written by _to_text."""
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _to_micros(value: Optional[datetime]) -> Optional[int]:
+    """Convert a datetime to epoch microseconds for ordering, treating naive values as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _row_to_task(row: Sequence[Any]) -> Task:
+    """Build a Task from a row selected with _COLUMNS. Stored values are already validated."""
+    return Task.model_construct(
+        title=row[1],
+        description=row[2],
+        assignee=row[3],
+        due_date=_from_text(row[4]),
+        status=TaskStatus(row[5]),
+        id=row[0],
+        created_at=_from_text(row[6]),
+        updated_at=_from_text(row[7])
+    )
+
+
+def _task_params(task: Task) -> Tuple[Any, ...]:
+    """Column values for inserting a task, in _INSERT order."""
+    return (
+        task.id,
+        task.title,
+        task.description,
+        task.assignee,
+        _to_text(task.due_date),
+        task.status.value,
+        _to_text(task.created_at),
+        _to_text(task.updated_at),
+        task.title.lower(),
+        task.assignee.lower() if task.assignee else None,
+        _to_micros(task.due_date)
+    )
+
+
+class SQLiteTaskStorage:
+    """
+    SQLite storage for tasks.
+    
+    The database runs in WAL mode so readers never block the writer, and
+    filters are answered through SQL indexes on status, assignee and due
+    date. Connections are kept in a small pool and every query is
+    parameterized, so sqlite3 reuses its prepared statements. Writes from
+    this process are serialized with a lock; other processes are handled
+    by SQLite's own locking.
+    """
+    
+    def __init__(self, path: str = "tasks.db", pool_size: int = 4):
+        """Open the database, creating the schema if needed."""
+        self._path = path
+        # Each connection to ":memory:" is a separate database, so share one
+        if path == ":memory:":
+            pool_size = 1
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._write_lock = threading.Lock()
+        for _ in range(pool_size):
+            conn = self._connect()
+            self._connections.append(conn)
+            self._pool.put(conn)
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a pooled connection with the storage pragmas applied."""
+        conn = sqlite3.connect(
+            self._path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection from the pool."""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection and run a write transaction on it."""
+        with self._write_lock, self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+    
+    def close(self) -> None:
+        """Close every pooled connection."""
+        for conn in self._connections:
+            conn.close()
+        self._connections.clear()
+    
+    @staticmethod
+    def _next_id(conn: sqlite3.Connection) -> int:
+        """Return the id the next inserted task will get."""
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()
+        return (row[0] if row else 0) + 1
+    
+    def create_task(self, task_data: TaskCreate) -> Task:
+        """Create a new task."""
+        return self.create_tasks([task_data])[0]
+    
+    def create_tasks(self, tasks_data: List[TaskCreate]) -> List[Task]:
+        """Create several tasks in one transaction."""
+        now = datetime.utcnow()
+        with self._transaction() as conn:
+            next_id = self._next_id(conn)
+            created = [
+                Task.model_construct(id=next_id + offset, created_at=now, updated_at=now, **task_data.model_dump())
+                for offset, task_data in enumerate(tasks_data)
+            ]
+            conn.executemany(_INSERT, [_task_params(task) for task in created])
+        return created
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Get a task by ID."""
+        with self._connection() as conn:
+            row = conn.execute(f"SELECT {_COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return _row_to_task(row) if row else None
+    
+    def get_all_tasks(self) -> List[Task]:
+        """Get all tasks."""
+        with self._connection() as conn:
+            rows = conn.execute(f"SELECT {_COLUMNS} FROM tasks ORDER BY id").fetchall()
+        return [_row_to_task(row) for row in rows]
+    
+    def _update(self, conn: sqlite3.Connection, task_id: int, update_data: dict, now: datetime) -> Optional[Task]:
+        """Apply changed fields to a task inside an open transaction."""
+        row = conn.execute(f"SELECT {_COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None
+        task = _row_to_task(row)
+        if not update_data:
+            return task
+        
+        update_data["updated_at"] = now
+        for field, value in update_data.items():
+            setattr(task, field, value)
+        params = _task_params(task)
+        conn.execute(_UPDATE, (*params[1:6], params[7], *params[8:], task_id))
+        return task
+    
+    def update_task(self, task_id: int, task_update: TaskUpdate) -> Optional[Task]:
+        """Update an existing task."""
+        with self._transaction() as conn:
+            return self._update(conn, task_id, task_update.model_dump(exclude_unset=True), datetime.utcnow())
+    
+    def update_tasks(self, updates: List[TaskBulkUpdate]) -> List[Optional[Task]]:
+        """Update several tasks in one transaction, returning None for missing ones."""
+        now = datetime.utcnow()
+        with self._transaction() as conn:
+            return [
+                self._update(conn, item.id, item.model_dump(exclude_unset=True, exclude={"id"}), now)
+                for item in updates
+            ]
+    
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a task by ID."""
+        return self.delete_tasks([task_id])[0]
+    
+    def delete_tasks(self, task_ids: List[int]) -> List[bool]:
+        """Delete several tasks in one transaction, returning whether each one existed."""
+        with self._transaction() as conn:
+            return [conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount > 0 for task_id in task_ids]
+    
+    @staticmethod
+    def _where(
+        assignee: Optional[str],
+        status: Optional[str],
+        title_contains: Optional[str],
+        after_id: Optional[int] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause and parameters for the given filters."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if status:
+            clauses.append("status = ?")
+            params.append(status.value if isinstance(status, TaskStatus) else status)
+        if assignee:
+            clauses.append("instr(assignee_key, ?) > 0")
+            params.append(assignee.lower())
+        if title_contains:
+            clauses.append("instr(title_key, ?) > 0")
+            params.append(title_contains.lower())
+        if due_after is not None:
+            clauses.append("due_ts >= ?")
+            params.append(_to_micros(due_after))
+        if due_before is not None:
+            clauses.append("due_ts < ?")
+            params.append(_to_micros(due_before))
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+    
+    def search_tasks(
+        self,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> List[Task]:
+        """Search tasks by various criteria. Due dates match from due_after (inclusive) to due_before (exclusive)."""
+        where, params = self._where(assignee, status, title_contains, due_after=due_after, due_before=due_before)
+        with self._connection() as conn:
+            rows = conn.execute(f"SELECT {_COLUMNS} FROM tasks{where} ORDER BY id", params).fetchall()
+        return [_row_to_task(row) for row in rows]
+    
+    def get_tasks_page(
+        self,
+        limit: int,
+        after_id: Optional[int] = None,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Tuple[List[Task], Optional[int]]:
+        """Get up to ``limit`` tasks with an id greater than ``after_id``, plus the id to resume after."""
+        where, params = self._where(assignee, status, title_contains, after_id, due_after, due_before)
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM tasks{where} ORDER BY id LIMIT ?", (*params, limit + 1)
+            ).fetchall()
+        page = [_row_to_task(row) for row in rows[:limit]]
+        next_after = page[-1].id if len(rows) > limit else None
+        return page, next_after
+    
+    def get_tasks_page_by_due_date(
+        self,
+        limit: int,
+        after: Optional[DueCursor] = None,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        open_only: bool = False
+    ) -> Tuple[List[Task], Optional[DueCursor]]:
+        """
+        Get up to ``limit`` tasks in due date order, following the position ``after``.
+        
+        Dated tasks are read in (due_ts, id) order through the due date
+        index, which covers the id. Tasks without a due date follow in id
+        order, unless a due date range is given.
+        """
+        where, params = self._where(assignee, status, title_contains, due_after=due_after, due_before=due_before)
+        clauses = [where[len(" WHERE "):]] if where else []
+        if open_only:
+            clauses.append(f"status IN ({', '.join('?' * len(OPEN_STATUSES))})")
+            params.extend(open_status.value for open_status in OPEN_STATUSES)
+        dated_only = due_after is not None or due_before is not None
+        rows: List[Sequence[Any]] = []
+        with self._connection() as conn:
+            if after is None or after[0] is not None:
+                dated = clauses + ["due_ts IS NOT NULL"]
+                dated_params = list(params)
+                if after is not None:
+                    dated.append("(due_ts, id) > (?, ?)")
+                    dated_params.extend(after)
+                rows = conn.execute(
+                    f"SELECT {_COLUMNS}, due_ts FROM tasks WHERE {' AND '.join(dated)} ORDER BY due_ts, id LIMIT ?",
+                    (*dated_params, limit + 1)
+                ).fetchall()
+            if len(rows) <= limit and not dated_only:
+                undated = clauses + ["due_ts IS NULL"]
+                undated_params = list(params)
+                if after is not None and after[0] is None:
+                    undated.append("id > ?")
+                    undated_params.append(after[1])
+                rows += conn.execute(
+                    f"SELECT {_COLUMNS}, due_ts FROM tasks WHERE {' AND '.join(undated)} ORDER BY id LIMIT ?",
+                    (*undated_params, limit + 1 - len(rows))
+                ).fetchall()
+        page = [_row_to_task(row) for row in rows[:limit]]
+        if len(rows) <= limit:
+            return page, None
+        last = rows[limit - 1]
+        return page, (last[-1], last[0])
+    
+    def iter_tasks(
+        self,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        batch_size: int = 1000,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Iterator[Task]:
+        """Iterate over matching tasks in id order, one keyset page at a time."""
+        after_id = None
+        while True:
+            page, after_id = self.get_tasks_page(
+                batch_size,
+                after_id=after_id,
+                assignee=assignee,
+                status=status,
+                title_contains=title_contains,
+                due_after=due_after,
+                due_before=due_before
+            )
+            yield from page
+            if after_id is None:
+                return
+    
+    def get_task_count(self) -> int:
+        """Get the total number of tasks."""
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+    
+    def count_by_status(self) -> Dict[str, int]:
+        """Get the number of tasks with each status."""
+        counts = {status.value: 0 for status in TaskStatus}
+        with self._connection() as conn:
+            counts.update(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+        return counts
+    
+    def get_stats(self, now: datetime) -> TaskStats:
+        """Get task counts by status and assignee, and the number of tasks overdue at now."""
+        by_status = {status.value: 0 for status in TaskStatus}
+        overdue_by_status = {status.value: 0 for status in OPEN_STATUSES}
+        with self._connection() as conn:
+            by_status.update(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+            by_assignee = dict(conn.execute(
+                "SELECT assignee_key, COUNT(*) FROM tasks WHERE assignee_key IS NOT NULL GROUP BY assignee_key"
+            ).fetchall())
+            overdue_by_status.update(conn.execute(
+                f"SELECT status, COUNT(*) FROM tasks WHERE due_ts < ? "
+                f"AND status IN ({', '.join('?' * len(OPEN_STATUSES))}) GROUP BY status",
+                (_to_micros(now), *(status.value for status in OPEN_STATUSES))
+            ).fetchall())
+        total = sum(by_status.values())
+        return TaskStats(
+            total=total,
+            by_status=by_status,
+            by_assignee=by_assignee,
+            unassigned=total - sum(by_assignee.values()),
+            overdue=sum(overdue_by_status.values()),
+            overdue_by_status=overdue_by_status
+        )
+    
+    def clear_all_tasks(self) -> int:
+        """Clear all tasks and return the count of deleted tasks."""
+        with self._transaction() as conn:
+            count = conn.execute("DELETE FROM tasks").rowcount
+            conn.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks'")
+        return count
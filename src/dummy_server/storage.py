@@ -2,18 +2,236 @@
 In-memory storage for tasks.
 """
 
-from datetime import datetime
-from typing import Dict, List, Optional
-from .models import Task, TaskCreate, TaskUpdate
+from array import array
+from datetime import datetime, timezone
+from functools import partial
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Collection, Dict, Iterable, Iterator, List, MutableMapping, MutableSequence, Optional, Protocol, Set, Tuple, Type, Union
+from .compact import CompactTaskTable
+from .indexes import IdSet, SortedKeyIndex, SortedPairIndex, TrigramIndex
+from .query_cache import QueryCache
+from .models import Task, TaskBulkUpdate, TaskCreate, TaskStats, TaskUpdate, TaskStatus
+
+if TYPE_CHECKING:
+    from .config import ServerConfig
+
+
+# Kinds of change reported to storage listeners
+CHANGE_CREATE = "create"
+CHANGE_UPDATE = "update"
+CHANGE_DELETE = "delete"
+CHANGE_CLEAR = "clear"
+
+# Called with the change kind, the task id (None for a clear) and the
+# stored task after the change (None for deletes and clears)
+ChangeListener = Callable[[str, Optional[int], Optional[Task]], None]
+
+# Statuses of tasks that still have to be done, which can become overdue
+OPEN_STATUSES = (TaskStatus.TODO, TaskStatus.IN_PROGRESS)
+
+# Position in due date order: (due date in epoch microseconds, or None for
+# tasks without one, task id)
+DueCursor = Tuple[Optional[int], int]
+
+# Due key of tasks without a due date, so they sort after every dated task;
+# the largest signed 64-bit value, so it fits a SortedPairIndex
+_UNDATED = 2 ** 63 - 1
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def due_micros(value: Optional[datetime]) -> Optional[int]:
+    """Convert a due date to epoch microseconds for ordering, treating naive values as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _status_key(status) -> str:
+    """Normalize a status (enum member or raw value) to its index key."""
+    return status.value if isinstance(status, TaskStatus) else status
+
+
+def _assignee_key(assignee: str) -> str:
+    """Normalize an assignee for case-insensitive indexing."""
+    return assignee.lower()
+
+
+class TaskStore(Protocol):
+    """Interface every task storage backend implements."""
+    
+    def create_task(self, task_data: TaskCreate) -> Task: ...
+    
+    def create_tasks(self, tasks_data: List[TaskCreate]) -> List[Task]: ...
+    
+    def get_task(self, task_id: int) -> Optional[Task]: ...
+    
+    def get_all_tasks(self) -> List[Task]: ...
+    
+    def update_task(self, task_id: int, task_update: TaskUpdate) -> Optional[Task]: ...
+    
+    def update_tasks(self, updates: List[TaskBulkUpdate]) -> List[Optional[Task]]: ...
+    
+    def delete_task(self, task_id: int) -> bool: ...
+    
+    def delete_tasks(self, task_ids: List[int]) -> List[bool]: ...
+    
+    def search_tasks(
+        self,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> List[Task]: ...
+    
+    def get_tasks_page(
+        self,
+        limit: int,
+        after_id: Optional[int] = None,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Tuple[List[Task], Optional[int]]: ...
+    
+    def get_tasks_page_by_due_date(
+        self,
+        limit: int,
+        after: Optional[DueCursor] = None,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        open_only: bool = False
+    ) -> Tuple[List[Task], Optional[DueCursor]]: ...
+    
+    def iter_tasks(
+        self,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        batch_size: int = 1000,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Iterator[Task]: ...
+    
+    def get_task_count(self) -> int: ...
+    
+    def count_by_status(self) -> Dict[str, int]: ...
+    
+    def get_stats(self, now: datetime) -> TaskStats: ...
+    
+    def clear_all_tasks(self) -> int: ...
 
 
 class TaskStorage:
-    """In-memory storage for tasks."""
+    """
+    In-memory storage for tasks.
+    
+    By default tasks are kept as Task models. In compact mode they are kept
+    in a CompactTaskTable, the status and assignee indexes hold their ids
+    in IdSets instead of sets, and the ordered ids and the due date indexes
+    are kept in typed arrays, which stores far more tasks per byte of
+    memory at the cost of building a Task on every read and of slower
+    index intersections. The title trigram index uses IdSets in both
+    modes, since it holds an entry for every trigram of every title.
     
-    def __init__(self):
+    Filtered queries are cached by their normalized filters. The cache is
+    tagged with a version that every create, delete and clear bumps, as do
+    updates that change a task's title, assignee, status or due date.
+    """
+    
+    def __init__(self, compact: bool = False, query_cache_size: int = 256):
         """Initialize the storage."""
-        self._tasks: Dict[int, Task] = {}
+        self._tasks: MutableMapping[int, Task] = CompactTaskTable() if compact else {}
+        self._posting: Callable[[], Collection[int]] = IdSet if compact else set
+        self._id_list: Callable[[Iterable[int]], MutableSequence[int]] = partial(array, "I") if compact else list
+        self._due_index: Type[Union[SortedKeyIndex, SortedPairIndex]] = SortedPairIndex if compact else SortedKeyIndex
         self._next_id: int = 1
+        # Ids in increasing order for keyset pagination; deleted ids are
+        # skipped lazily and compacted once they make up half the list
+        self._ordered_ids: MutableSequence[int] = self._id_list(())
+        self._stale_ids: int = 0
+        # Secondary indexes: status value -> ids, lowercased assignee -> ids
+        self._by_status: Dict[str, Collection[int]] = {}
+        self._by_assignee: Dict[str, Collection[int]] = {}
+        # Due date indexes: status value -> sorted (due key, id) pairs
+        self._by_due: Dict[str, Union[SortedKeyIndex, SortedPairIndex]] = {}
+        # Trigram indexes: title trigrams -> ids, assignee trigrams -> assignee keys
+        self._title_grams = TrigramIndex(IdSet)
+        self._assignee_grams = TrigramIndex()
+        self._listeners: List[ChangeListener] = []
+        self._version: int = 0
+        self.query_cache = QueryCache(query_cache_size)
+    
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Register a callback invoked synchronously after every mutation."""
+        self._listeners.append(listener)
+    
+    def _notify(self, kind: str, task_id: Optional[int], task: Optional[Task]) -> None:
+        """Report a mutation to the registered listeners."""
+        for listener in self._listeners:
+            listener(kind, task_id, task)
+    
+    def _index_task(self, task: Task, title: bool = True) -> None:
+        """Add a task to the secondary indexes."""
+        status_key = _status_key(task.status)
+        ids = self._by_status.get(status_key)
+        if ids is None:
+            ids = self._by_status[status_key] = self._posting()
+        ids.add(task.id)
+        due_index = self._by_due.get(status_key)
+        if due_index is None:
+            due_index = self._by_due[status_key] = self._due_index()
+        due_index.add(self._due_key(task))
+        if task.assignee:
+            key = _assignee_key(task.assignee)
+            if key not in self._by_assignee:
+                self._by_assignee[key] = self._posting()
+                self._assignee_grams.add(key, key)
+            self._by_assignee[key].add(task.id)
+        if title:
+            self._title_grams.add(task.id, task.title)
+    
+    def _unindex_task(self, task: Task, title: bool = True) -> None:
+        """Remove a task from the secondary indexes."""
+        status_key = _status_key(task.status)
+        self._discard(self._by_status, status_key, task.id)
+        self._by_due[status_key].remove(self._due_key(task))
+        if task.assignee:
+            key = _assignee_key(task.assignee)
+            if self._discard(self._by_assignee, key, task.id):
+                self._assignee_grams.remove(key, key)
+        if title:
+            self._title_grams.remove(task.id, task.title)
+    
+    @staticmethod
+    def _due_key(task: Task) -> Tuple[int, int]:
+        """Return a task's key in the due date indexes."""
+        micros = due_micros(task.due_date)
+        return (_UNDATED if micros is None else micros, task.id)
+    
+    @staticmethod
+    def _discard(index: Dict[str, Collection[int]], key: str, task_id: int) -> bool:
+        """
+        Remove an id from an index bucket, dropping the bucket once empty.
+        
+        Returns True if the bucket was dropped.
+        """
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(task_id)
+            if not ids:
+                del index[key]
+                return True
+        return False
     
     def create_task(self, task_data: TaskCreate) -> Task:
         """Create a new task."""
@@ -24,10 +242,35 @@ class TaskStorage:
             updated_at=now,
             **task_data.model_dump()
         )
-        self._tasks[self._next_id] = task
-        self._next_id += 1
+        self._insert_task(task)
+        self._notify(CHANGE_CREATE, task.id, task)
         return task
     
+    def _insert_task(self, task: Task) -> None:
+        """Store a new task under its id and index it."""
+        self._tasks[task.id] = task
+        if not self._ordered_ids or task.id > self._ordered_ids[-1]:
+            self._ordered_ids.append(task.id)
+        else:
+            position = bisect_left(self._ordered_ids, task.id)
+            if position == len(self._ordered_ids) or self._ordered_ids[position] != task.id:
+                self._ordered_ids.insert(position, task.id)
+        self._index_task(task)
+        self._next_id = max(self._next_id, task.id + 1)
+        self._version += 1
+    
+    def _put_task(self, task: Task) -> None:
+        """Insert or replace a task with a known id, as when restoring persisted state."""
+        existing = self._tasks.get(task.id)
+        if existing is None:
+            self._insert_task(task)
+            return
+        # Replace in place so the task keeps its position in creation order
+        self._unindex_task(existing)
+        self._tasks[task.id] = task
+        self._index_task(task)
+        self._version += 1
+    
     def get_task(self, task_id: int) -> Optional[Task]:
         """Get a task by ID."""
         return self._tasks.get(task_id)
@@ -42,49 +285,433 @@ class TaskStorage:
             return None
         
         task = self._tasks[task_id]
-        update_data = task_update.model_dump(exclude_unset=True)
+        return self._apply_update(task, task_update.model_dump(exclude_unset=True), datetime.utcnow())
+    
+    def _apply_update(self, task: Task, update_data: dict, now: datetime) -> Task:
+        """
+        Apply changed fields to a stored task, refresh its index entries and return it.
         
-        if update_data:
-            update_data["updated_at"] = datetime.utcnow()
-            for field, value in update_data.items():
-                setattr(task, field, value)
+        The updated task is validated before anything is changed, so an
+        invalid update raises ValidationError and leaves the task and the
+        indexes as they were.
+        """
+        if not update_data:
+            return task
         
-        return task
+        updated = Task.model_validate({**task.model_dump(), **update_data, "updated_at": now})
+        old_keys = (_status_key(task.status), task.assignee, task.due_date)
+        self._unindex_task(task, title=False)
+        self._tasks[task.id] = updated
+        self._index_task(updated, title=False)
+        if updated.title != task.title:
+            self._title_grams.remove(task.id, task.title)
+            self._title_grams.add(task.id, updated.title)
+            self._version += 1
+        elif (_status_key(updated.status), updated.assignee, updated.due_date) != old_keys:
+            self._version += 1
+        self._notify(CHANGE_UPDATE, updated.id, updated)
+        return updated
     
     def delete_task(self, task_id: int) -> bool:
         """Delete a task by ID."""
-        if task_id in self._tasks:
-            del self._tasks[task_id]
-            return True
-        return False
+        deleted = self._remove_task(task_id)
+        self._maybe_compact()
+        return deleted
+    
+    def _remove_task(self, task_id: int) -> bool:
+        """Remove a task and its index entries, leaving its id in the ordered list."""
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return False
+        self._unindex_task(task)
+        self._stale_ids += 1
+        self._version += 1
+        self._notify(CHANGE_DELETE, task_id, None)
+        return True
+    
+    def _maybe_compact(self) -> None:
+        """Drop deleted ids from the ordered list once they make up half of it."""
+        if self._stale_ids * 2 > len(self._ordered_ids):
+            self._ordered_ids = self._id_list(i for i in self._ordered_ids if i in self._tasks)
+            self._stale_ids = 0
+    
+    def create_tasks(self, tasks_data: List[TaskCreate]) -> List[Task]:
+        """
+        Create several tasks in one operation.
+        
+        The input models have already been validated, so the stored tasks
+        are built without running validation a second time.
+        """
+        now = datetime.utcnow()
+        created: List[Task] = []
+        for task_data in tasks_data:
+            task = Task.model_construct(
+                id=self._next_id,
+                created_at=now,
+                updated_at=now,
+                **task_data.model_dump()
+            )
+            self._insert_task(task)
+            self._notify(CHANGE_CREATE, task.id, task)
+            created.append(task)
+        return created
+    
+    def update_tasks(self, updates: List[TaskBulkUpdate]) -> List[Optional[Task]]:
+        """
+        Update several tasks in one operation.
+        
+        Returns the updated task for each item in order, or None for items
+        whose task does not exist.
+        """
+        now = datetime.utcnow()
+        results: List[Optional[Task]] = []
+        for item in updates:
+            task = self._tasks.get(item.id)
+            if task is not None:
+                task = self._apply_update(task, item.model_dump(exclude_unset=True, exclude={"id"}), now)
+            results.append(task)
+        return results
+    
+    def delete_tasks(self, task_ids: List[int]) -> List[bool]:
+        """Delete several tasks in one operation, returning whether each one existed."""
+        results = [self._remove_task(task_id) for task_id in task_ids]
+        self._maybe_compact()
+        return results
+    
+    def _assignee_ids(self, assignee: str) -> Set[int]:
+        """Collect ids whose assignee contains the given text (case-insensitive)."""
+        needle = _assignee_key(assignee)
+        keys = self._assignee_grams.candidates(needle)
+        if keys is None:
+            keys = self._by_assignee.keys()
+        ids: Set[int] = set()
+        for key in keys:
+            if needle in key:
+                ids.update(self._by_assignee[key])
+        return ids
+    
+    def _title_of(self, task_id: int) -> str:
+        """Return a task's title, without materializing it in compact mode."""
+        if isinstance(self._tasks, CompactTaskTable):
+            return self._tasks.title_of(task_id)
+        return self._tasks[task_id].title
+    
+    def _due_keys(
+        self,
+        status_keys: Iterable[str],
+        low: Optional[int] = None,
+        high: Optional[int] = None,
+        after: Optional[Tuple[int, int]] = None,
+        undated: bool = False
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Iterate over (due key, id) pairs of tasks with the given statuses in due date order.
+        
+        Only tasks due at or after low and before high are included, and
+        only those following the key after. Tasks without a due date come
+        last and are only included when undated is set and no bound is given.
+        """
+        start = (low, 0) if low is not None else None
+        if after is not None and (start is None or after >= start):
+            start = (after[0], after[1] + 1)
+        if high is not None:
+            end: Optional[Tuple[int, int]] = (high, 0)
+        elif low is not None or not undated:
+            end = (_UNDATED, 0)
+        else:
+            end = None
+        ranges = [index.irange(start, end) for index in map(self._by_due.get, status_keys) if index]
+        return ranges[0] if len(ranges) == 1 else merge(*ranges)
+    
+    def _search_ids(
+        self,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Optional[List[int]]:
+        """
+        Resolve filters to the sorted list of matching task ids.
+        
+        Filters are resolved through the secondary indexes and intersected
+        starting from the smallest candidate set, so only the matching tasks
+        are ever touched. Title matches found through the trigram index are
+        candidates and are confirmed against the real title afterwards. A
+        due date range is read from the due date indexes in O(log n) plus
+        the number of tasks in the range. Returns None when no filter is
+        given. Results are served from the query cache while no write has
+        changed them.
+        """
+        low = due_micros(due_after)
+        high = due_micros(due_before)
+        key = (
+            _assignee_key(assignee) if assignee else None,
+            _status_key(status) if status else None,
+            title_contains.lower() if title_contains else None,
+            low,
+            high
+        )
+        if key == (None, None, None, None, None):
+            return None
+        cached = self.query_cache.get(key, self._version)
+        if cached is not None:
+            return cached
+        
+        candidates: List[Collection[int]] = []
+        if low is not None or high is not None:
+            status_keys = [_status_key(status)] if status else list(self._by_due)
+            candidates.append({task_id for _, task_id in self._due_keys(status_keys, low, high)})
+        elif status:
+            candidates.append(self._by_status.get(_status_key(status), set()))
+        if assignee:
+            candidates.append(self._assignee_ids(assignee))
+        if title_contains:
+            title_ids = self._title_grams.candidates(title_contains)
+            if title_ids is not None:
+                candidates.append(title_ids)
+        
+        if candidates:
+            candidates.sort(key=len)
+            ids = candidates[0]
+            for other in candidates[1:]:
+                if not ids:
+                    break
+                ids = ids & other if isinstance(ids, set) and isinstance(other, set) else {i for i in ids if i in other}
+            # Ids are assigned in increasing order, so sorting them keeps
+            # results in creation order like a full scan would.
+            result = sorted(ids)
+        else:
+            result = list(self._tasks)
+        
+        if title_contains:
+            needle = title_contains.lower()
+            result = [i for i in result if needle in self._title_of(i).lower()]
+        
+        self.query_cache.put(key, self._version, result)
+        return result
     
     def search_tasks(
-        self, 
-        assignee: Optional[str] = None, 
+        self,
+        assignee: Optional[str] = None,
         status: Optional[str] = None,
-        title_contains: Optional[str] = None
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
     ) -> List[Task]:
-        """Search tasks by various criteria."""
-        tasks = list(self._tasks.values())
+        """Search tasks by various criteria. Due dates match from due_after (inclusive) to due_before (exclusive)."""
+        ids = self._search_ids(
+            assignee=assignee,
+            status=status,
+            title_contains=title_contains,
+            due_after=due_after,
+            due_before=due_before
+        )
+        if ids is None:
+            return self.get_all_tasks()
+        return [self._tasks[task_id] for task_id in ids]
+    
+    def get_tasks_page(
+        self,
+        limit: int,
+        after_id: Optional[int] = None,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Tuple[List[Task], Optional[int]]:
+        """
+        Get up to ``limit`` tasks with an id greater than ``after_id``.
         
-        if assignee:
-            tasks = [t for t in tasks if t.assignee and assignee.lower() in t.assignee.lower()]
+        Returns the page in id order together with the id to resume after,
+        or None when there are no more tasks. Without filters the page is
+        located by binary search over the ordered ids, so its cost depends
+        on the page size rather than on the number of stored tasks.
+        """
+        ids = self._search_ids(
+            assignee=assignee,
+            status=status,
+            title_contains=title_contains,
+            due_after=due_after,
+            due_before=due_before
+        )
+        if ids is None:
+            ids = self._ordered_ids
+        
+        start = bisect_right(ids, after_id) if after_id is not None else 0
+        page: List[Task] = []
+        has_more = False
+        for task_id in islice(ids, start, None):
+            task = self._tasks.get(task_id)
+            if task is None:
+                # Deleted id not yet compacted out of the ordered list
+                continue
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(task)
+        
+        next_after = page[-1].id if has_more else None
+        return page, next_after
+    
+    def get_tasks_page_by_due_date(
+        self,
+        limit: int,
+        after: Optional[DueCursor] = None,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        open_only: bool = False
+    ) -> Tuple[List[Task], Optional[DueCursor]]:
+        """
+        Get up to ``limit`` tasks in due date order, following the position ``after``.
+        
+        Tasks without a due date come last in id order, unless a due date
+        range is given. With open_only, only tasks with an open status are
+        included. Returns the page together with the position to resume
+        after, or None when there are no more tasks.
         
+        The page is read from the due date indexes of the selected statuses
+        starting at the position, so its cost is O(log n) plus the tasks
+        walked. Assignee and title filters are checked on each walked task.
+        """
+        status_keys = [status.value for status in OPEN_STATUSES] if open_only else list(self._by_due)
         if status:
-            tasks = [t for t in tasks if t.status == status]
+            status_keys = [key for key in status_keys if key == _status_key(status)]
+        assignee_needle = _assignee_key(assignee) if assignee else None
+        title_needle = title_contains.lower() if title_contains else None
+        after_key = None
+        if after is not None:
+            after_key = (_UNDATED if after[0] is None else after[0], after[1])
         
-        if title_contains:
-            tasks = [t for t in tasks if title_contains.lower() in t.title.lower()]
+        page: List[Task] = []
+        last_key: Optional[Tuple[int, int]] = None
+        has_more = False
+        keys = self._due_keys(status_keys, due_micros(due_after), due_micros(due_before), after_key, undated=True)
+        for key in keys:
+            task_id = key[1]
+            if title_needle and title_needle not in self._title_of(task_id).lower():
+                continue
+            task = self._tasks[task_id]
+            if assignee_needle and not (task.assignee and assignee_needle in _assignee_key(task.assignee)):
+                continue
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(task)
+            last_key = key
+        
+        if not has_more:
+            return page, None
+        return page, (None if last_key[0] == _UNDATED else last_key[0], last_key[1])
+    
+    def iter_tasks(
+        self,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        batch_size: int = 1000,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Iterator[Task]:
+        """
+        Iterate over matching tasks in id order without building a full list.
+        
+        Unfiltered iteration walks the ordered ids page by page, so tasks
+        created or deleted while the iterator is suspended are handled like
+        they are for cursor pagination. Filtered iteration resolves the
+        matching ids up front and skips tasks deleted in the meantime.
+        """
+        ids = self._search_ids(
+            assignee=assignee,
+            status=status,
+            title_contains=title_contains,
+            due_after=due_after,
+            due_before=due_before
+        )
+        if ids is not None:
+            for task_id in ids:
+                task = self._tasks.get(task_id)
+                if task is not None:
+                    yield task
+            return
         
-        return tasks
+        after_id = None
+        while True:
+            page, after_id = self.get_tasks_page(batch_size, after_id=after_id)
+            yield from page
+            if after_id is None:
+                return
     
     def get_task_count(self) -> int:
         """Get the total number of tasks."""
         return len(self._tasks)
     
+    def count_by_status(self) -> Dict[str, int]:
+        """Get the number of tasks with each status, read from the status index."""
+        return {status.value: len(self._by_status.get(status.value, ())) for status in TaskStatus}
+    
+    def get_stats(self, now: datetime) -> TaskStats:
+        """
+        Get task counts by status and assignee, and the number of tasks overdue at now.
+        
+        Status and assignee counts are the sizes of the index buckets, which
+        every mutation keeps current in O(1), so no task is visited. Overdue
+        counts are ranks in the due date indexes of the open statuses.
+        """
+        by_assignee = {key: len(ids) for key, ids in self._by_assignee.items()}
+        cutoff = (due_micros(now), 0)
+        overdue_by_status = {}
+        for status in OPEN_STATUSES:
+            index = self._by_due.get(status.value)
+            overdue_by_status[status.value] = index.rank(cutoff) if index is not None else 0
+        return TaskStats(
+            total=len(self._tasks),
+            by_status=self.count_by_status(),
+            by_assignee=by_assignee,
+            unassigned=len(self._tasks) - sum(by_assignee.values()),
+            overdue=sum(overdue_by_status.values()),
+            overdue_by_status=overdue_by_status
+        )
+    
     def clear_all_tasks(self) -> int:
         """Clear all tasks and return the count of deleted tasks."""
         count = len(self._tasks)
         self._tasks.clear()
+        self._ordered_ids = self._id_list(())
+        self._stale_ids = 0
+        self._by_status.clear()
+        self._by_assignee.clear()
+        self._by_due.clear()
+        self._title_grams.clear()
+        self._assignee_grams.clear()
         self._next_id = 1
+        self._version += 1
+        self.query_cache.clear()
+        self._notify(CHANGE_CLEAR, None, None)
         return count
+
+
+def create_storage(config: "ServerConfig") -> TaskStore:
+    """Create the storage backend selected by the configuration."""
+    if config.storage_backend == "memory":
+        if config.wal_dir:
+            from .durability import DurableTaskStorage
+            return DurableTaskStorage(
+                config.wal_dir,
+                fsync_interval=config.wal_fsync_interval_ms / 1000,
+                snapshot_every=config.snapshot_every,
+                compact=config.compact_storage,
+                query_cache_size=config.query_cache_size
+            )
+        return TaskStorage(compact=config.compact_storage, query_cache_size=config.query_cache_size)
+    if config.storage_backend == "sqlite":
+        from .sqlite_storage import SQLiteTaskStorage
+        return SQLiteTaskStorage(config.sqlite_path, pool_size=config.sqlite_pool_size)
+    if config.storage_backend == "remote":
+        from .storage_server import RemoteTaskStorage
+        return RemoteTaskStorage(config.storage_socket)
+    raise ValueError(f"Unknown storage backend: {config.storage_backend!r}")
@@ -0,0 +1,472 @@
+"""
+Task storage shared between server processes over a Unix socket.
+
+One storage server process owns the data, so all workers see one
+linearizable store. Reads run side by side under a shared lock while writes
+take it exclusively, and results are encoded after the lock is released.
+Workers talk to the server through RemoteTaskStorage, which implements the
+TaskStore protocol. The socket is created readable and writable by its
+owner only.
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel
+from .models import Task, TaskBulkUpdate, TaskCreate, TaskStats, TaskStatus, TaskUpdate
+from .storage import DueCursor, TaskStore
+
+
+# Messages are JSON documents prefixed with their length
+_LENGTH = struct.Struct("<I")
+
+# Models that may cross the socket, by class name
+_MODELS = {model.__name__: model for model in (Task, TaskCreate, TaskUpdate, TaskBulkUpdate, TaskStats)}
+
+# Storage methods the server accepts. iter_tasks is built on get_tasks_page
+# by the client, since generators cannot be sent over the socket.
+REMOTE_METHODS = frozenset({
+    "create_task",
+    "create_tasks",
+    "get_task",
+    "get_all_tasks",
+    "update_task",
+    "update_tasks",
+    "delete_task",
+    "delete_tasks",
+    "search_tasks",
+    "get_tasks_page",
+    "get_tasks_page_by_due_date",
+    "get_task_count",
+    "count_by_status",
+    "get_stats",
+    "clear_all_tasks",
+})
+
+# Methods that only read the store and may run alongside each other
+READ_METHODS = frozenset({
+    "get_task",
+    "get_all_tasks",
+    "search_tasks",
+    "get_tasks_page",
+    "get_tasks_page_by_due_date",
+    "get_task_count",
+    "count_by_status",
+    "get_stats",
+})
+
+
+class RemoteStorageError(RuntimeError):
+    """Raised when the storage server fails to execute a call."""
+
+
+def _task_row(task: Task) -> List[Any]:
+    """Flatten a stored task into a list of JSON values, in _construct_task's order."""
+    due_date = task.due_date
+    return [
+        task.id,
+        task.title,
+        task.description,
+        task.assignee,
+        due_date.isoformat() if due_date is not None else None,
+        task.status.value if isinstance(task.status, TaskStatus) else task.status,
+        task.created_at.isoformat(),
+        task.updated_at.isoformat(),
+    ]
+
+
+def _construct_task(row: List[Any]) -> Task:
+    """Build a Task from a _task_row sent by the storage server, which only stores validated tasks."""
+    task_id, title, description, assignee, due_date, task_status, created_at, updated_at = row
+    return Task.model_construct(
+        id=task_id,
+        title=title,
+        description=description,
+        assignee=assignee,
+        due_date=datetime.fromisoformat(due_date) if due_date is not None else None,
+        status=TaskStatus(task_status),
+        created_at=datetime.fromisoformat(created_at),
+        updated_at=datetime.fromisoformat(updated_at)
+    )
+
+
+def _encode(value: Any) -> Any:
+    """Convert a value to JSON-compatible data, tagging pydantic models and datetimes."""
+    if isinstance(value, Task):
+        return {"__task__": _task_row(value)}
+    if isinstance(value, BaseModel):
+        return {"__model__": type(value).__name__, "data": value.model_dump(mode="json", exclude_unset=True)}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Reverse _encode, validating tagged models back into their classes."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        if "__task__" in value:
+            return _construct_task(value["__task__"])
+        if "__model__" in value:
+            return _MODELS[value["__model__"]].model_validate(value["data"])
+        if "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+def _send(stream: BinaryIO, message: Dict[str, Any]) -> None:
+    """Write one message to a stream."""
+    payload = json.dumps(message, separators=(",", ":")).encode()
+    stream.write(_LENGTH.pack(len(payload)) + payload)
+    stream.flush()
+
+
+def _receive(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Read one message from a stream, or None once the peer has closed it."""
+    header = stream.read(_LENGTH.size)
+    if len(header) < _LENGTH.size:
+        return None
+    (length,) = _LENGTH.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return json.loads(payload)
+
+
+class _ReadWriteLock:
+    """
+    Lock held by any number of readers at once, or by one writer.
+    
+    A waiting writer keeps new readers out, so a steady stream of reads
+    cannot starve writes.
+    """
+    
+    def __init__(self):
+        """Create an unlocked lock."""
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock shared with other readers."""
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+    
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock exclusively."""
+        with self._condition:
+            self._writers_waiting += 1
+            try:
+                while self._writing or self._readers:
+                    self._condition.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class _StorageRequestHandler(socketserver.StreamRequestHandler):
+    """Serves storage calls from one client connection."""
+    
+    def handle(self) -> None:
+        """Answer calls until the client disconnects."""
+        server: StorageServer = self.server
+        while True:
+            request = _receive(self.rfile)
+            if request is None:
+                return
+            try:
+                method = request["method"]
+                if method not in REMOTE_METHODS:
+                    raise AttributeError(f"Unknown storage method: {method!r}")
+                args = _decode(request.get("args", []))
+                kwargs = _decode(request.get("kwargs", {}))
+                lock = server.lock.read if method in READ_METHODS else server.lock.write
+                with lock():
+                    result = getattr(server.storage, method)(*args, **kwargs)
+                # Updates replace stored tasks rather than change them, so the
+                # result can be encoded without holding the lock
+                response = {"result": _encode(result)}
+            except Exception as e:
+                response = {"error": str(e), "type": type(e).__name__}
+            _send(self.wfile, response)
+
+
+class StorageServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server running reads concurrently and writes one at a time."""
+    
+    daemon_threads = True
+    
+    def __init__(self, path: str, storage: TaskStore):
+        """Bind the server to a socket path, replacing a stale socket file."""
+        if os.path.exists(path):
+            os.remove(path)
+        self.storage = storage
+        self.lock = _ReadWriteLock()
+        super().__init__(path, _StorageRequestHandler)
+    
+    def server_bind(self) -> None:
+        """Bind the socket with access for its owner only."""
+        # Created through the umask so there is no moment when others can connect
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+        os.chmod(self.server_address, 0o600)
+
+
+def run_storage_server(path: str) -> None:
+    """Create the configured local storage and serve it until interrupted."""
+    from .config import get_server_config
+    from .sample_data import seed_sample_tasks
+    from .storage import create_storage
+    
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+    
+    # Shut down cleanly when the parent terminates us
+    signal.signal(signal.SIGTERM, stop)
+    
+    config = get_server_config()
+    storage = create_storage(config)
+    if config.seed_sample_data:
+        seed_sample_tasks(storage)
+    
+    with StorageServer(path, storage) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            close = getattr(storage, "close", None)
+            if close is not None:
+                close()
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class RemoteTaskStorage:
+    """
+    TaskStore client for a StorageServer.
+    
+    Each thread keeps its own persistent connection, so calls pay only for
+    a round trip on the local socket.
+    """
+    
+    def __init__(self, path: str):
+        """Create a client for the storage server listening on path."""
+        self._path = path
+        self._local = threading.local()
+    
+    def _stream(self) -> BinaryIO:
+        """Return this thread's connection, opening it if needed."""
+        stream = getattr(self._local, "stream", None)
+        if stream is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self._path)
+            stream = sock.makefile("rwb")
+            self._local.sock = sock
+            self._local.stream = stream
+        return stream
+    
+    def _disconnect(self) -> None:
+        """Drop this thread's connection after a failure."""
+        stream = getattr(self._local, "stream", None)
+        if stream is not None:
+            try:
+                stream.close()
+                self._local.sock.close()
+            except OSError:
+                pass
+        self._local.stream = None
+    
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Execute a storage method on the server."""
+        try:
+            stream = self._stream()
+            _send(stream, {"method": method, "args": _encode(args), "kwargs": _encode(kwargs)})
+            response = _receive(stream)
+        except OSError:
+            self._disconnect()
+            raise
+        if response is None:
+            self._disconnect()
+            raise RemoteStorageError("Storage server closed the connection")
+        if "error" in response:
+            raise RemoteStorageError(f"{response['type']}: {response['error']}")
+        return _decode(response["result"])
+    
+    def close(self) -> None:
+        """Close this thread's connection."""
+        self._disconnect()
+    
+    def create_task(self, task_data: TaskCreate) -> Task:
+        """Create a new task."""
+        return self._call("create_task", task_data)
+    
+    def create_tasks(self, tasks_data: List[TaskCreate]) -> List[Task]:
+        """Create several tasks in one call."""
+        return self._call("create_tasks", tasks_data)
+    
+    def get_task(self, task_id: int) -> Optional[Task]:
+        """Get a task by ID."""
+        return self._call("get_task", task_id)
+    
+    def get_all_tasks(self) -> List[Task]:
+        """Get all tasks."""
+        return self._call("get_all_tasks")
+    
+    def update_task(self, task_id: int, task_update: TaskUpdate) -> Optional[Task]:
+        """Update an existing task."""
+        return self._call("update_task", task_id, task_update)
+    
+    def update_tasks(self, updates: List[TaskBulkUpdate]) -> List[Optional[Task]]:
+        """Update several tasks in one call."""
+        return self._call("update_tasks", updates)
+    
+    def delete_task(self, task_id: int) -> bool:
+        """Delete a task by ID."""
+        return self._call("delete_task", task_id)
+    
+    def delete_tasks(self, task_ids: List[int]) -> List[bool]:
+        """Delete several tasks in one call."""
+        return self._call("delete_tasks", task_ids)
+    
+    def search_tasks(
+        self,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> List[Task]:
+        """Search tasks by various criteria."""
+        return self._call(
+            "search_tasks",
+            assignee=assignee,
+            status=status,
+            title_contains=title_contains,
+            due_after=due_after,
+            due_before=due_before
+        )
+    
+    def get_tasks_page(
+        self,
+        limit: int,
+        after_id: Optional[int] = None,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Tuple[List[Task], Optional[int]]:
+        """Get up to ``limit`` tasks with an id greater than ``after_id``, plus the id to resume after."""
+        page, next_after = self._call(
+            "get_tasks_page",
+            limit,
+            after_id=after_id,
+            assignee=assignee,
+            status=status,
+            title_contains=title_contains,
+            due_after=due_after,
+            due_before=due_before
+        )
+        return page, next_after
+    
+    def get_tasks_page_by_due_date(
+        self,
+        limit: int,
+        after: Optional[DueCursor] = None,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        open_only: bool = False
+    ) -> Tuple[List[Task], Optional[DueCursor]]:
+        """Get up to ``limit`` tasks in due date order after ``after``, plus the position to resume after."""
+        page, next_after = self._call(
+            "get_tasks_page_by_due_date",
+            limit,
+            after=after,
+            assignee=assignee,
+            status=status,
+            title_contains=title_contains,
+            due_after=due_after,
+            due_before=due_before,
+            open_only=open_only
+        )
+        # JSON turns the position tuple into a list
+        return page, tuple(next_after) if next_after is not None else None
+    
+    def iter_tasks(
+        self,
+        assignee: Optional[str] = None,
+        status: Optional[str] = None,
+        title_contains: Optional[str] = None,
+        batch_size: int = 1000,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None
+    ) -> Iterator[Task]:
+        """Iterate over matching tasks in id order, one page per call."""
+        after_id = None
+        while True:
+            page, after_id = self.get_tasks_page(
+                batch_size,
+                after_id=after_id,
+                assignee=assignee,
+                status=status,
+                title_contains=title_contains,
+                due_after=due_after,
+                due_before=due_before
+            )
+            yield from page
+            if after_id is None:
+                return
+    
+    def get_task_count(self) -> int:
+        """Get the total number of tasks."""
+        return self._call("get_task_count")
+    
+    def count_by_status(self) -> Dict[str, int]:
+        """Get the number of tasks with each status."""
+        return self._call("count_by_status")
+    
+    def get_stats(self, now: datetime) -> TaskStats:
+        """Get task counts by status and assignee, and the number of tasks overdue at now."""
+        return self._call("get_stats", now)
+    
+    def clear_all_tasks(self) -> int:
+        """Clear all tasks and return the count of deleted tasks."""
+        return self._call("clear_all_tasks")
@@ -0,0 +1,408 @@
+"""
+MCP server exposing the task storage as tools.
+
+Speaks JSON-RPC 2.0 over stdio, one message per line, as the Model Context
+Protocol's stdio transport defines. Tools call the task storage directly
+in this process, so a tool call costs no HTTP request and no extra
+serialization beyond the JSON-RPC message itself.
+
+Agent loops that make many calls can cut round trips further by sending
+a JSON-RPC batch (an array of requests) or by using the batch tool, which
+runs several tool calls in one request. search_tasks returns one page at a
+time with a cursor for the next.
+
+Run from the repository root:
+    
+    python -m src.mcp_server
+
+The storage backend and its settings come from the same environment
+variables as the HTTP server.
+"""
+
+import json
+import sys
+import traceback
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Type
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from src.dummy_server.config import ServerConfig, get_server_config
+from src.dummy_server.models import Task, TaskBulkDelete, TaskBulkUpdate, TaskCreate, TaskStatus, TaskUpdate
+from src.dummy_server.pagination import decode_cursor, decode_due_cursor, encode_cursor, encode_due_cursor
+from src.dummy_server.storage import TaskStore, create_storage
+
+# Protocol revisions this server implements, newest first
+PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")
+
+SERVER_INFO = {"name": "dummy-task-server", "version": "1.0.0"}
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class ToolError(Exception):
+    """A tool call that failed; reported to the client as a tool result with isError set."""
+
+
+class RPCError(Exception):
+    """A request that failed at the JSON-RPC level."""
+    
+    def __init__(self, code: int, message: str):
+        """Create an error with a JSON-RPC error code."""
+        super().__init__(message)
+        self.code = code
+
+
+class TaskId(BaseModel):
+    """Arguments of the tools that act on one task."""
+    model_config = ConfigDict(extra="forbid")
+    id: int = Field(..., description="ID of the task")
+
+
+class SearchArguments(BaseModel):
+    """Arguments of search_tasks."""
+    model_config = ConfigDict(extra="forbid")
+    assignee: Optional[str] = Field(None, description="Filter by assignee (partial match, case-insensitive)")
+    status: Optional[TaskStatus] = Field(None, description="Filter by status")
+    title_contains: Optional[str] = Field(None, description="Filter by title content (case-insensitive)")
+    due_after: Optional[datetime] = Field(None, description="Only tasks due at or after this time")
+    due_before: Optional[datetime] = Field(None, description="Only tasks due before this time")
+    sort: Literal["id", "due_date"] = Field("id", description="Order by ID or by due date, undated tasks last")
+    limit: int = Field(50, description="Maximum number of tasks to return", ge=1)
+    cursor: Optional[str] = Field(None, description="next_cursor from the previous page")
+
+
+class BulkCreateArguments(BaseModel):
+    """Arguments of create_tasks."""
+    model_config = ConfigDict(extra="forbid")
+    tasks: List[TaskCreate] = Field(..., description="Tasks to create")
+
+
+class BulkUpdateArguments(BaseModel):
+    """Arguments of update_tasks."""
+    model_config = ConfigDict(extra="forbid")
+    updates: List[TaskBulkUpdate] = Field(..., description="Task IDs with the fields to change")
+
+
+class ToolCall(BaseModel):
+    """One call inside a batch."""
+    name: str = Field(..., description="Tool name")
+    arguments: Dict[str, Any] = Field(default_factory=dict, description="Tool arguments")
+
+
+class BatchArguments(BaseModel):
+    """Arguments of the batch tool."""
+    model_config = ConfigDict(extra="forbid")
+    calls: List[ToolCall] = Field(..., description="Tool calls to run in order")
+
+
+class NoArguments(BaseModel):
+    """Arguments of tools that take none."""
+    model_config = ConfigDict(extra="forbid")
+
+
+def _task(task: Task) -> Dict[str, Any]:
+    """Convert a task to JSON-compatible values."""
+    return task.model_dump(mode="json")
+
+
+def _validation_message(error: ValidationError) -> str:
+    """Summarize a validation error in one line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'arguments'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+class MCPServer:
+    """Handles MCP messages with tools backed by a task storage."""
+    
+    def __init__(self, storage: TaskStore, config: ServerConfig):
+        """Create a server for a storage; the configuration sets page and bulk limits."""
+        self.storage = storage
+        self.config = config
+        self.protocol_version = PROTOCOL_VERSIONS[0]
+        # name -> (description, argument model, handler)
+        self._tools: Dict[str, Tuple[str, Type[BaseModel], Callable[[Any], Dict[str, Any]]]] = {
+            "create_task": ("Create a task and return it.", TaskCreate, self._create_task),
+            "get_task": ("Get a task by ID.", TaskId, self._get_task),
+            "update_task": (
+                "Change the given fields of a task and return it.", TaskBulkUpdate, self._update_task
+            ),
+            "delete_task": ("Delete a task by ID.", TaskId, self._delete_task),
+            "search_tasks": (
+                "List tasks matching optional filters, one page at a time. Pass next_cursor "
+                "back as cursor to get the next page; it is null on the last page.",
+                SearchArguments,
+                self._search_tasks
+            ),
+            "create_tasks": (
+                "Create several tasks at once and return their IDs in order.", BulkCreateArguments, self._create_tasks
+            ),
+            "update_tasks": (
+                "Update several tasks at once. Missing tasks are reported per item.",
+                BulkUpdateArguments,
+                self._update_tasks
+            ),
+            "delete_tasks": (
+                "Delete several tasks at once. Missing tasks are reported per item.", TaskBulkDelete, self._delete_tasks
+            ),
+            "get_task_stats": (
+                "Count tasks by status and assignee, and overdue tasks.", NoArguments, self._get_task_stats
+            ),
+            "batch": (
+                "Run several tool calls in one request, in order, and return each result. "
+                "A failing call does not stop the others.",
+                BatchArguments,
+                self._batch
+            ),
+        }
+    
+    def tool_definitions(self) -> List[Dict[str, Any]]:
+        """Return the tools as listed by tools/list."""
+        return [
+            {"name": name, "description": description, "inputSchema": model.model_json_schema()}
+            for name, (description, model, _) in self._tools.items()
+        ]
+    
+    def call_tool(self, name: str, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run a tool and return its structured result.
+        
+        Raises ToolError if it fails, including when the storage raises, so
+        a failing backend is reported as a tool error instead of ending the
+        session. The traceback goes to stderr, which MCP clients treat as
+        the server's log.
+        """
+        tool = self._tools.get(name)
+        if tool is None:
+            raise ToolError(f"Unknown tool: {name!r}")
+        _, model, handler = tool
+        try:
+            parsed = model.model_validate(arguments or {})
+        except ValidationError as e:
+            raise ToolError(f"Invalid arguments: {_validation_message(e)}")
+        try:
+            return handler(parsed)
+        except ToolError:
+            raise
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            raise ToolError(f"{name} failed: {type(e).__name__}: {e}")
+    
+    def _tool_result(self, name: str, arguments: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a tool and format the outcome as a tools/call result."""
+        try:
+            structured = self.call_tool(name, arguments)
+        except ToolError as e:
+            return {"content": [{"type": "text", "text": str(e)}], "isError": True}
+        text = json.dumps(structured, separators=(",", ":"))
+        return {"content": [{"type": "text", "text": text}], "structuredContent": structured, "isError": False}
+    
+    # Tools
+    
+    def _create_task(self, task: TaskCreate) -> Dict[str, Any]:
+        """Create one task."""
+        return _task(self.storage.create_task(task))
+    
+    def _get_task(self, args: TaskId) -> Dict[str, Any]:
+        """Get one task."""
+        task = self.storage.get_task(args.id)
+        if task is None:
+            raise ToolError(f"Task with ID {args.id} not found")
+        return _task(task)
+    
+    def _update_task(self, update: TaskBulkUpdate) -> Dict[str, Any]:
+        """Update one task."""
+        changes = TaskUpdate.model_validate(update.model_dump(exclude_unset=True, exclude={"id"}))
+        task = self.storage.update_task(update.id, changes)
+        if task is None:
+            raise ToolError(f"Task with ID {update.id} not found")
+        return _task(task)
+    
+    def _delete_task(self, args: TaskId) -> Dict[str, Any]:
+        """Delete one task."""
+        if not self.storage.delete_task(args.id):
+            raise ToolError(f"Task with ID {args.id} not found")
+        return {"id": args.id, "deleted": True}
+    
+    def _search_tasks(self, args: SearchArguments) -> Dict[str, Any]:
+        """Return one page of matching tasks and the cursor of the next."""
+        if args.limit > self.config.max_page_size:
+            raise ToolError(f"limit must be at most {self.config.max_page_size}")
+        filters: Dict[str, Any] = {
+            "assignee": args.assignee,
+            "status": args.status.value if args.status else None,
+            "title_contains": args.title_contains,
+            "due_after": args.due_after,
+            "due_before": args.due_before
+        }
+        try:
+            if args.sort == "due_date":
+                after = decode_due_cursor(args.cursor) if args.cursor is not None else None
+                page, next_after = self.storage.get_tasks_page_by_due_date(args.limit, after=after, **filters)
+                next_cursor = encode_due_cursor(next_after) if next_after is not None else None
+            else:
+                after_id = decode_cursor(args.cursor) if args.cursor is not None else None
+                page, next_id = self.storage.get_tasks_page(limit=args.limit, after_id=after_id, **filters)
+                next_cursor = encode_cursor(next_id) if next_id is not None else None
+        except ValueError as e:
+            raise ToolError(str(e))
+        return {"tasks": [_task(task) for task in page], "next_cursor": next_cursor}
+    
+    def _check_bulk_size(self, count: int) -> None:
+        """Reject bulk calls larger than the configured limit."""
+        if count > self.config.max_bulk_size:
+            raise ToolError(f"At most {self.config.max_bulk_size} items can be processed at once")
+    
+    def _create_tasks(self, args: BulkCreateArguments) -> Dict[str, Any]:
+        """Create several tasks."""
+        self._check_bulk_size(len(args.tasks))
+        created = self.storage.create_tasks(args.tasks)
+        return {"ids": [task.id for task in created]}
+    
+    def _update_tasks(self, args: BulkUpdateArguments) -> Dict[str, Any]:
+        """Update several tasks."""
+        self._check_bulk_size(len(args.updates))
+        updated = self.storage.update_tasks(args.updates)
+        return {
+            "updated": [item.id for item, task in zip(args.updates, updated) if task is not None],
+            "not_found": [item.id for item, task in zip(args.updates, updated) if task is None]
+        }
+    
+    def _delete_tasks(self, args: TaskBulkDelete) -> Dict[str, Any]:
+        """Delete several tasks."""
+        self._check_bulk_size(len(args.ids))
+        deleted = self.storage.delete_tasks(args.ids)
+        return {
+            "deleted": [task_id for task_id, ok in zip(args.ids, deleted) if ok],
+            "not_found": [task_id for task_id, ok in zip(args.ids, deleted) if not ok]
+        }
+    
+    def _get_task_stats(self, args: NoArguments) -> Dict[str, Any]:
+        """Return task statistics."""
+        return self.storage.get_stats(datetime.now(timezone.utc)).model_dump(mode="json")
+    
+    def _batch(self, args: BatchArguments) -> Dict[str, Any]:
+        """Run several tool calls."""
+        results = []
+        for call in args.calls:
+            if call.name == "batch":
+                results.append({"name": call.name, "isError": True, "error": "Batches cannot be nested"})
+                continue
+            try:
+                results.append({"name": call.name, "isError": False, "result": self.call_tool(call.name, call.arguments)})
+            except ToolError as e:
+                results.append({"name": call.name, "isError": True, "error": str(e)})
+        return {"results": results}
+    
+    # JSON-RPC
+    
+    def handle(self, message: Any) -> Optional[Any]:
+        """
+        Handle one decoded JSON-RPC message or batch and return the response.
+        
+        Returns None when nothing is to be sent back, as for notifications.
+        This is the in-process transport: callers embedding the server can
+        pass messages here directly instead of going through stdio.
+        """
+        if isinstance(message, list):
+            if not message:
+                return self._error(None, INVALID_REQUEST, "Empty batch")
+            responses = [response for response in (self._handle_one(item) for item in message) if response is not None]
+            return responses or None
+        return self._handle_one(message)
+    
+    def _handle_one(self, message: Any) -> Optional[Dict[str, Any]]:
+        """Handle a single request or notification."""
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" or not isinstance(message.get("method"), str):
+            return self._error(message.get("id") if isinstance(message, dict) else None, INVALID_REQUEST, "Invalid request")
+        request_id = message.get("id")
+        is_notification = "id" not in message
+        params = message.get("params")
+        try:
+            if params is None:
+                params = {}
+            elif not isinstance(params, dict):
+                raise RPCError(INVALID_PARAMS, "params must be an object")
+            result = self._dispatch(message["method"], params)
+        except RPCError as e:
+            return None if is_notification else self._error(request_id, e.code, str(e))
+        except Exception as e:
+            # Answer and keep serving; one bad message must not end the session
+            traceback.print_exc(file=sys.stderr)
+            return None if is_notification else self._error(request_id, INTERNAL_ERROR, f"Internal error: {e}")
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+    
+    def _dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        """Run a JSON-RPC method and return its result."""
+        if method == "initialize":
+            requested = params.get("protocolVersion")
+            self.protocol_version = requested if requested in PROTOCOL_VERSIONS else PROTOCOL_VERSIONS[0]
+            return {
+                "protocolVersion": self.protocol_version,
+                "capabilities": {"tools": {"listChanged": False}},
+                "serverInfo": SERVER_INFO
+            }
+        if method == "ping" or method.startswith("notifications/"):
+            return {}
+        if method == "tools/list":
+            return {"tools": self.tool_definitions()}
+        if method == "tools/call":
+            name = params.get("name")
+            if not isinstance(name, str):
+                raise RPCError(INVALID_PARAMS, "tools/call needs a tool name")
+            if name not in self._tools:
+                raise RPCError(INVALID_PARAMS, f"Unknown tool: {name!r}")
+            arguments = params.get("arguments")
+            if arguments is not None and not isinstance(arguments, dict):
+                raise RPCError(INVALID_PARAMS, "arguments must be an object")
+            return self._tool_result(name, arguments)
+        raise RPCError(METHOD_NOT_FOUND, f"Method not found: {method}")
+    
+    @staticmethod
+    def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+        """Build a JSON-RPC error response."""
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+    
+    def serve(self, stdin=None, stdout=None) -> None:
+        """Read messages from stdin and write responses to stdout, one per line, until stdin closes."""
+        stdin = stdin or sys.stdin.buffer
+        stdout = stdout or sys.stdout.buffer
+        for line in stdin:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                response: Any = self._error(None, PARSE_ERROR, "Parse error")
+            else:
+                response = self.handle(message)
+            if response is not None:
+                stdout.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                stdout.flush()
+
+
+def main():
+    """Serve the task storage over stdio."""
+    config = get_server_config()
+    storage = create_storage(config)
+    if config.seed_sample_data:
+        from src.dummy_server.sample_data import seed_sample_tasks
+        seed_sample_tasks(storage)
+    try:
+        MCPServer(storage, config).serve()
+    finally:
+        close = getattr(storage, "close", None)
+        if close is not None:
+            close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Tests for admission control.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.dummy_server import server
+from src.dummy_server.admission import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    AdmissionController,
+    AdmissionMiddleware,
+    Overloaded,
+)
+
+
+async def start(controller, priority, admitted, name):
+    """Queue a request as a task that records its name once admitted."""
+    
+    async def wait():
+        """Wait for a slot, then note the admission."""
+        await controller.acquire(priority)
+        admitted.append(name)
+    
+    task = asyncio.ensure_future(wait())
+    await asyncio.sleep(0)
+    return task
+
+
+def test_high_priority_requests_are_admitted_first():
+    """Released slots go to waiting high priority requests first, then to low ones in arrival order."""
+    
+    async def scenario():
+        """Queue two low and one high priority request behind a busy slot."""
+        controller = AdmissionController(1, queue_size=10, queue_timeout=5)
+        admitted = []
+        await controller.acquire(PRIORITY_LOW)
+        tasks = [
+            await start(controller, PRIORITY_LOW, admitted, "low 1"),
+            await start(controller, PRIORITY_LOW, admitted, "low 2"),
+            await start(controller, PRIORITY_HIGH, admitted, "high"),
+        ]
+        assert (controller.queue_depth(PRIORITY_HIGH), controller.queue_depth(PRIORITY_LOW)) == (1, 2)
+        for _ in tasks:
+            controller.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert admitted == ["high", "low 1", "low 2"]
+        assert (controller.in_use, controller.admitted) == (1, 4)
+        controller.release()
+        assert controller.in_use == 0
+    
+    asyncio.run(scenario())
+
+
+def test_full_queue_turns_away_the_newest_low_priority_request():
+    """A high priority request takes the place of the newest low one, and other requests are shed."""
+    
+    async def scenario():
+        """Fill a queue of two with low priority requests, then add more."""
+        controller = AdmissionController(1, queue_size=2, queue_timeout=5)
+        shed = []
+        controller.on_shed = lambda priority, reason: shed.append((priority, reason))
+        admitted = []
+        await controller.acquire(PRIORITY_HIGH)
+        first = await start(controller, PRIORITY_LOW, admitted, "low 1")
+        second = await start(controller, PRIORITY_LOW, admitted, "low 2")
+        with pytest.raises(Overloaded, match="queue_full"):
+            await controller.acquire(PRIORITY_LOW)
+        high = await start(controller, PRIORITY_HIGH, admitted, "high")
+        with pytest.raises(Overloaded, match="queue_full"):
+            await second
+        assert shed == [("low", "queue_full"), ("low", "queue_full")]
+        
+        controller.release()
+        await high
+        controller.release()
+        await first
+        assert admitted == ["high", "low 1"]
+        
+        await start(controller, PRIORITY_HIGH, admitted, "high 2")
+        await start(controller, PRIORITY_HIGH, admitted, "high 3")
+        with pytest.raises(Overloaded, match="queue_full"):
+            await controller.acquire(PRIORITY_HIGH)
+        assert controller.shed == {("low", "queue_full"): 2, ("high", "queue_full"): 1}
+    
+    asyncio.run(scenario())
+
+
+def test_waits_time_out_and_cancelled_waits_leave_the_queue():
+    """A request waiting longer than the timeout is shed, and a cancelled one gives up its place."""
+    
+    async def scenario():
+        """Wait behind a slot that is never released."""
+        controller = AdmissionController(1, queue_size=10, queue_timeout=0.05)
+        await controller.acquire(PRIORITY_LOW)
+        with pytest.raises(Overloaded, match="timeout"):
+            await controller.acquire(PRIORITY_HIGH)
+        cancelled = await start(controller, PRIORITY_LOW, [], "cancelled")
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert controller.queue_depth(PRIORITY_HIGH) == controller.queue_depth(PRIORITY_LOW) == 0
+        assert controller.shed == {("high", "timeout"): 1}
+        assert controller.retry_after() == 1
+        controller.release()
+        assert controller.in_use == 0
+    
+    asyncio.run(scenario())
+
+
+def test_middleware_answers_503_with_retry_after():
+    """Requests beyond the limit and the queue are answered 503 without running the app."""
+    
+    async def scenario():
+        """Send two requests to an app that blocks, with no room to queue."""
+        release = asyncio.Event()
+        calls = []
+        
+        async def app(scope, receive, send):
+            """Block until released."""
+            calls.append(scope["path"])
+            await release.wait()
+        
+        middleware = AdmissionMiddleware(app, AdmissionController(1, queue_size=0, queue_timeout=2.5), lambda scope: PRIORITY_LOW)
+        messages = []
+        
+        async def send(message):
+            """Collect the response."""
+            messages.append(message)
+        
+        scope = {"type": "http", "method": "GET", "path": "/tasks"}
+        busy = asyncio.ensure_future(middleware(scope, None, send))
+        await asyncio.sleep(0)
+        await middleware(scope, None, send)
+        release.set()
+        await busy
+        assert calls == ["/tasks"]
+        assert messages[0]["status"] == 503
+        assert (b"retry-after", b"3") in messages[0]["headers"]
+        assert json.loads(messages[1]["body"])["reason"] == "queue_full"
+        assert middleware.controller.in_use == 0
+    
+    asyncio.run(scenario())
+
+
+def test_request_priorities():
+    """Cheap reads are high priority, list scans and writes low, and streams are not limited."""
+    
+    def priority(method, path):
+        """Return the server's priority for a request."""
+        return server._admission_priority({"method": method, "path": path})
+    
+    assert priority("GET", "/health") == PRIORITY_HIGH
+    assert priority("GET", "/tasks/12") == PRIORITY_HIGH
+    assert priority("GET", "/tasks") == PRIORITY_LOW
+    assert priority("GET", "/tasks/export") == PRIORITY_LOW
+    assert priority("PUT", "/tasks/12") == PRIORITY_LOW
+    assert priority("GET", "/tasks/changes") is None
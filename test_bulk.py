@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk create, update and delete endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Run the app on an empty in-memory storage."""
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def test_bulk_create_update_and_delete(client):
+    """Each bulk result lists the items in request order, with missing tasks as failures."""
+    response = client.post("/tasks/bulk", json=[{"title": "First"}, {"title": "Second", "status": "done"}])
+    assert response.status_code == 201
+    result = response.json()
+    assert (result["succeeded"], result["failed"]) == (2, 0)
+    first, second = [item["id"] for item in result["results"]]
+    
+    result = client.patch("/tasks/bulk", json=[
+        {"id": second, "status": "cancelled"},
+        {"id": 999, "title": "Missing"},
+        {"id": first, "assignee": "ann"},
+    ]).json()
+    assert (result["succeeded"], result["failed"]) == (2, 1)
+    assert result["results"][1] == {"index": 1, "id": 999, "success": False, "error": "Task with ID 999 not found"}
+    assert client.get(f"/tasks/{second}").json()["status"] == "cancelled"
+    assert client.get(f"/tasks/{first}").json()["assignee"] == "ann"
+    
+    result = client.request("DELETE", "/tasks/bulk", json={"ids": [first, 999, second]}).json()
+    assert [item["success"] for item in result["results"]] == [True, False, True]
+    assert client.get("/tasks").json() == []
+
+
+def test_invalid_batches_are_rejected_whole(client):
+    """An invalid item or an oversized batch gives 422 and stores nothing."""
+    response = client.post("/tasks/bulk", json=[{"title": "Valid"}, {"title": ""}])
+    assert response.status_code == 422
+    too_many = server.config.max_bulk_size + 1
+    assert client.post("/tasks/bulk", json=[{"title": "Task"}] * too_many).status_code == 422
+    assert client.request("DELETE", "/tasks/bulk", json={"ids": list(range(too_many))}).status_code == 422
+    assert client.get("/tasks").json() == []
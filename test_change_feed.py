@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the task change feed.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+from src.dummy_server.change_feed import ChangeFeed
+from src.dummy_server.models import TaskCreate, TaskUpdate
+from src.dummy_server.storage import TaskStorage
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Run the app on an empty in-memory storage with a feed of five changes."""
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    monkeypatch.setattr(server.config, "change_feed_size", 5)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def poll(client, **params):
+    """Return the JSON of a change poll that does not wait."""
+    response = client.get("/tasks/changes", params=dict(poll=True, timeout=0, **params))
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_events_are_numbered_and_kept_in_a_ring():
+    """Events carry the task after the change, and only the last capacity are readable."""
+    storage = TaskStorage()
+    feed = ChangeFeed(capacity=3)
+    assert feed.attach(storage)
+    task = storage.create_task(TaskCreate(title="First"))
+    storage.update_task(task.id, TaskUpdate(status="done"))
+    data = [json.loads(event.data) for event in feed.events_after(0)]
+    assert [(event["seq"], event["type"], event["task"]["status"]) for event in data] == [(1, "create", "todo"), (2, "update", "done")]
+    
+    storage.delete_task(task.id)
+    storage.create_task(TaskCreate(title="Second"))
+    storage.clear_all_tasks()
+    assert (feed.first_seq, feed.last_seq) == (3, 5)
+    assert [event.kind for event in feed.events_after(2)] == ["delete", "create", "clear"]
+    assert [event.seq for event in feed.events_after(2, limit=2)] == [3, 4]
+    assert json.loads(feed.events_after(4)[0].data)["task"] is None
+    assert feed.events_after(4)[0].to_sse() == b'id: 5\nevent: clear\ndata: {"seq":5,"type":"clear","task_id":null,"task":null}\n\n'
+    
+    assert feed.position(None) == (5, False)
+    assert feed.position("2") == (2, False)
+    assert feed.position("1") == (5, True)
+    assert feed.position("6") == (5, True)
+    assert feed.position("latest") == (5, True)
+    assert json.loads(feed.resync_event().data) == {"seq": 5, "type": "resync"}
+
+
+def test_waiting_readers_are_woken_by_changes_from_other_threads():
+    """A reader waiting for a change returns when another thread makes one, and False on timeout."""
+    storage = TaskStorage()
+    feed = ChangeFeed()
+    feed.attach(storage)
+    
+    async def wait_for_change():
+        """Wait while another thread creates a task."""
+        assert not await feed.wait(0, 0.01)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, threading.Thread(target=storage.create_task, args=(TaskCreate(title="Task"),)).start)
+        return await feed.wait(0, 5)
+    
+    assert asyncio.run(wait_for_change())
+    assert feed.last_seq == 1
+
+
+def test_polling_resumes_from_the_last_seen_change(client):
+    """Polls return the changes after a position, and a position that has been overwritten asks for a resync."""
+    task_id = client.post("/tasks", json={"title": "Task"}).json()["id"]
+    response = client.get("/tasks")
+    seq = int(response.headers["X-Change-Seq"])
+    assert seq == 1
+    assert poll(client, after=seq) == {"resync": False, "last_seq": 1, "events": []}
+    
+    client.put(f"/tasks/{task_id}", json={"title": "Renamed"})
+    client.delete(f"/tasks/{task_id}")
+    result = poll(client, after=seq)
+    assert result["last_seq"] == 3
+    assert [(event["type"], event["task_id"]) for event in result["events"]] == [("update", task_id), ("delete", task_id)]
+    assert result["events"][0]["task"]["title"] == "Renamed"
+    
+    client.post("/tasks/bulk", json=[{"title": f"Task {i}"} for i in range(5)])
+    assert poll(client, after=seq) == {"resync": True, "last_seq": 8, "events": []}
+    assert len(poll(client, after=3)["events"]) == 5
+    assert poll(client)["events"] == []
+
+
+def test_stream_sends_events_after_last_event_id(client, monkeypatch):
+    """The event stream starts after Last-Event-ID and tells clients that fell behind to resync."""
+    monkeypatch.setattr(server, "CHANGE_STREAM_LIFETIME", 0.2)
+    monkeypatch.setattr(server, "CHANGE_STREAM_KEEPALIVE", 0.05)
+    for title in ("First", "Second"):
+        client.post("/tasks", json={"title": title})
+    response = client.get("/tasks/changes", headers={"Last-Event-ID": "1"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("retry: 1000\n\n")
+    assert "id: 2\nevent: create\n" in response.text
+    assert "id: 1\n" not in response.text
+    assert ": keep-alive\n\n" in response.text
+    
+    client.post("/tasks/bulk", json=[{"title": f"Task {i}"} for i in range(5)])
+    response = client.get("/tasks/changes", headers={"Last-Event-ID": "1"})
+    assert "id: 7\nevent: resync\n" in response.text
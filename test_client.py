@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled task API client.
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.dummy_server.client import AsyncTaskClient, TaskAPIError, TaskClient
+
+
+class TaskHandler(BaseHTTPRequestHandler):
+    """Answers GET /tasks/<id> with the task's id, keeping connections alive."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        """Return a task holding the requested id."""
+        body = json.dumps({"id": int(self.path.rsplit("/", 1)[1])}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        """Keep the test output quiet."""
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next status of the server's script, recording the requests."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def _answer(self):
+        """Send the next scripted status, with a Retry-After of 0 on 503."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.seen.append(self.command)
+        code = self.server.script.pop(0) if self.server.script else 200
+        body = json.dumps({"detail": f"status {code}", "message": "ok"}).encode()
+        self.send_response(code)
+        if code == 503:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    do_GET = do_POST = do_DELETE = _answer
+    
+    def log_message(self, format, *args):
+        """Keep the test output quiet."""
+
+
+def serve(handler):
+    """Serve a handler on a free port in a background thread."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def base_url():
+    """Serve TaskHandler on a free port and yield its URL."""
+    server = serve(TaskHandler)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def scripted():
+    """Serve ScriptedHandler and yield a client for it with the server."""
+    server = serve(ScriptedHandler)
+    server.script = []
+    server.seen = []
+    client = TaskClient(f"http://127.0.0.1:{server.server_address[1]}", retries=2, backoff=0)
+    yield client, server
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_each_thread_has_its_own_session(base_url):
+    """Threads never share a session, and map() reuses its threads' sessions."""
+    client = TaskClient(base_url, max_workers=4)
+    main = client.session
+    assert client.session is main
+    
+    for _ in range(5):
+        sessions = client.map(lambda _: client.session, range(20))
+        assert main not in sessions
+    # The main thread's and one per map() thread, however often map() runs
+    assert len(client._sessions) <= 1 + 4
+    
+    assert [task["id"] for task in client.get_tasks(range(50))] == list(range(50))
+    client.close()
+    assert client._sessions == []
+
+
+def test_async_client_calls_run_concurrently(base_url):
+    """Concurrent coroutines get their own results, each over a thread's own session."""
+    async def fetch():
+        async with AsyncTaskClient(base_url, max_concurrency=8) as client:
+            tasks = await client.get_tasks(range(200))
+            return tasks, len(client.client._sessions)
+    
+    tasks, sessions = asyncio.run(fetch())
+    assert [task["id"] for task in tasks] == list(range(200))
+    assert 1 <= sessions <= 8
+
+
+def test_failed_requests_are_retried_when_safe(scripted):
+    """Idempotent requests are retried on any retryable status, others only when the server turned them away."""
+    client, server = scripted
+    server.script = [503, 502]
+    assert client.info()["message"] == "ok"
+    assert server.seen == ["GET"] * 3
+    
+    server.script, server.seen = [503, 503, 503], []
+    with pytest.raises(TaskAPIError) as error:
+        client.info()
+    assert error.value.status_code == 503
+    assert len(server.seen) == 3
+    
+    server.script, server.seen = [503, 201], []
+    assert client.create_task({"title": "Task"})["message"] == "ok"
+    server.script, server.seen = [502], []
+    with pytest.raises(TaskAPIError):
+        client.create_task({"title": "Task"})
+    assert server.seen == ["POST"]
+
+
+def test_retried_delete_that_finds_the_task_gone_succeeds(scripted):
+    """A DELETE getting 404 after an attempt that may have deleted the task counts as deleted."""
+    client, server = scripted
+    server.script = [502, 404]
+    assert client.delete_task(7) == {"message": "Task 7 deleted successfully"}
+    server.script = [503, 404]
+    with pytest.raises(TaskAPIError):
+        client.delete_task(7)
+    server.script = [404]
+    with pytest.raises(TaskAPIError):
+        client.delete_task(7)
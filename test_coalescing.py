@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for single-flight coalescing of identical GET /tasks queries.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+from src.dummy_server.coalescing import SingleFlight
+from src.dummy_server.models import TaskCreate
+from src.dummy_server.storage import TaskStorage
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Run the app on an empty SQLite database, whose queries run in the thread pool."""
+    monkeypatch.setattr(server.config, "storage_backend", "sqlite")
+    monkeypatch.setattr(server.config, "sqlite_path", str(tmp_path / "tasks.db"))
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    monkeypatch.setattr(server.query_flights, "window", server.query_flights.window)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+class SlowQuery:
+    """Wraps a storage method so each call waits until released, counting the calls."""
+    
+    def __init__(self, method):
+        """Wrap method."""
+        self.method = method
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+    
+    def __call__(self, *args, **kwargs):
+        """Count the call and wait for release before running it."""
+        self.calls += 1
+        self.entered.set()
+        assert self.release.wait(5)
+        return self.method(*args, **kwargs)
+
+
+def get_in_thread(test_client, url, responses):
+    """Start a GET request in a new thread that appends its response."""
+    thread = threading.Thread(target=lambda: responses.append(test_client.get(url)))
+    thread.start()
+    return thread
+
+
+def wait_for(condition, timeout=5.0):
+    """Wait until condition() is true."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_concurrent_identical_queries_share_one_storage_call(client, monkeypatch):
+    """A query arriving while an identical one runs waits for it instead of querying again."""
+    client.post("/tasks", json={"title": "Shared"})
+    query = SlowQuery(server.task_storage.get_all_tasks)
+    monkeypatch.setattr(server.task_storage, "get_all_tasks", query)
+    shared = server.query_flights.shared
+    responses = []
+    
+    first = get_in_thread(client, "/tasks", responses)
+    assert query.entered.wait(5)
+    second = get_in_thread(client, "/tasks", responses)
+    wait_for(lambda: server.query_flights.shared > shared)
+    query.release.set()
+    first.join()
+    second.join()
+    assert query.calls == 1
+    assert [[task["title"] for task in response.json()] for response in responses] == [["Shared"], ["Shared"]]
+    assert responses[0].content == responses[1].content
+
+
+def test_query_started_before_a_write_is_not_shared_after_it(client, monkeypatch):
+    """A request made after a write does not join a query that started before the write."""
+    query = SlowQuery(server.task_storage.get_all_tasks)
+    monkeypatch.setattr(server.task_storage, "get_all_tasks", query)
+    shared = server.query_flights.shared
+    before, after = [], []
+    
+    first = get_in_thread(client, "/tasks", before)
+    assert query.entered.wait(5)
+    assert client.post("/tasks", json={"title": "Written"}).status_code == 201
+    second = get_in_thread(client, "/tasks", after)
+    wait_for(lambda: query.calls == 2 or server.query_flights.shared > shared)
+    query.release.set()
+    first.join()
+    second.join()
+    assert query.calls == 2
+    assert [task["title"] for task in after[0].json()] == ["Written"]
+
+
+def test_results_are_kept_for_the_window_until_the_storage_changes():
+    """A finished result is reused within the window, and a storage change or the end of the window drops it."""
+    storage = TaskStorage()
+    flights = SingleFlight(window=0.05)
+    assert flights.attach(storage)
+    calls = []
+    
+    async def compute():
+        """Count the call and return it."""
+        calls.append(len(calls))
+        return len(calls)
+    
+    async def scenario():
+        """Run the same key around a change and after the window."""
+        results = [await flights.run("key", compute), await flights.run("key", compute)]
+        storage.create_task(TaskCreate(title="Change"))
+        results.append(await flights.run("key", compute))
+        await asyncio.sleep(0.1)
+        results.append(await flights.run("key", compute))
+        return results
+    
+    assert asyncio.run(scenario()) == [1, 1, 2, 3]
+    assert flights.stats()["shared"] == 1
+
+
+def test_failures_are_shared_but_not_kept():
+    """Callers waiting on a failing computation get its error, and the next caller computes again."""
+    flights = SingleFlight(window=10)
+    
+    async def scenario():
+        """Fail one shared computation, then succeed."""
+        started = asyncio.Event()
+        
+        async def fail():
+            """Fail once the second caller is waiting."""
+            started.set()
+            await asyncio.sleep(0.01)
+            raise ValueError("storage failed")
+        
+        async def succeed():
+            """Return a result."""
+            return "ok"
+        
+        first = asyncio.ensure_future(flights.run("key", fail))
+        await started.wait()
+        second = asyncio.ensure_future(flights.run("key", succeed))
+        errors = await asyncio.gather(first, second, return_exceptions=True)
+        assert [str(error) for error in errors] == ["storage failed", "storage failed"]
+        return await flights.run("key", succeed)
+    
+    assert asyncio.run(scenario()) == "ok"
+    assert flights.stats() == {"computed": 2, "shared": 1, "entries": 1}
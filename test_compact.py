@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the compact column-oriented task table.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from src.dummy_server.compact import CompactTaskTable
+from src.dummy_server.models import Task, TaskStatus
+
+
+def make_task(task_id, **fields):
+    """Build a validated task with the given id."""
+    now = datetime(2025, 1, 21, 10, 0, 0, 123456)
+    return Task(**{"id": task_id, "title": f"Task {task_id}", "created_at": now, "updated_at": now, **fields})
+
+
+def test_tasks_round_trip():
+    """Every field, including naive, aware and missing datetimes, reads back unchanged."""
+    table = CompactTaskTable()
+    tasks = [
+        make_task(1, description="Docs", assignee="ann@example.com", status=TaskStatus.DONE,
+                  due_date=datetime(2025, 1, 30, 23, 59, 59)),
+        make_task(2, due_date=datetime(2025, 2, 1, 8, tzinfo=timezone(timedelta(hours=-5)))),
+        make_task(3, due_date=datetime(1960, 5, 4, tzinfo=timezone.utc)),
+    ]
+    for task in tasks:
+        table[task.id] = task
+    assert [table[task.id] for task in tasks] == tasks
+    assert table.values() == tasks
+    assert table.title_of(2) == "Task 2"
+    assert table.get(4) is None
+
+
+def test_deleted_rows_are_reused():
+    """A new task takes a deleted task's row and none of its old values."""
+    table = CompactTaskTable()
+    table[1] = make_task(1, assignee="ann", description="old")
+    table[2] = make_task(2)
+    del table[1]
+    table[3] = make_task(3)
+    assert len(table._titles) == 2
+    assert list(table) == [2, 3]
+    assert table[3] == make_task(3)
+    assert 1 not in table
+
+
+def test_copy_is_independent():
+    """Changes after copy() do not show in the copy, and the reverse."""
+    table = CompactTaskTable()
+    for task_id in range(1, 4):
+        table[task_id] = make_task(task_id)
+    copy = table.copy()
+    del table[1]
+    table[4] = make_task(4, title="Reuses row one")
+    table[2] = make_task(2, status=TaskStatus.CANCELLED)
+    assert copy.values() == [make_task(1), make_task(2), make_task(3)]
+    copy[5] = make_task(5)
+    assert 5 not in table
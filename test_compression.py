@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for response compression.
+"""
+
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+from src.dummy_server.compression import ENCODINGS, CompressedBodyCache, choose_encoding, compress, stream_compressor
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Run the app on an empty in-memory storage."""
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def decompress(data, encoding):
+    """Decompress a body with a coding from ENCODINGS."""
+    if encoding == "gzip":
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+    import zstandard
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+def test_encoding_is_negotiated_from_accept_encoding():
+    """The accepted coding with the highest quality wins, and q=0 or unknown codings are never chosen."""
+    assert choose_encoding(None) is None
+    assert choose_encoding("") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("br, GZIP;q=0.5") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("gzip;q=oops") is None
+    assert choose_encoding("*") == ENCODINGS[0]
+    assert choose_encoding("*;q=0, gzip") == "gzip"
+    assert choose_encoding("gzip;q=1, zstd;q=0.1") == "gzip"
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_whole_and_streamed_bodies_round_trip(encoding):
+    """Compressed bodies decompress to the original, whether compressed at once or in chunks."""
+    data = b'{"id":1,"title":"Task"}\n' * 1000
+    assert decompress(compress(data, encoding), encoding) == data
+    compressor = stream_compressor(encoding)
+    streamed = b"".join(compressor.compress(data[start:start + 4096]) for start in range(0, len(data), 4096))
+    assert decompress(streamed + compressor.flush(), encoding) == data
+    with pytest.raises(ValueError):
+        compress(data, "br")
+
+
+def test_cache_is_bounded_by_size():
+    """The least recently used bodies are evicted once the cache holds more than its byte limit."""
+    cache = CompressedBodyCache(max_bytes=10)
+    cache.put('"a"', b"1234")
+    cache.put('"b"', b"1234")
+    assert cache.get('"a"') == b"1234"
+    cache.put('"c"', b"1234")
+    assert cache.get('"b"') is None
+    assert cache.get('"a"') == b"1234"
+    cache.put('"d"', b"x" * 11)
+    assert cache.stats() == {"hits": 2, "misses": 1, "entries": 2, "bytes": 8}
+
+
+def test_large_responses_are_compressed_with_their_own_etag(client):
+    """Large lists are gzipped for clients that accept it, as a separate representation with its own ETag."""
+    client.post("/tasks/bulk", json=[{"title": f"Task {i}"} for i in range(50)])
+    plain = client.get("/tasks", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["Vary"] == "Accept-Encoding"
+    
+    hits = server.compression_cache.hits
+    gzipped = client.get("/tasks", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.content == plain.content
+    assert gzipped.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+    assert client.get("/tasks", headers={"Accept-Encoding": "gzip"}).content == plain.content
+    assert server.compression_cache.hits == hits + 1
+    
+    not_modified = client.get("/tasks", headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert client.get("/tasks", headers={"Accept-Encoding": "identity", "If-None-Match": gzipped.headers["ETag"]}).status_code == 200
+    
+    small = client.get("/tasks", params={"limit": 1}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert "vary" not in small.headers
+
+
+def test_export_is_compressed_as_it_streams(client):
+    """A compressed export holds the same lines as an uncompressed one."""
+    client.post("/tasks/bulk", json=[{"title": f"Task {i}"} for i in range(1500)])
+    plain = client.get("/tasks/export", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/tasks/export", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in plain.headers
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["Vary"] == "Accept-Encoding"
+    assert gzipped.content == plain.content
+    assert len(plain.content.splitlines()) == 1500
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-ahead log and snapshots of the durable memory storage.
+"""
+
+import os
+import sys
+
+import pytest
+
+from src.dummy_server.durability import DurableTaskStorage, WriteAheadLog, read_snapshot
+from src.dummy_server.models import TaskCreate, TaskUpdate
+
+
+def state(storage):
+    """Return everything recovery must preserve."""
+    return storage.get_all_tasks(), storage._next_id
+
+
+def segment_paths(directory):
+    """Return the log segment paths in a directory, oldest first."""
+    return [path for _, path in WriteAheadLog(directory).segments()]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_recovery_after_snapshots_taken_during_writes(tmp_path, compact):
+    """Snapshots written while writes continue recover to exactly the final state."""
+    directory = str(tmp_path)
+    storage = DurableTaskStorage(directory, fsync_interval=0, snapshot_every=400, compact=compact)
+    storage.create_tasks([TaskCreate(title=f"Seed {i}", assignee=f"user{i % 7}") for i in range(2000)])
+    # Switch threads as often as possible, so the snapshot thread runs in
+    # the middle of writes that delete tasks and reuse their rows
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for i in range(1500):
+            storage.delete_task(i + 1)
+            task = storage.create_task(TaskCreate(title=f"Task {i}", description="x" * (i % 50)))
+            if i % 3 == 0:
+                storage.update_task(task.id, TaskUpdate(status="done", assignee=f"user{i % 5}"))
+    finally:
+        sys.setswitchinterval(interval)
+    expected = state(storage)
+    storage.close()
+    
+    # Snapshots were taken, and the segments they cover are gone
+    assert read_snapshot(directory)[0] > 0
+    assert len(segment_paths(directory)) <= 2
+    recovered = DurableTaskStorage(directory, fsync_interval=0, compact=compact)
+    assert state(recovered) == expected
+    recovered.close()
+
+
+def test_snapshot_captures_the_state_when_requested(tmp_path):
+    """The snapshot holds the tasks as they were when snapshot() was called, whatever happens next."""
+    directory = str(tmp_path)
+    storage = DurableTaskStorage(directory, fsync_interval=0, snapshot_every=10 ** 9, compact=True)
+    storage.create_tasks([TaskCreate(title=f"Task {i}") for i in range(1000)])
+    expected = storage.get_all_tasks()
+    storage.snapshot()
+    for task in expected[:500]:
+        storage.delete_task(task.id)
+    storage.create_tasks([TaskCreate(title=f"Reuses a row {i}") for i in range(500)])
+    storage.close()
+    
+    lsn, next_id, tasks = read_snapshot(directory)
+    assert (lsn, next_id, tasks) == (1000, 1001, expected)
+
+
+def test_log_replay_without_snapshot(tmp_path):
+    """Puts, updates, deletes and clears are replayed from the log alone."""
+    directory = str(tmp_path)
+    storage = DurableTaskStorage(directory, fsync_interval=0)
+    storage.create_task(TaskCreate(title="First"))
+    storage.clear_all_tasks()
+    second = storage.create_task(TaskCreate(title="Second"))
+    third = storage.create_task(TaskCreate(title="Third"))
+    storage.update_task(second.id, TaskUpdate(title="Second, renamed"))
+    storage.delete_task(third.id)
+    expected = state(storage)
+    storage.close()
+    
+    recovered = DurableTaskStorage(directory, fsync_interval=0)
+    assert state(recovered) == expected
+    assert [task.title for task in recovered.get_all_tasks()] == ["Second, renamed"]
+    assert recovered.search_tasks(title_contains="renamed") == [recovered.get_task(second.id)]
+    recovered.close()
+
+
+def test_torn_tail_is_cut_off(tmp_path):
+    """A record cut short by a crash is dropped, and the log continues after the intact ones."""
+    directory = str(tmp_path)
+    storage = DurableTaskStorage(directory, fsync_interval=0)
+    storage.create_task(TaskCreate(title="Kept"))
+    storage.create_task(TaskCreate(title="Torn"))
+    storage.close()
+    
+    path = segment_paths(directory)[-1]
+    os.truncate(path, os.path.getsize(path) - 5)
+    recovered = DurableTaskStorage(directory, fsync_interval=0)
+    assert [task.title for task in recovered.get_all_tasks()] == ["Kept"]
+    recovered.create_task(TaskCreate(title="After restart"))
+    recovered.close()
+    
+    again = DurableTaskStorage(directory, fsync_interval=0)
+    assert [task.title for task in again.get_all_tasks()] == ["Kept", "After restart"]
+    again.close()
+
+
+def test_corrupt_older_segment_is_an_error(tmp_path):
+    """A checksum mismatch before the newest segment means lost records, so recovery refuses."""
+    directory = str(tmp_path)
+    storage = DurableTaskStorage(directory, fsync_interval=0)
+    storage.create_task(TaskCreate(title="In the first segment"))
+    storage.close()
+    # Reopening starts a new segment
+    storage = DurableTaskStorage(directory, fsync_interval=0)
+    storage.create_task(TaskCreate(title="In the second segment"))
+    storage.close()
+    
+    oldest = segment_paths(directory)[0]
+    with open(oldest, "r+b") as f:
+        f.seek(-3, os.SEEK_END)
+        byte = f.read(1)
+        f.seek(-3, os.SEEK_END)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    with pytest.raises(ValueError, match="corrupt"):
+        DurableTaskStorage(directory, fsync_interval=0)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the task JSON encoders.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.dummy_server.models import Task, TaskCreate, TaskStatus
+from src.dummy_server.response_cache import TASK_FIELDS, get_task_encoder, parse_fields
+from src.dummy_server.storage import TaskStorage
+
+
+def sample_tasks():
+    """Return tasks covering every kind of field value."""
+    created = datetime(2025, 1, 21, 10, 0, 0, 123456)
+    return [
+        Task(id=1, title="Plain", created_at=created, updated_at=created),
+        Task(
+            id=2,
+            title='Quotes " and \\ backslashes\n',
+            description="Ünïcödé ✓ and emoji 🚀",
+            assignee="ann@example.com",
+            status=TaskStatus.IN_PROGRESS,
+            due_date=datetime(2025, 2, 1, 8, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+            created_at=datetime(2025, 1, 21),
+            updated_at=datetime(2025, 1, 22, tzinfo=timezone.utc)
+        ),
+        Task(id=3, title="Cancelled", status=TaskStatus.CANCELLED, due_date=created, created_at=created, updated_at=created),
+    ]
+
+
+@pytest.mark.parametrize("name", ["pydantic", "orjson"])
+def test_encoders_write_the_same_bytes(name):
+    """Every encoder writes exactly what model_dump_json writes, for whole tasks and selected fields."""
+    if name == "orjson":
+        pytest.importorskip("orjson")
+    encode = get_task_encoder(name)
+    for task in sample_tasks():
+        assert encode(task) == task.model_dump_json().encode()
+        for fields in ["id", "title,status", "due_date,id,assignee"]:
+            selected = parse_fields(fields)
+            expected = json.dumps(
+                {name: value for name, value in json.loads(task.model_dump_json()).items() if name in selected},
+                ensure_ascii=False,
+                separators=(",", ":")
+            ).encode()
+            assert get_task_encoder(name, selected)(task) == expected
+
+
+def test_unvalidated_tasks_encode_like_validated_ones():
+    """Tasks stored by create_tasks without a second validation encode like those from create_task."""
+    storage = TaskStorage()
+    data = TaskCreate(title="Same", description="Fields", assignee="ann", status="done", due_date=datetime(2025, 3, 1))
+    validated = storage.create_task(data)
+    constructed = storage.create_tasks([data])[0]
+    encode = get_task_encoder("pydantic")
+    expected = json.loads(encode(validated))
+    actual = json.loads(encode(constructed))
+    for task in (expected, actual):
+        del task["id"], task["created_at"], task["updated_at"]
+    assert actual == expected
+    assert type(constructed.status) is TaskStatus
+
+
+def test_field_lists_are_checked():
+    """Fields come back in declaration order, and unknown or empty lists are rejected."""
+    assert parse_fields(" status, id ,title") == tuple(name for name in TASK_FIELDS if name in {"id", "title", "status"})
+    assert parse_fields(",".join(reversed(TASK_FIELDS))) == TASK_FIELDS
+    with pytest.raises(ValueError, match="Unknown task fields: secret"):
+        parse_fields("id,secret")
+    with pytest.raises(ValueError):
+        parse_fields(" , ")
+    with pytest.raises(ValueError):
+        get_task_encoder("simplejson")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests for the NDJSON task export.
+"""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Run the app on an empty in-memory storage."""
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def export(client, **params):
+    """Return the decoded lines of an export."""
+    response = client.get("/tasks/export", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.text.endswith("\n")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_export_holds_every_task_once_per_line(client):
+    """Exported tasks, over several encoding batches, equal those GET /tasks returns."""
+    client.post("/tasks/bulk", json=[
+        {"title": f"Task {i}", "assignee": "ann" if i % 3 else None, "status": "done" if i % 2 else "todo"}
+        for i in range(1200)
+    ])
+    assert export(client) == client.get("/tasks").json()
+    assert export(client, status="done", assignee="ANN") == client.get("/tasks", params={"status": "done", "assignee": "ann"}).json()
+    assert export(client, title_contains="Task 119", fields="id,title") == [
+        {"id": task_id, "title": f"Task {task_id - 1}"} for task_id in [120] + list(range(1191, 1201))
+    ]
+
+
+def test_empty_and_invalid_exports(client):
+    """An export matching nothing is empty, and unknown fields are rejected."""
+    response = client.get("/tasks/export", params={"status": "cancelled"})
+    assert response.status_code == 200
+    assert response.content == b""
+    assert client.get("/tasks/export", params={"fields": "id,secret"}).status_code == 400
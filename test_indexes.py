@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for the secondary index structures.
+"""
+
+import random
+
+import pytest
+
+from src.dummy_server.indexes import IdSet, SortedKeyIndex, SortedPairIndex, TrigramIndex
+
+
+@pytest.mark.parametrize("size", [100, 20000])
+def test_id_set_matches_a_set(size):
+    """Random additions and removals, in and out of order, leave the same ids as a set."""
+    rng = random.Random(size)
+    ids = IdSet(range(1, size, 2))
+    expected = set(range(1, size, 2))
+    for _ in range(size):
+        task_id = rng.randrange(1, size + size // 10)
+        if rng.random() < 0.5:
+            ids.add(task_id)
+            expected.add(task_id)
+        else:
+            ids.discard(task_id)
+            expected.discard(task_id)
+    assert list(ids) == sorted(expected)
+    assert len(ids) == len(expected)
+    assert [task_id for task_id in range(size + size // 10) if task_id in ids] == sorted(expected)
+
+
+def test_id_set_merges_pending_changes():
+    """Changes to the middle of a large set are held apart, then folded into the array."""
+    ids = IdSet(range(0, 20000, 2))
+    ids.add(5)
+    ids.discard(10)
+    assert ids._added == {5} and ids._removed == {10}
+    assert list(ids)[:6] == [0, 2, 4, 5, 6, 8]
+    # Re-adding a pending removal and removing a pending addition cancel out
+    ids.add(10)
+    ids.discard(5)
+    assert 10 in ids and 5 not in ids
+    # Once pending changes pass an eighth of the array, they are merged into it
+    for task_id in range(1, 2502, 2):
+        ids.add(task_id)
+    assert ids._added is None and ids._removed is None
+    assert len(ids._ids) == len(ids) == 10000 + 1251
+    assert list(ids) == sorted(set(range(0, 20000, 2)) | set(range(1, 2502, 2)))
+
+
+def test_id_set_empties():
+    """A set emptied by removals is falsy."""
+    ids = IdSet(range(5000))
+    for task_id in range(5000):
+        ids.discard(task_id)
+    assert not ids
+    assert len(ids) == 0
+    assert list(ids) == []
+
+
+def test_trigram_candidates_cover_every_match():
+    """Candidates include every key whose text contains the query, ignoring case."""
+    index = TrigramIndex()
+    titles = {1: "Write docs", 2: "Review DOCS page", 3: "Fix login", 4: "Document the API"}
+    for key, title in titles.items():
+        index.add(key, title)
+    assert index.candidates("doc") == {1, 2, 4}
+    assert index.candidates("DOCS") == {1, 2}
+    assert index.candidates("ocs pa") == {2}
+    assert index.candidates("xyz") == set()
+    # Shorter than a trigram, so the index cannot narrow the search
+    assert index.candidates("do") is None
+    
+    index.remove(2, titles[2])
+    assert index.candidates("docs") == {1}
+    index.clear()
+    assert index.candidates("docs") == set()
+
+
+def test_trigram_postings_can_be_id_sets():
+    """Postings held in IdSets give the same candidates, and emptied ones are dropped."""
+    index = TrigramIndex(IdSet)
+    index.add(7, "release notes")
+    index.add(3, "Release")
+    assert index.candidates("eleas") == {3, 7}
+    index.remove(7, "release notes")
+    assert index.candidates("notes") == set()
+    assert "not" not in index._postings
+
+
+@pytest.mark.parametrize("index_type", [SortedKeyIndex, SortedPairIndex])
+def test_sorted_index_matches_a_sorted_list(index_type):
+    """Small buckets split and empty as keys come and go, and every query agrees with a sorted list."""
+    rng = random.Random(3)
+    index = index_type(bucket_size=4)
+    expected = []
+    for _ in range(3000):
+        key = (rng.randint(-50, 50) * 10 ** 12, rng.randint(1, 200))
+        if rng.random() < 0.6:
+            if key not in expected:
+                index.add(key)
+                expected.append(key)
+        else:
+            assert index.remove(key) == (key in expected)
+            if key in expected:
+                expected.remove(key)
+    expected.sort()
+    assert len(index) == len(expected)
+    assert list(index.irange()) == expected
+    for _ in range(200):
+        low, high = sorted((rng.randint(-60, 60) * 10 ** 12, rng.randint(1, 200)) for _ in range(2))
+        assert list(index.irange(low, high)) == [key for key in expected if low <= key < high]
+        assert list(index.irange(low)) == [key for key in expected if low <= key]
+        assert list(index.irange(high=high)) == [key for key in expected if key < high]
+        assert index.rank(low) == sum(1 for key in expected if key < low)
+    index.clear()
+    assert len(index) == 0
+    assert list(index.irange()) == []
+    assert not index.remove((0, 1))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the ASGI load benchmark.
+"""
+
+import asyncio
+import json
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.asgi import ASGIClient, HTTPClient
+from benchmarks.load import DEFAULT_MIX, LoopbackServer, Workload, compare, percentile, run_workload, seed
+from src.dummy_server import server
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Run the app on an empty in-memory storage."""
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+async def create_and_get(client):
+    """Create a task through a benchmark client and read it back."""
+    try:
+        status, headers, body = await client.request("POST", "/tasks", json_body={"title": "Benchmark"})
+        assert status == 201
+        assert headers["content-type"] == "application/json"
+        task_id = json.loads(body)["id"]
+        status, _, body = await client.request("GET", f"/tasks/{task_id}", params={"status": None})
+        assert status == 200
+        return json.loads(body)
+    finally:
+        await client.close()
+
+
+def test_asgi_client_calls_the_app(client):
+    """The in-process client sends bodies and returns the status, headers and body."""
+    assert asyncio.run(create_and_get(ASGIClient(server.app)))["title"] == "Benchmark"
+
+
+def test_http_client_calls_a_loopback_server(client):
+    """The keep-alive client gets the same answers from uvicorn."""
+    pytest.importorskip("uvicorn")
+    with LoopbackServer() as loopback:
+        assert asyncio.run(create_and_get(HTTPClient("127.0.0.1", loopback.port)))["title"] == "Benchmark"
+
+
+def test_workload_reports_every_endpoint(client):
+    """A run measures the requested number of requests and reports each endpoint with its statuses."""
+    rng = random.Random(1)
+    seed(300, rng)
+    assert len(server.task_storage.get_all_tasks()) == 300
+    mix = dict(DEFAULT_MIX, list_all=1)
+    summary = asyncio.run(run_workload(lambda: ASGIClient(server.app), Workload(mix, 300, rng), 400, 4, 20))
+    assert summary["requests"] == 400
+    assert sum(stats["requests"] for stats in summary["endpoints"].values()) == 400
+    assert len(summary["endpoints"]) == len(mix)
+    for stats in summary["endpoints"].values():
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+        assert set(stats["statuses"]) <= {"200", "201", "204", "404"}
+
+
+def test_percentiles_and_baseline_comparison():
+    """Percentiles use the nearest rank, and slower endpoints are reported as regressions."""
+    values = [float(value) for value in range(1, 101)]
+    assert [percentile(values, fraction) for fraction in (0.5, 0.95, 0.99, 1.0)] == [50, 95, 99, 100]
+    assert percentile([], 0.5) == 0.0
+    
+    def results(p50, throughput):
+        endpoint = {"throughput": throughput, "p50_ms": p50, "p99_ms": p50 * 2}
+        return {"settings": {"mode": "asgi", "concurrency": 8, "mix": DEFAULT_MIX},
+                "runs": {"1000": {"endpoints": {"GET /tasks/{id}": endpoint}}}}
+    
+    baseline = results(1.0, 1000)
+    assert compare(results(1.05, 980), baseline, 0.10) == []
+    assert len(compare(results(1.5, 1000), baseline, 0.10)) == 1
+    assert len(compare(results(1.0, 800), baseline, 0.10)) == 1
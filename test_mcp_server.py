@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the MCP server's handling of bad input.
+"""
+
+import io
+import json
+
+from src.dummy_server.config import ServerConfig
+from src.dummy_server.storage import TaskStorage
+from src.mcp_server import INTERNAL_ERROR, INVALID_PARAMS, MCPServer
+
+
+def serve_lines(server, messages):
+    """Send messages through the stdio loop and return the decoded responses."""
+    stdin = io.BytesIO(b"".join(
+        (message if isinstance(message, bytes) else json.dumps(message).encode()) + b"\n"
+        for message in messages
+    ))
+    stdout = io.BytesIO()
+    server.serve(stdin, stdout)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+class BrokenStorage(TaskStorage):
+    """A storage whose reads fail, like an unreachable backend."""
+    
+    def get_task(self, task_id):
+        """Fail as an unreachable backend would."""
+        raise RuntimeError("backend unavailable")
+
+
+def test_malformed_params_do_not_stop_the_server():
+    """Bad params are answered with INVALID_PARAMS and later requests still work."""
+    server = MCPServer(TaskStorage(), ServerConfig())
+    responses = serve_lines(server, [
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": ["x"]},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {"name": "get_task", "arguments": [1]}},
+        {"jsonrpc": "2.0", "id": 3, "method": "initialize", "params": "x"},
+        b"not json",
+        {"jsonrpc": "2.0", "id": 4, "method": "ping"},
+    ])
+    assert [response["id"] for response in responses] == [1, 2, 3, None, 4]
+    assert responses[0]["error"]["code"] == INVALID_PARAMS
+    assert responses[1]["error"]["code"] == INVALID_PARAMS
+    assert responses[2]["error"]["code"] == INVALID_PARAMS
+    assert responses[4]["result"] == {}
+
+
+def test_storage_errors_become_tool_errors():
+    """A failing storage gives an isError result, in batches too, and the server keeps answering."""
+    server = MCPServer(BrokenStorage(), ServerConfig())
+    responses = serve_lines(server, [
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": "get_task", "arguments": {"id": 1}}},
+        {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {
+            "name": "batch",
+            "arguments": {"calls": [{"name": "get_task", "arguments": {"id": 1}}, {"name": "get_task_stats"}]}
+        }},
+        {"jsonrpc": "2.0", "id": 3, "method": "ping"},
+    ])
+    assert responses[0]["result"]["isError"] is True
+    assert "backend unavailable" in responses[0]["result"]["content"][0]["text"]
+    results = responses[1]["result"]["structuredContent"]["results"]
+    assert [result["isError"] for result in results] == [True, False]
+    assert responses[2]["result"] == {}
+
+
+def test_unexpected_errors_are_internal_errors():
+    """Errors outside tool calls are answered with INTERNAL_ERROR."""
+    server = MCPServer(TaskStorage(), ServerConfig())
+    
+    def fail():
+        raise RuntimeError("boom")
+    
+    server.tool_definitions = fail
+    responses = serve_lines(server, [
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+        {"jsonrpc": "2.0", "id": 2, "method": "ping"},
+    ])
+    assert responses[0]["error"]["code"] == INTERNAL_ERROR
+    assert responses[1]["result"] == {}
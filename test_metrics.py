@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus metrics.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.dummy_server.metrics import HistogramMetric, MetricsMiddleware, ServerMetrics
+from src.dummy_server.models import TaskCreate
+from src.dummy_server.sqlite_storage import SQLiteTaskStorage
+from src.dummy_server.storage import TaskStorage
+
+
+def operation_counts(metrics):
+    """Return the number of recorded calls of each storage method."""
+    return {values[0]: child.count for values, child in metrics.storage_duration._children.items() if child.count}
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_storage_calls_are_counted_once(tmp_path, backend):
+    """A storage method that calls another is recorded as one operation."""
+    if backend == "sqlite":
+        storage = SQLiteTaskStorage(str(tmp_path / "tasks.db"))
+    else:
+        storage = TaskStorage()
+    metrics = ServerMetrics()
+    metrics.instrument_storage(storage)
+    task = storage.create_task(TaskCreate(title="Counted once"))
+    storage.search_tasks()
+    storage.get_stats(datetime.now(timezone.utc))
+    storage.delete_task(task.id)
+    assert operation_counts(metrics) == {"create_task": 1, "search_tasks": 1, "get_stats": 1, "delete_task": 1}
+    
+    storage.count_by_status()
+    assert operation_counts(metrics)["count_by_status"] == 1
+    if backend == "sqlite":
+        storage.close()
+
+
+def test_requests_are_labelled_by_route_template():
+    """Requests are counted under their route template, with unknown paths and methods kept bounded."""
+    app = FastAPI()
+    
+    @app.get("/tasks/{task_id}")
+    async def get_task(task_id: int):
+        """Return a task id."""
+        return {"id": task_id}
+    
+    metrics = ServerMetrics()
+    app.add_middleware(MetricsMiddleware, metrics=metrics, routes=app.routes)
+    with TestClient(app) as client:
+        for path in ("/tasks/1", "/tasks/2", "/tasks/nope", "/missing"):
+            client.get(path)
+        client.delete("/tasks/1")
+    lines = metrics.render().splitlines()
+    assert 'http_requests_total{method="GET",route="/tasks/{task_id}",status="200"} 2' in lines
+    assert 'http_requests_total{method="GET",route="/tasks/{task_id}",status="422"} 1' in lines
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in lines
+    assert 'http_requests_total{method="DELETE",route="/tasks/{task_id}",status="405"} 1' in lines
+    assert 'http_request_duration_seconds_count{method="GET",route="/tasks/{task_id}"} 3' in lines
+    assert 'http_requests_in_flight{method="GET"} 0' in lines
+
+
+def test_histograms_render_cumulative_buckets():
+    """Bucket lines are cumulative and end with +Inf, and label values are escaped."""
+    histogram = HistogramMetric("latency_seconds", "Latency.", ("name",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.labels('say "hi"').observe(value)
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{name="say \\"hi\\"",le="0.1"} 1',
+        'latency_seconds_bucket{name="say \\"hi\\"",le="1"} 3',
+        'latency_seconds_bucket{name="say \\"hi\\"",le="+Inf"} 4',
+        'latency_seconds_sum{name="say \\"hi\\""} 6.05',
+        'latency_seconds_count{name="say \\"hi\\""} 4',
+    ]
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the OpenAPI schema cache.
+"""
+
+import json
+
+from fastapi import FastAPI
+
+from src.dummy_server.openapi_cache import OpenAPICache, schema_fingerprint
+
+
+def make_app():
+    """Return an app with one route."""
+    app = FastAPI(title="Test")
+    
+    @app.get("/items")
+    def items():
+        """List items."""
+        return []
+    
+    return app
+
+
+def test_schema_is_generated_once_and_saved(tmp_path):
+    """The schema is built on first use, saved, and loaded by the next app while it matches."""
+    path = str(tmp_path / "openapi.json")
+    app = make_app()
+    OpenAPICache(app, path, key="a")
+    schema = app.openapi()
+    assert "/items" in schema["paths"]
+    assert app.openapi() is schema
+    with open(path) as f:
+        assert json.load(f) == {"fingerprint": schema_fingerprint("a"), "schema": schema}
+    
+    # A new app loads the file instead of generating
+    again = make_app()
+    OpenAPICache(again, path, key="a")
+    again.router.routes.clear()
+    assert again.openapi() == schema
+    # Different settings do not match the saved schema
+    other = make_app()
+    OpenAPICache(other, path, key="b")
+    other.router.routes.clear()
+    assert "/items" not in other.openapi().get("paths", {})
+
+
+def test_failed_warm_up_is_reported(capsys):
+    """A schema build failing in the background prints its traceback and is retried on request."""
+    app = make_app()
+    cache = OpenAPICache(app)
+    generate = cache._generate
+    
+    def broken():
+        raise RuntimeError("schema build failed")
+    
+    cache._generate = broken
+    cache.warm()
+    err = capsys.readouterr().err
+    assert "Building the OpenAPI schema failed" in err
+    assert "RuntimeError: schema build failed" in err
+    
+    cache._generate = generate
+    assert "/items" in app.openapi()["paths"]
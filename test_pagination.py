@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for keyset pagination of tasks.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+from src.dummy_server.models import TaskCreate
+from src.dummy_server.pagination import decode_cursor, decode_due_cursor, encode_cursor, encode_due_cursor
+from src.dummy_server.storage import TaskStorage
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Run the app on an empty in-memory storage."""
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def test_cursors_round_trip_and_reject_garbage():
+    """Cursors decode to what was encoded, and anything else is a ValueError."""
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert decode_due_cursor(encode_due_cursor((1737500000000000, 7))) == (1737500000000000, 7)
+    assert decode_due_cursor(encode_due_cursor((None, 7))) == (None, 7)
+    for cursor in ["", "not base64!", encode_due_cursor((5, 1)), "eyJpZCI6dHJ1ZX0"]:
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+    with pytest.raises(ValueError):
+        decode_due_cursor(encode_cursor(1))
+
+
+def test_pages_survive_changes_between_requests():
+    """Tasks deleted or created between pages never make the walk skip or repeat a task."""
+    storage = TaskStorage()
+    storage.create_tasks([TaskCreate(title=f"Task {i}") for i in range(100)])
+    seen = []
+    after_id = None
+    while True:
+        page, after_id = storage.get_tasks_page(7, after_id=after_id)
+        seen.extend(task.id for task in page)
+        if after_id is None:
+            break
+        # Delete the next few tasks, including the one the cursor points at, and add new ones
+        for task_id in range(after_id, after_id + 4):
+            storage.delete_task(task_id)
+        storage.create_task(TaskCreate(title="Added"))
+    assert len(seen) == len(set(seen))
+    assert seen == sorted(seen)
+    # Every task still stored was returned, including those created during the walk
+    assert {task.id for task in storage.get_all_tasks()} <= set(seen)
+
+
+def test_api_walks_pages_with_the_next_cursor(client):
+    """The X-Next-Cursor header leads through every page and is absent on the last one."""
+    client.post("/tasks/bulk", json=[{"title": f"Task {i}", "status": "done" if i % 2 else "todo"} for i in range(9)])
+    titles = []
+    params = {"limit": 2, "status": "todo"}
+    while True:
+        response = client.get("/tasks", params=params)
+        titles.extend(task["title"] for task in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"cursor": cursor, "limit": 2, "status": "todo"}
+    assert titles == ["Task 0", "Task 2", "Task 4", "Task 6", "Task 8"]
+    
+    assert client.get("/tasks", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/tasks", params={"limit": server.config.max_page_size + 1}).status_code == 422
+    assert client.get("/tasks", params={"limit": 0}).status_code == 422
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for the sampling profiler.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+from src.dummy_server.profiler import ProfilerMiddleware, SamplingProfiler
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Run the app on an empty in-memory storage."""
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def spin(stop: threading.Event) -> None:
+    """Keep the CPU busy until stop is set."""
+    while not stop.is_set():
+        sum(range(100))
+
+
+def test_profile_endpoint_is_off_by_default(client):
+    """Without PROFILING_ENABLED the endpoint is not served."""
+    response = client.get("/debug/profile", params={"seconds": 0.1})
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Profiling is disabled"
+
+
+def test_profile_returns_collapsed_stacks_of_busy_threads():
+    """Working threads show up as collapsed stacks, and waiting ones only when asked for."""
+    profiler = SamplingProfiler()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(target=spin, args=(stop,), name="spinner"),
+        threading.Thread(target=stop.wait, name="waiter"),
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        stacks, samples = profiler.profile(0.2, interval=0.002)
+        idle_stacks, _ = profiler.profile(0.1, interval=0.002, include_idle=True)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    
+    lines = stacks.splitlines()
+    assert samples == sum(int(line.rsplit(" ", 1)[1]) for line in lines)
+    assert any(line.startswith("spinner;") and "test_profiler:spin" in line for line in lines)
+    assert not any(line.startswith("waiter;") for line in lines)
+    assert any(line.startswith("waiter;") for line in idle_stacks.splitlines())
+    assert not profiler.busy
+
+
+def test_slow_request_mode_keeps_only_slow_requests():
+    """Only requests slower than the threshold are kept, including one still running at the end."""
+    profiler = SamplingProfiler()
+    stop = threading.Event()
+    
+    async def app(scope, receive, send):
+        """Spin on /slow until the test ends, and return at once otherwise."""
+        if scope["path"] == "/slow":
+            spin(stop)
+    
+    async def requests():
+        """Send a fast request, then a slow one."""
+        middleware = ProfilerMiddleware(app, profiler)
+        for path in ("/fast", "/slow"):
+            await middleware({"type": "http", "method": "GET", "path": path}, None, None)
+    
+    def run_requests():
+        """Start the requests once the profile is running."""
+        while profiler.tracker is None:
+            time.sleep(0.001)
+        asyncio.run(requests())
+    
+    thread = threading.Thread(target=run_requests)
+    thread.start()
+    try:
+        stacks, samples = profiler.profile_slow_requests(0.3, threshold=0.1, interval=0.002)
+    finally:
+        stop.set()
+        thread.join()
+    
+    roots = {line.split(";", 1)[0] for line in stacks.splitlines()}
+    assert roots == {"GET /slow (in flight)"}
+    assert samples > 0
+    assert "test_profiler:spin" in stacks
+    assert profiler.tracker is None
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the versioned query result cache.
+"""
+
+from datetime import datetime
+
+from src.dummy_server.models import TaskCreate, TaskUpdate
+from src.dummy_server.query_cache import QueryCache
+from src.dummy_server.storage import TaskStorage
+
+
+def test_entries_are_used_at_their_version_and_evicted_least_recent_first():
+    """A result is only returned at the version it was stored at, and the least recently used goes first."""
+    cache = QueryCache(2)
+    cache.put("a", 1, [1])
+    cache.put("b", 1, [2])
+    assert cache.get("a", 1) == [1]
+    assert cache.get("a", 2) is None
+    cache.put("c", 1, [3])
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) == [1]
+    assert cache.stats() == {"hits": 2, "misses": 2, "entries": 2}
+    cache.clear()
+    assert cache.get("a", 1) is None
+
+
+def test_cached_searches_always_equal_fresh_ones():
+    """Every kind of write that changes a result is seen by the next cached search."""
+    storage = TaskStorage()
+    filters = {"status": "todo", "assignee": "ann", "title_contains": "docs", "due_before": datetime(2025, 2, 1)}
+    first = storage.create_task(TaskCreate(title="Write docs", assignee="Ann", due_date=datetime(2025, 1, 30)))
+    assert storage.search_tasks(**filters) == [first]
+    assert storage.search_tasks(**filters) == [first]
+    assert storage.query_cache.stats()["hits"] == 1
+    
+    def fresh():
+        """Run the search with the cache emptied."""
+        storage.query_cache.clear()
+        return storage.search_tasks(**filters)
+    
+    second = storage.create_task(TaskCreate(title="Review docs", assignee="ann", due_date=datetime(2025, 1, 2)))
+    changes = [
+        lambda: storage.update_task(first.id, TaskUpdate(status="done")),
+        lambda: storage.update_task(first.id, TaskUpdate(status="todo", assignee="Bob")),
+        lambda: storage.update_task(second.id, TaskUpdate(title="Review")),
+        lambda: storage.update_task(second.id, TaskUpdate(title="Review docs", due_date=datetime(2025, 3, 1))),
+        lambda: storage.create_task(TaskCreate(title="More docs", assignee="ANN", due_date=datetime(2025, 1, 5))),
+        lambda: storage.delete_task(second.id),
+    ]
+    for change in changes:
+        change()
+        cached = storage.search_tasks(**filters)
+        assert cached == fresh()
+    
+    # Fields outside the filters keep the cached ids, and the tasks are read fresh
+    third = storage.search_tasks(**filters)[0]
+    storage.update_task(third.id, TaskUpdate(description="Updated"))
+    assert storage.search_tasks(**filters)[0].description == "Updated"
+    storage.clear_all_tasks()
+    assert storage.search_tasks(**filters) == []
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the encoded task cache and ETag responses.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+from src.dummy_server.models import Task, TaskCreate, TaskUpdate
+from src.dummy_server.response_cache import TaskJSONCache, etag_matches
+from src.dummy_server.storage import TaskStorage
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Run the app on an empty in-memory storage."""
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def test_unchanged_task_gives_304_until_updated(client):
+    """A task's ETag holds until the task changes, and a stale one gets the new body."""
+    task_id = client.post("/tasks", json={"title": "Cached"}).json()["id"]
+    response = client.get(f"/tasks/{task_id}")
+    etag = response.headers["ETag"]
+    not_modified = client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.get(f"/tasks/{task_id}", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    
+    client.put(f"/tasks/{task_id}", json={"title": "Changed"})
+    response = client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Changed"
+    assert response.headers["ETag"] != etag
+
+
+def test_list_etag_changes_with_the_result(client):
+    """The ETag of a list follows its content: it changes with every change and comes back with the content."""
+    client.post("/tasks", json={"title": "First"})
+    etags = [client.get("/tasks").headers["ETag"]]
+    assert client.get("/tasks", headers={"If-None-Match": etags[0]}).status_code == 304
+    task_id = client.post("/tasks", json={"title": "Second"}).json()["id"]
+    etags.append(client.get("/tasks").headers["ETag"])
+    client.put(f"/tasks/{task_id}", json={"status": "done"})
+    etags.append(client.get("/tasks").headers["ETag"])
+    client.delete(f"/tasks/{task_id}")
+    etags.append(client.get("/tasks").headers["ETag"])
+    assert len(set(etags[:3])) == 3
+    assert etags[3] == etags[0]
+
+
+def test_etag_matching():
+    """If-None-Match uses weak comparison and accepts lists and *."""
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+def test_cache_never_serves_a_stale_encoding():
+    """Entries are reused only for the version they were encoded from, and dropped on change."""
+    storage = TaskStorage()
+    cache = TaskJSONCache(max_entries=2)
+    cache.attach(storage)
+    task = storage.create_task(TaskCreate(title="Original"))
+    assert cache.encode(task) == task.model_dump_json().encode()
+    assert cache.encode(task) is cache.encode(task)
+    
+    # A task that changed without a notification, as with the SQLite backend
+    changed = task.model_copy(update={"title": "Changed", "updated_at": task.updated_at + timedelta(seconds=1)})
+    assert b"Changed" in cache.encode(changed)
+    storage.update_task(task.id, TaskUpdate(title="Notified"))
+    assert task.id not in cache._entries
+    assert b"Notified" in cache.encode(storage.get_task(task.id))
+    
+    # Full caches evict their oldest entry
+    for title in ["Second", "Third"]:
+        cache.encode(storage.create_task(TaskCreate(title=title)))
+    assert sorted(cache._entries) == [2, 3]
+    assert cache.stats()["entries"] == 2
+
+
+def test_disabled_cache_still_encodes():
+    """A cache of size 0 encodes every time and keeps nothing."""
+    cache = TaskJSONCache(max_entries=0)
+    now = datetime(2025, 1, 21)
+    task = Task(id=1, title="Task", created_at=now, updated_at=now)
+    assert cache.encode(task) == task.model_dump_json().encode()
+    assert cache.stats() == {"hits": 0, "misses": 1, "entries": 0}
@@ -4,8 +4,8 @@ Test script for the dummy server API.
 """
 
 import requests
-import json
-from datetime import datetime
+import time
+from src.dummy_server.client import TaskAPIError, TaskClient
 
 
 def test_api(base_url="http://127.0.0.1:8000"):
@@ -13,39 +13,42 @@ def test_api(base_url="http://127.0.0.1:8000"):
     print(f"🧪 Testing Dummy Server API at {base_url}")
     print("=" * 60)
     
+    client = TaskClient(base_url)
+    start = time.perf_counter()
     try:
         # Test root endpoint
         print("1. Testing root endpoint...")
-        response = requests.get(f"{base_url}/")
-        if response.status_code == 200:
+        try:
+            info = client.info()
             print("✅ Root endpoint works")
-            print(f"   Response: {response.json()}")
-        else:
-            print(f"❌ Root endpoint failed: {response.status_code}")
+            print(f"   Response: {info}")
+        except TaskAPIError as e:
+            print(f"❌ Root endpoint failed: {e.status_code}")
         
         print()
         
         # Test health endpoint
         print("2. Testing health endpoint...")
-        response = requests.get(f"{base_url}/health")
-        if response.status_code == 200:
+        try:
+            health = client.health()
             print("✅ Health endpoint works")
-            print(f"   Response: {response.json()}")
-        else:
-            print(f"❌ Health endpoint failed: {response.status_code}")
+            print(f"   Response: {health}")
+        except TaskAPIError as e:
+            print(f"❌ Health endpoint failed: {e.status_code}")
         
         print()
         
         # Test get all tasks
         print("3. Testing get all tasks...")
-        response = requests.get(f"{base_url}/tasks")
-        if response.status_code == 200:
-            tasks = response.json()
+        try:
+            tasks = client.list_tasks()
             print(f"✅ Get tasks works - found {len(tasks)} tasks")
-            for task in tasks:
+            for task in tasks[:10]:
                 print(f"   Task {task['id']}: {task['title']} ({task['status']})")
-        else:
-            print(f"❌ Get tasks failed: {response.status_code}")
+            if len(tasks) > 10:
+                print(f"   ... and {len(tasks) - 10} more")
+        except TaskAPIError as e:
+            print(f"❌ Get tasks failed: {e.status_code}")
         
         print()
         
@@ -58,19 +61,14 @@ def test_api(base_url="http://127.0.0.1:8000"):
             "due_date": "2025-01-30T23:59:59",
             "status": "todo"
         }
-        response = requests.post(
-            f"{base_url}/tasks",
-            json=new_task,
-            headers={"Content-Type": "application/json"}
-        )
-        if response.status_code == 201:
-            created_task = response.json()
+        try:
+            created_task = client.create_task(new_task)
             print("✅ Create task works")
             print(f"   Created task ID: {created_task['id']}")
             task_id = created_task['id']
-        else:
-            print(f"❌ Create task failed: {response.status_code}")
-            print(f"   Response: {response.text}")
+        except TaskAPIError as e:
+            print(f"❌ Create task failed: {e.status_code}")
+            print(f"   Response: {e.detail}")
             task_id = None
         
         print()
@@ -78,13 +76,12 @@ def test_api(base_url="http://127.0.0.1:8000"):
         # Test get specific task
         if task_id:
             print("5. Testing get specific task...")
-            response = requests.get(f"{base_url}/tasks/{task_id}")
-            if response.status_code == 200:
-                task = response.json()
+            try:
+                task = client.get_task(task_id)
                 print("✅ Get specific task works")
                 print(f"   Task: {task['title']} - {task['status']}")
-            else:
-                print(f"❌ Get specific task failed: {response.status_code}")
+            except TaskAPIError as e:
+                print(f"❌ Get specific task failed: {e.status_code}")
             
             print()
             
@@ -94,48 +91,65 @@ def test_api(base_url="http://127.0.0.1:8000"):
                 "status": "in_progress",
                 "description": "Updated by test script"
             }
-            response = requests.put(
-                f"{base_url}/tasks/{task_id}",
-                json=update_data,
-                headers={"Content-Type": "application/json"}
-            )
-            if response.status_code == 200:
-                updated_task = response.json()
+            try:
+                updated_task = client.update_task(task_id, update_data)
                 print("✅ Update task works")
                 print(f"   Updated status: {updated_task['status']}")
-            else:
-                print(f"❌ Update task failed: {response.status_code}")
+            except TaskAPIError as e:
+                print(f"❌ Update task failed: {e.status_code}")
             
             print()
             
             # Test delete task
             print("7. Testing delete task...")
-            response = requests.delete(f"{base_url}/tasks/{task_id}")
-            if response.status_code == 200:
+            try:
+                response = client.delete_task(task_id)
                 print("✅ Delete task works")
-                print(f"   Response: {response.json()}")
-            else:
-                print(f"❌ Delete task failed: {response.status_code}")
+                print(f"   Response: {response}")
+            except TaskAPIError as e:
+                print(f"❌ Delete task failed: {e.status_code}")
         
         print()
         
         # Test filter by status
         print("8. Testing filter by status...")
-        response = requests.get(f"{base_url}/tasks?status=todo")
-        if response.status_code == 200:
-            tasks = response.json()
+        try:
+            tasks = client.list_tasks(status="todo")
             print(f"✅ Filter by status works - found {len(tasks)} todo tasks")
-        else:
-            print(f"❌ Filter by status failed: {response.status_code}")
+        except TaskAPIError as e:
+            print(f"❌ Filter by status failed: {e.status_code}")
         
         print()
-        print("🎉 API testing completed!")
         
+        # Test bulk operations and pagination
+        print("9. Testing bulk operations and pagination...")
+        try:
+            ids = client.create_tasks(
+                {"title": f"Bulk test task {i}", "assignee": "bulk-test@example.com"} for i in range(25)
+            )
+            page, cursor = client.list_page(limit=10, assignee="bulk-test@example.com")
+            fetched = client.list_tasks(assignee="bulk-test@example.com")
+            updated = client.update_tasks({"id": task_id, "status": "done"} for task_id in ids)
+            deleted = client.delete_tasks(ids)
+            if len(page) == 10 and cursor and len(fetched) >= 25 and updated["failed"] == 0 and deleted["failed"] == 0:
+                print("✅ Bulk operations and pagination work")
+                print(f"   Created, updated and deleted {len(ids)} tasks; first page held {len(page)}")
+            else:
+                print("❌ Bulk operations or pagination returned unexpected results")
+        except TaskAPIError as e:
+            print(f"❌ Bulk operations failed: {e.status_code}")
+            print(f"   Response: {e.detail}")
+        
+        print()
+        print(f"🎉 API testing completed in {(time.perf_counter() - start) * 1e3:.0f} ms!")
+    
     except requests.exceptions.ConnectionError:
         print(f"❌ Could not connect to server at {base_url}")
         print("   Make sure the server is running with: python run_server.py")
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
+    finally:
+        client.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite storage backend and the server running on it.
+"""
+
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+from src.dummy_server.models import TaskBulkUpdate, TaskCreate, TaskStatus, TaskUpdate
+from src.dummy_server.sqlite_storage import SQLiteTaskStorage
+from src.dummy_server.storage import TaskStorage
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Run the app on an empty SQLite database and yield a test client and the database path."""
+    path = str(tmp_path / "tasks.db")
+    monkeypatch.setattr(server.config, "storage_backend", "sqlite")
+    monkeypatch.setattr(server.config, "sqlite_path", path)
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    # startup() turns the result window off for backends without change notifications
+    monkeypatch.setattr(server.query_flights, "window", server.query_flights.window)
+    with TestClient(server.app) as test_client:
+        yield test_client, path
+
+
+def fields(tasks):
+    """Return everything but the timestamps of each task, which differ between stores."""
+    return [(task.id, task.title, task.description, task.assignee, task.status, task.due_date) for task in tasks]
+
+
+def random_task(rng):
+    """Return task data with random field values."""
+    return TaskCreate(
+        title=rng.choice(["Write docs", "Fix login bug", "Review release", "Deploy"]),
+        assignee=rng.choice([None, "Ann", "ann@example.com", "Bob"]),
+        status=rng.choice(list(TaskStatus)),
+        due_date=START + timedelta(hours=rng.randint(0, 500)) if rng.random() < 0.6 else None
+    )
+
+
+def all_pages(page, **filters):
+    """Collect every page of a paging method, following its cursor."""
+    tasks, after = [], None
+    while True:
+        chunk, after = page(7, after, **filters)
+        tasks.extend(chunk)
+        if after is None:
+            return tasks
+
+
+def test_same_results_as_the_memory_store(tmp_path):
+    """The same changes give the same searches, pages and stats as TaskStorage."""
+    rng = random.Random(3)
+    memory = TaskStorage()
+    sqlite = SQLiteTaskStorage(str(tmp_path / "tasks.db"))
+    for storage in (memory, sqlite):
+        storage.create_tasks([random_task(random.Random(i)) for i in range(150)])
+    for _ in range(100):
+        task_id = rng.randint(1, 160)
+        roll = rng.random()
+        changes = random_task(rng)
+        for storage in (memory, sqlite):
+            if roll < 0.4:
+                storage.update_task(task_id, TaskUpdate(status=changes.status, due_date=changes.due_date))
+            elif roll < 0.6:
+                storage.update_tasks([TaskBulkUpdate(id=task_id, assignee=changes.assignee, title=changes.title)])
+            elif roll < 0.8:
+                storage.delete_task(task_id)
+            else:
+                storage.create_task(changes)
+    
+    now = START + timedelta(hours=250)
+    for filters in [
+        {},
+        {"status": "todo"},
+        {"assignee": "ANN", "title_contains": "bug"},
+        {"due_after": START + timedelta(hours=100), "due_before": now},
+    ]:
+        assert fields(sqlite.search_tasks(**filters)) == fields(memory.search_tasks(**filters))
+        assert fields(all_pages(sqlite.get_tasks_page, **filters)) == fields(all_pages(memory.get_tasks_page, **filters))
+        assert fields(all_pages(sqlite.get_tasks_page_by_due_date, **filters)) == \
+            fields(all_pages(memory.get_tasks_page_by_due_date, **filters))
+    assert fields(all_pages(sqlite.get_tasks_page_by_due_date, open_only=True)) == \
+        fields(all_pages(memory.get_tasks_page_by_due_date, open_only=True))
+    assert sqlite.get_stats(now) == memory.get_stats(now)
+    assert sqlite.count_by_status() == memory.count_by_status()
+    sqlite.close()
+
+
+def test_tasks_persist_across_restarts(tmp_path):
+    """Tasks and id assignment survive reopening the database, and a clear restarts ids."""
+    path = str(tmp_path / "tasks.db")
+    storage = SQLiteTaskStorage(path)
+    first = storage.create_task(TaskCreate(title="Kept", due_date=START))
+    storage.delete_task(storage.create_task(TaskCreate(title="Deleted")).id)
+    storage.close()
+    
+    storage = SQLiteTaskStorage(path)
+    assert storage.get_all_tasks() == [first]
+    assert storage.create_task(TaskCreate(title="Next")).id == 3
+    assert storage.clear_all_tasks() == 2
+    assert storage.create_task(TaskCreate(title="After clear")).id == 1
+    storage.close()
+
+
+def test_export_reads_every_page(client):
+    """An export larger than one storage page returns every task, in id order."""
+    test_client, _ = client
+    test_client.post("/tasks/bulk", json=[{"title": f"Task {i}"} for i in range(1100)])
+    lines = test_client.get("/tasks/export", params={"fields": "id"}).text.splitlines()
+    assert lines == [f'{{"id":{task_id}}}' for task_id in range(1, 1101)]
+
+
+def test_waiting_write_does_not_block_other_requests(client):
+    """A write waiting for the database lock leaves the server free to answer reads."""
+    test_client, path = client
+    task_id = test_client.post("/tasks", json={"title": "Existing"}).json()["id"]
+    
+    # Another process holds the write lock
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    responses = []
+    writer = threading.Thread(
+        target=lambda: responses.append(test_client.post("/tasks", json={"title": "Waits for the lock"}))
+    )
+    writer.start()
+    try:
+        time.sleep(0.2)
+        start = time.perf_counter()
+        assert test_client.get(f"/tasks/{task_id}").json()["title"] == "Existing"
+        assert test_client.get("/tasks").status_code == 200
+        assert time.perf_counter() - start < 1.0
+        assert responses == []
+    finally:
+        blocker.rollback()
+        blocker.close()
+    writer.join()
+    assert responses[0].status_code == 201
+    assert [task["title"] for task in test_client.get("/tasks").json()] == ["Existing", "Waits for the lock"]
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the task statistics.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.dummy_server import server
+from src.dummy_server.models import TaskCreate, TaskStatus, TaskUpdate
+from src.dummy_server.storage import TaskStorage
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Run the app on an empty in-memory storage."""
+    monkeypatch.setattr(server.config, "seed_sample_data", False)
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def random_task(rng):
+    """Return task data with random field values."""
+    return TaskCreate(
+        title="Task",
+        assignee=rng.choice([None, "Ann", "ann", "Bob", "carol"]),
+        status=rng.choice(list(TaskStatus)),
+        due_date=START + timedelta(hours=rng.randint(0, 24 * 30)) if rng.random() < 0.7 else None
+    )
+
+
+def scanned_stats(tasks, now):
+    """Count every task one by one."""
+    by_status = {status.value: 0 for status in TaskStatus}
+    by_assignee = {}
+    overdue_by_status = {"todo": 0, "in_progress": 0}
+    for task in tasks:
+        by_status[task.status.value] += 1
+        if task.assignee:
+            key = task.assignee.lower()
+            by_assignee[key] = by_assignee.get(key, 0) + 1
+        if task.status.value in overdue_by_status and task.due_date is not None and task.due_date < now:
+            overdue_by_status[task.status.value] += 1
+    return {
+        "total": len(tasks),
+        "by_status": by_status,
+        "by_assignee": by_assignee,
+        "unassigned": len(tasks) - sum(by_assignee.values()),
+        "overdue": sum(overdue_by_status.values()),
+        "overdue_by_status": overdue_by_status,
+    }
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_stats_match_a_scan_after_every_change(compact):
+    """The counters kept by each mutation equal counting every task, at any time."""
+    storage = TaskStorage(compact=compact)
+    rng = random.Random(5)
+    for step in range(400):
+        ids = [task.id for task in storage.get_all_tasks()]
+        roll = rng.random()
+        if roll < 0.5 or not ids:
+            storage.create_task(random_task(rng))
+        elif roll < 0.8:
+            changes = random_task(rng).model_dump()
+            field = rng.choice(["assignee", "status", "due_date"])
+            storage.update_task(rng.choice(ids), TaskUpdate(**{field: changes[field]}))
+        elif roll < 0.99:
+            storage.delete_task(rng.choice(ids))
+        else:
+            storage.clear_all_tasks()
+        if step % 20 == 0:
+            now = START + timedelta(hours=rng.randint(0, 24 * 31))
+            assert storage.get_stats(now).model_dump() == scanned_stats(storage.get_all_tasks(), now)
+
+
+def test_stats_endpoint_and_health(client):
+    """GET /tasks/stats returns the counts, and /health includes them on request."""
+    client.post("/tasks/bulk", json=[
+        {"title": "Late", "assignee": "Ann", "due_date": "2000-01-01T00:00:00Z"},
+        {"title": "Done late", "assignee": "ann", "status": "done", "due_date": "2000-01-01T00:00:00"},
+        {"title": "Later", "status": "in_progress", "due_date": "2999-01-01T00:00:00Z"},
+    ])
+    stats = client.get("/tasks/stats").json()
+    assert stats == {
+        "total": 3,
+        "by_status": {"todo": 1, "in_progress": 1, "done": 1, "cancelled": 0},
+        "by_assignee": {"ann": 2},
+        "unassigned": 1,
+        "overdue": 1,
+        "overdue_by_status": {"todo": 1, "in_progress": 0},
+    }
+    assert "stats" not in client.get("/health").json()
+    assert client.get("/health", params={"include_stats": True}).json()["stats"] == stats
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the indexed in-memory task storage.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.dummy_server.models import TaskCreate, TaskStatus, TaskUpdate
+from src.dummy_server.storage import OPEN_STATUSES, TaskStorage, due_micros
+
+ASSIGNEES = [None, "Ann", "ann@example.com", "Bob", "BOB.SMITH", "carol"]
+WORDS = ["write", "docs", "review", "release", "fix", "login", "Bug", "deploy"]
+START = datetime(2025, 1, 1)
+
+
+def random_task(rng):
+    """Return task data with random field values."""
+    return TaskCreate(
+        title=" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))),
+        assignee=rng.choice(ASSIGNEES),
+        status=rng.choice(list(TaskStatus)),
+        due_date=START + timedelta(hours=rng.randint(0, 24 * 60)) if rng.random() < 0.7 else None
+    )
+
+
+def random_workload(storage, rng, operations=600):
+    """Create, update and delete tasks at random."""
+    for _ in range(operations):
+        ids = [task.id for task in storage.get_all_tasks()]
+        roll = rng.random()
+        if roll < 0.5 or not ids:
+            storage.create_task(random_task(rng))
+        elif roll < 0.8:
+            changes = random_task(rng).model_dump()
+            field = rng.choice(["title", "assignee", "status", "due_date"])
+            storage.update_task(rng.choice(ids), TaskUpdate(**{field: changes[field]}))
+        else:
+            storage.delete_task(rng.choice(ids))
+
+
+def scan(storage, assignee=None, status=None, title_contains=None):
+    """Filter every stored task one by one, as search_tasks did before it had indexes."""
+    return [
+        task for task in storage.get_all_tasks()
+        if (not assignee or (task.assignee and assignee.lower() in task.assignee.lower()))
+        and (not status or task.status.value == status)
+        and (not title_contains or title_contains.lower() in task.title.lower())
+    ]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_status_and_assignee_filters_match_a_scan(compact):
+    """Indexed searches find exactly the tasks a scan finds, after any mix of changes."""
+    storage = TaskStorage(compact=compact)
+    random_workload(storage, random.Random(1))
+    for status in [None] + [status.value for status in TaskStatus]:
+        for assignee in [None, "ann", "BOB", "example", "b.s", "nobody"]:
+            expected = scan(storage, assignee=assignee, status=status)
+            assert storage.search_tasks(assignee=assignee, status=status) == expected
+            page, _ = storage.get_tasks_page(10 ** 6, assignee=assignee, status=status)
+            assert page == expected
+
+
+def test_counts_follow_updates_and_deletes():
+    """Status counts and assignee buckets move with each task, and empty buckets are dropped."""
+    storage = TaskStorage()
+    first = storage.create_task(TaskCreate(title="First", assignee="Ann"))
+    storage.create_task(TaskCreate(title="Second", assignee="ann", status="done"))
+    storage.update_task(first.id, TaskUpdate(status="in_progress", assignee="Bob"))
+    assert storage.count_by_status() == {"todo": 0, "in_progress": 1, "done": 1, "cancelled": 0}
+    assert [task.title for task in storage.search_tasks(assignee="ANN")] == ["Second"]
+    
+    storage.delete_task(first.id)
+    assert storage.search_tasks(assignee="bob") == []
+    assert set(storage._by_assignee) == {"ann"}
+    assert set(storage._by_status) == {"done"}
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_title_search_matches_a_scan(compact):
+    """Substring searches of any length, alone or with other filters, find what a scan finds."""
+    storage = TaskStorage(compact=compact)
+    random_workload(storage, random.Random(2))
+    for title_contains in ["bug", "DOCS", "s d", "ix lo", "e", "re", "release fix", "missing"]:
+        for status in [None, "todo"]:
+            expected = scan(storage, status=status, title_contains=title_contains)
+            assert storage.search_tasks(status=status, title_contains=title_contains) == expected
+        expected = scan(storage, assignee="ann", title_contains=title_contains)
+        assert storage.search_tasks(assignee="ann", title_contains=title_contains) == expected
+
+
+def test_renamed_task_is_found_by_its_new_title():
+    """Updating a title moves the task in the trigram index."""
+    storage = TaskStorage(compact=True)
+    task = storage.create_task(TaskCreate(title="Write docs"))
+    storage.update_task(task.id, TaskUpdate(title="Fix login"))
+    assert storage.search_tasks(title_contains="docs") == []
+    assert storage.search_tasks(title_contains="LOGIN") == [storage.get_task(task.id)]
+
+
+def due_order(task):
+    """Sort key of due date order: dated tasks by due date, then undated ones, ties by id."""
+    return (task.due_date is None, due_micros(task.due_date) or 0, task.id)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_due_date_queries_match_a_sorted_scan(compact):
+    """Due date ranges, due date pages and the overdue query agree with sorting every task."""
+    storage = TaskStorage(compact=compact)
+    rng = random.Random(4)
+    random_workload(storage, rng)
+    # Due dates with a timezone are ordered by the instant they name
+    for hours in (-3, 0, 5):
+        storage.create_task(TaskCreate(title="Zoned", due_date=datetime(2025, 1, 20, 12, tzinfo=timezone(timedelta(hours=hours)))))
+    tasks = sorted(storage.get_all_tasks(), key=due_order)
+    
+    for _ in range(20):
+        low, high = sorted(START + timedelta(hours=rng.randint(-24, 24 * 61)) for _ in range(2))
+        expected = [task for task in tasks if task.due_date is not None and due_micros(low) <= due_micros(task.due_date) < due_micros(high)]
+        assert sorted(storage.search_tasks(due_after=low, due_before=high), key=due_order) == expected
+        page, _ = storage.get_tasks_page_by_due_date(1000, due_after=low, due_before=high)
+        assert page == expected
+    
+    pages, after = [], None
+    while True:
+        page, after = storage.get_tasks_page_by_due_date(7, after=after)
+        pages.extend(page)
+        if after is None:
+            break
+    assert pages == tasks
+    
+    now = START + timedelta(days=30)
+    overdue, _ = storage.get_tasks_page_by_due_date(1000, due_before=now, open_only=True, assignee="ann")
+    assert overdue == [
+        task for task in tasks
+        if task.status in OPEN_STATUSES and task.assignee and "ann" in task.assignee.lower()
+        and task.due_date is not None and due_micros(task.due_date) < due_micros(now)
+    ]
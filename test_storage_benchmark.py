@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for the storage microbenchmarks.
+"""
+
+import json
+import random
+import sys
+
+import pytest
+
+from benchmarks import storage as bench
+
+
+def test_fitted_exponents_match_known_growth():
+    """The fit recovers the exponent of an exact power law."""
+    sizes = [1000, 10000, 100000]
+    assert bench.fit_exponent(sizes, [2e-6] * 3) == pytest.approx(0.0)
+    assert bench.fit_exponent(sizes, [size * 1e-8 for size in sizes]) == pytest.approx(1.0)
+    assert bench.fit_exponent(sizes, [(size ** 2) * 1e-12 for size in sizes]) == pytest.approx(2.0)
+    assert bench.fit_exponent([1000, 1000], [1.0, 2.0]) == 0.0
+
+
+@pytest.mark.parametrize("backend", ["memory", "compact", "sqlite"])
+def test_every_search_finds_exactly_the_needles(backend, tmp_path):
+    """Filtered searches return the same NEEDLES tasks whatever the store size."""
+    for size in (200, 800):
+        storage = bench.make_storage(backend, str(tmp_path))
+        bench.populate(storage, size, random.Random(1))
+        assert len(storage.get_all_tasks()) == size
+        for name, (kwargs, _) in bench.SEARCHES.items():
+            assert len(storage.search_tasks(**kwargs)) == bench.NEEDLES, name
+        close = getattr(storage, "close", None)
+        if close is not None:
+            close()
+
+
+def test_report_covers_every_operation(tmp_path, monkeypatch, capsys):
+    """A run over two sizes times and measures every operation and writes the report."""
+    output = tmp_path / "storage.json"
+    monkeypatch.setattr(sys, "argv", ["storage", "--sizes", "100,300", "--output", str(output)])
+    bench.main()
+    report = json.loads(output.read_text())
+    assert report["sizes"] == [100, 300]
+    assert set(report["operations"]) == set(bench.EXPECTED) | set(bench.SEARCHES)
+    for operation in report["operations"].values():
+        for measurement in operation["by_size"].values():
+            assert measurement["seconds"] > 0
+            assert measurement["peak_bytes"] >= 0
+    assert "Time per operation (memory backend)" in capsys.readouterr().out
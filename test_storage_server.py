@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared storage server used in multi-worker mode.
+"""
+
+import os
+import stat
+import sys
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+from src.dummy_server.models import TaskCreate, TaskStatus, TaskUpdate
+from src.dummy_server.query_cache import QueryCache
+from src.dummy_server.storage import TaskStorage
+from src.dummy_server.storage_server import RemoteStorageError, RemoteTaskStorage, StorageServer
+
+
+@pytest.fixture
+def served(tmp_path):
+    """Serve a small-cache TaskStorage and yield the server and its socket path."""
+    path = str(tmp_path / "storage.sock")
+    server = StorageServer(path, TaskStorage(query_cache_size=4))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, path
+    server.shutdown()
+    server.server_close()
+
+
+def test_socket_is_private(served):
+    """Only the owner may connect to the socket."""
+    _, path = served
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_tasks_round_trip(served):
+    """Tasks come back with their types, and errors are raised on the client."""
+    server, path = served
+    storage = RemoteTaskStorage(path)
+    due = datetime(2025, 1, 30, 12, tzinfo=timezone.utc)
+    task = storage.create_task(TaskCreate(title="Write docs", assignee="ann", due_date=due))
+    assert task == server.storage.get_task(task.id)
+    assert task.status is TaskStatus.TODO
+    assert task.due_date == due
+    updated = storage.update_task(task.id, TaskUpdate(status="done"))
+    assert updated.status is TaskStatus.DONE
+    with pytest.raises(RemoteStorageError):
+        storage._call("_tasks")
+    storage.close()
+
+
+def test_concurrent_readers_and_writers(served):
+    """Searches running side by side with writes neither fail nor see torn results."""
+    server, path = served
+    setup = RemoteTaskStorage(path)
+    setup.create_tasks([
+        TaskCreate(title=f"task {i % 10} item", assignee=f"user{i % 5}", status=list(TaskStatus)[i % 4])
+        for i in range(200)
+    ])
+    errors = []
+    
+    def read(worker):
+        storage = RemoteTaskStorage(path)
+        try:
+            for i in range(100):
+                # More distinct queries than the cache holds, so entries are evicted constantly
+                key = (worker + i) % 10
+                for task in storage.search_tasks(title_contains=f"task {key}"):
+                    assert f"task {key}" in task.title
+                page, _ = storage.get_tasks_page(10, assignee=f"user{key % 5}")
+                assert all(task.assignee == f"user{key % 5}" for task in page)
+                storage.get_tasks_page_by_due_date(10, status="todo")
+        except Exception as e:
+            errors.append(e)
+        finally:
+            storage.close()
+    
+    def write():
+        storage = RemoteTaskStorage(path)
+        try:
+            for i in range(100):
+                task = storage.create_task(TaskCreate(title=f"task {i % 10} extra", assignee="writer"))
+                storage.delete_task(task.id)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            storage.close()
+    
+    threads = [threading.Thread(target=read, args=(i,)) for i in range(8)]
+    threads += [threading.Thread(target=write) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert setup.get_task_count() == 200
+    assert server.storage.query_cache.stats()["entries"] <= 4
+    setup.close()
+
+
+def test_query_cache_survives_concurrent_eviction():
+    """Lookups and evictions from many threads at once keep the cache consistent."""
+    cache = QueryCache(4)
+    errors = []
+    
+    def hammer(worker):
+        try:
+            for i in range(5000):
+                key = (worker * 7 + i) % 9
+                if cache.get(key, 1) is None:
+                    cache.put(key, 1, [key])
+        except Exception as e:
+            errors.append(e)
+    
+    # Switch threads as often as possible to interleave get and put
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=hammer, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    stats = cache.stats()
+    assert errors == []
+    assert stats["hits"] + stats["misses"] == 8 * 5000
+    assert stats["entries"] == 4